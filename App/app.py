@@ -2,9 +2,15 @@ import streamlit as st
 import pickle
 import string
 import re
+import os
+import sys
 import spacy
 from nltk.stem import PorterStemmer
 
+# Make the shared utils package importable when run as `streamlit run App/app.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.classifier import SpamClassifier
+
 # Check and load spaCy model
 try:
     nlp = spacy.load("en_core_web_sm")
@@ -37,6 +43,8 @@ def transform_text(text):
     stemmed_tokens = [stemmer.stem(token) for token in tokens]  # Stem tokens
     return " ".join(stemmed_tokens)
 
+classifier = SpamClassifier(tfidf, model, transform_text)
+
 # Streamlit app
 st.title("Spam Classifier")
 
@@ -46,10 +54,8 @@ input_sms = st.text_input("Enter your text")
 # Prediction logic
 if st.button("Predict"):
     if input_sms.strip():
-        transformed_sms = transform_text(input_sms)
         try:
-            vector_input = tfidf.transform([transformed_sms])
-            result = model.predict(vector_input)[0]
+            result = classifier.classify(input_sms)["label"]
 
             # Display the result
             if result == 0:
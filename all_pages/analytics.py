@@ -1,71 +1,208 @@
+import os
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from utils.model_comparison import MODEL_COMPARISON_PATH, load_model_comparison
 
-def show_page():
-    """Analytics and insights page"""
+# The algorithm the app serves; its row of the comparison backs the performance figures
+SERVED_MODEL = 'Naive Bayes'
+
+# Readable names of the benchmark's --preprocessing choices
+PREPROCESSING_NAMES = {
+    'spacy': "the app's preprocessing",
+    'regex': "the app's preprocessing (regex tokenizer)",
+    'simple': "train_model.py preprocessing"
+}
+
+# Trace colors of the compared models, in benchmark order
+MODEL_COLORS = ['#667eea', '#f093fb', '#51cf66', '#ffa94d', '#ff6b6b']
+
+@st.cache_data
+def load_comparison(path, mtime):
+    """Read the benchmark results once per file version (mtime is part of the cache key)"""
+    return load_model_comparison(path)
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+def _format_seconds(seconds):
+    return f"{seconds * 1000:.0f} ms" if seconds < 1 else f"{seconds:.1f} seconds"
+
+def comparison_frame(comparison):
+    """One row per model with the charted measurements"""
+    return pd.DataFrame([{
+        'Model': row['model'],
+        'Accuracy': row['accuracy'],
+        'Precision': row['precision'],
+        'Recall': row['recall'],
+        'F1-Score': row['f1'],
+        'ROC AUC': row['roc_auc'],
+        'Training Time (s)': row['fit_seconds'],
+        'Latency p50 (ms)': row['per_message_ms']['p50_ms'],
+        'Latency p99 (ms)': row['per_message_ms']['p99_ms'],
+        'Batch (ms)': row['batch_ms'],
+        'Training Memory (MB)': (row['fit_memory_bytes'] or 0) / 2**20,
+        'Model Size (MB)': row['serialized_bytes'] / 2**20
+    } for row in comparison['models']])
+
+def show_model_comparison(comparison):
+    """Charts of measured accuracy, speed, memory and ROC curves per model"""
+    models_df = comparison_frame(comparison)
+    dataset = comparison['dataset']
+    st.caption(
+        f"Measured {comparison['created_at'][:16].replace('T', ' ')} on {dataset['path']} "
+        f"({dataset['train']:,} training / {dataset['test']:,} test messages, "
+        f"{comparison['features']['columns']:,} TF-IDF features over "
+        f"{PREPROCESSING_NAMES.get(comparison['features']['preprocessing'], comparison['features']['preprocessing'])}, "
+        f"{comparison['environment']['cpus']}-CPU machine)"
+    )
     
-    st.markdown("""
-    <div class="main-header fade-in">
-        <h1>📊 Analytics Dashboard</h1>
-        <p>Insights and statistics about spam detection</p>
-    </div>
-    """, unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
     
-    # Model Performance Section
-    st.markdown("## 🎯 Model Performance Metrics")
+    with col1:
+        fig = px.scatter(
+            models_df,
+            x='Training Time (s)',
+            y='Accuracy',
+            size='Model Size (MB)',
+            color='Model',
+            hover_name='Model',
+            hover_data=['F1-Score', 'Training Memory (MB)'],
+            title="Accuracy vs Training Time (size = serialized model)",
+            labels={'Training Time (s)': 'Training Time (seconds)'},
+            log_x=True,
+            color_discrete_sequence=MODEL_COLORS
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = px.bar(
+            models_df,
+            x='Model',
+            y=['Accuracy', 'Precision', 'Recall', 'F1-Score'],
+            title="Model Quality on the Test Split",
+            barmode='group'
+        )
+        fig.update_yaxes(range=[max(models_df[['Recall', 'F1-Score']].min().min() - 0.05, 0), 1])
+        fig.update_xaxes(tickangle=45)
+        st.plotly_chart(fig, use_container_width=True)
     
-    # Create sample performance data
-    performance_data = {
-        'Metric': ['Accuracy', 'Precision', 'Recall', 'F1-Score'],
-        'Score': [0.973, 0.965, 0.981, 0.973],
-        'Benchmark': [0.950, 0.940, 0.960, 0.950]
-    }
+    col1, col2 = st.columns(2)
     
-    perf_df = pd.DataFrame(performance_data)
+    with col1:
+        fig = px.bar(
+            models_df,
+            x='Model',
+            y=['Latency p50 (ms)', 'Latency p99 (ms)'],
+            title="Per-Message Inference Latency",
+            barmode='group',
+            labels={'value': 'Milliseconds', 'variable': 'Percentile'}
+        )
+        fig.update_xaxes(tickangle=45)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = px.bar(
+            models_df,
+            x='Model',
+            y=['Training Memory (MB)', 'Model Size (MB)'],
+            title="Training Memory and Serialized Size",
+            barmode='group',
+            log_y=True,
+            labels={'value': 'MB', 'variable': 'Measure'}
+        )
+        fig.update_xaxes(tickangle=45)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.dataframe(
+        models_df.set_index('Model').style.format({
+            'Accuracy': '{:.3f}', 'Precision': '{:.3f}', 'Recall': '{:.3f}', 'F1-Score': '{:.3f}',
+            'ROC AUC': '{:.3f}', 'Training Time (s)': '{:.2f}', 'Latency p50 (ms)': '{:.2f}',
+            'Latency p99 (ms)': '{:.2f}', 'Batch (ms)': '{:.1f}', 'Training Memory (MB)': '{:.1f}',
+            'Model Size (MB)': '{:.2f}'
+        }),
+        use_container_width=True
+    )
+    st.caption(f"Batch: all {comparison['models'][0]['batch_messages']:,} test messages vectorized and classified at once")
+    
+    # ROC Curve
+    st.markdown("## 📈 ROC Curve Analysis")
+    
+    fig = go.Figure()
+    for row, color in zip(comparison['models'], MODEL_COLORS * 2):
+        fig.add_trace(go.Scatter(
+            x=row['roc_curve']['fpr'],
+            y=row['roc_curve']['tpr'],
+            name=f"{row['model']} (AUC={row['roc_auc']:.3f})",
+            line=dict(color=color)
+        ))
+    fig.add_trace(go.Scatter(x=[0, 1], y=[0, 1], name='Random Classifier', line=dict(dash='dash', color='gray')))
+    
+    fig.update_layout(
+        title='ROC Curves Comparison',
+        xaxis_title='False Positive Rate',
+        yaxis_title='True Positive Rate',
+        height=500
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+def served_model_row(comparison):
+    """The Naive Bayes row of the comparison (the algorithm the app serves), or None"""
+    if comparison is None:
+        return None
+    return next((row for row in comparison['models'] if row['model'] == SERVED_MODEL), None)
+
+def show_served_performance(comparison, served):
+    """Measured quality and confusion matrix of the served model, against the best alternative per metric"""
+    metrics = [('Accuracy', 'accuracy'), ('Precision', 'precision'), ('Recall', 'recall'), ('F1-Score', 'f1')]
+    others = [row for row in comparison['models'] if row is not served]
+    perf_df = pd.DataFrame({
+        'Metric': [label for label, _ in metrics],
+        SERVED_MODEL: [served[key] for _, key in metrics],
+        'Best Other Model': [max((row[key] for row in others), default=np.nan) for _, key in metrics]
+    })
     
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        # Performance comparison chart
         fig = px.bar(
-            perf_df, 
-            x='Metric', 
-            y=['Score', 'Benchmark'],
-            title="Model Performance vs Benchmark",
+            perf_df,
+            x='Metric',
+            y=[SERVED_MODEL, 'Best Other Model'],
+            title=f"{SERVED_MODEL} vs the Best Other Measured Model",
             barmode='group',
-            color_discrete_map={'Score': '#667eea', 'Benchmark': '#f093fb'}
+            color_discrete_map={SERVED_MODEL: '#667eea', 'Best Other Model': '#f093fb'}
         )
         fig.update_layout(height=400)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        # Performance metrics cards
         for _, row in perf_df.iterrows():
-            delta = row['Score'] - row['Benchmark']
+            delta = row[SERVED_MODEL] - row['Best Other Model']
             st.metric(
                 label=row['Metric'],
-                value=f"{row['Score']:.3f}",
-                delta=f"{delta:+.3f}"
+                value=f"{row[SERVED_MODEL]:.3f}",
+                delta=None if np.isnan(delta) else f"{delta:+.3f}"
             )
     
     # Confusion Matrix
     st.markdown("## 🔍 Confusion Matrix")
     
+    (tn, fp), (fn, tp) = served['confusion']
     col1, col2 = st.columns([1, 1])
     
     with col1:
-        # Sample confusion matrix data
-        confusion_matrix = np.array([[850, 15], [25, 110]])
-        
         fig = px.imshow(
-            confusion_matrix,
+            np.array(served['confusion']),
             text_auto=True,
             aspect="auto",
-            title="Confusion Matrix",
+            title=f"Confusion Matrix ({SERVED_MODEL}, test split)",
             labels=dict(x="Predicted", y="Actual", color="Count"),
             x=['Not Spam', 'Spam'],
             y=['Not Spam', 'Spam'],
@@ -75,15 +212,72 @@ def show_page():
     
     with col2:
         st.markdown("### 📈 Classification Results")
-        st.markdown("""
-        **True Negatives (TN):** 850  
-        **False Positives (FP):** 15  
-        **False Negatives (FN):** 25  
-        **True Positives (TP):** 110  
+        st.markdown(f"""
+        **True Negatives (TN):** {tn:,}  
+        **False Positives (FP):** {fp:,}  
+        **False Negatives (FN):** {fn:,}  
+        **True Positives (TP):** {tp:,}  
         
-        **Total Samples:** 1,000  
-        **Accuracy:** 96.0%
+        **Total Samples:** {tn + fp + fn + tp:,}  
+        **Accuracy:** {served['accuracy'] * 100:.1f}%
         """)
+
+def insights(comparison, served):
+    """Strengths and weaknesses as <li> items, with figures only when they were measured"""
+    strengths = ["<li><strong>Robust:</strong> Handles various message formats well</li>"]
+    improvements = [
+        "<li><strong>New Patterns:</strong> May miss novel spam techniques</li>",
+        "<li><strong>Language Dependency:</strong> Optimized for English text</li>",
+        "<li><strong>Context:</strong> Limited understanding of message context</li>"
+    ]
+    if served is None:
+        strengths[:0] = [
+            "<li><strong>Fast Training:</strong> Learns word statistics in a single pass over the data</li>",
+            "<li><strong>Low Memory:</strong> Minimal resource requirements</li>"
+        ]
+        return strengths, improvements
+    
+    models = comparison['models']
+    accuracy_rank = sorted(models, key=lambda row: -row['accuracy']).index(served) + 1
+    fit_rank = sorted(models, key=lambda row: row['fit_seconds']).index(served) + 1
+    (tn, fp), (fn, tp) = served['confusion']
+    training_memory = ""
+    if served['fit_memory_bytes'] is not None:
+        training_memory = f", {served['fit_memory_bytes'] / 2**20:.0f} MB extra while training"
+    strengths[:0] = [
+        f"<li><strong>Accuracy:</strong> {served['accuracy'] * 100:.1f}% on {tn + fp + fn + tp:,} held-out "
+        f"messages (#{accuracy_rank} of {len(models)} measured models)</li>",
+        f"<li><strong>Fast Training:</strong> {_format_seconds(served['fit_seconds'])} to train "
+        f"(#{fit_rank} of {len(models)})</li>",
+        f"<li><strong>Low Memory:</strong> {served['serialized_bytes'] / 1024:,.0f} KB serialized"
+        f"{training_memory}</li>"
+    ]
+    improvements[:0] = [
+        f"<li><strong>False Positives:</strong> {fp / max(tn + fp, 1) * 100:.1f}% of legitimate messages flagged</li>",
+        f"<li><strong>Missed Spam:</strong> {fn / max(fn + tp, 1) * 100:.1f}% of spam messages not caught</li>"
+    ]
+    return strengths, improvements
+
+def show_page():
+    """Analytics and insights page"""
+    
+    st.markdown("""
+    <div class="main-header fade-in">
+        <h1>📊 Analytics Dashboard</h1>
+        <p>Insights and statistics about spam detection</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    comparison = load_comparison(MODEL_COMPARISON_PATH, _mtime(MODEL_COMPARISON_PATH))
+    served = served_model_row(comparison)
+    
+    # Model Performance Section, from the served model's row of the measured comparison
+    st.markdown("## 🎯 Model Performance Metrics")
+    
+    if served is None:
+        st.caption("No measured results yet; see Model Comparison below.")
+    else:
+        show_served_performance(comparison, served)
     
     # Feature importance
     st.markdown("## 🔑 Feature Importance")
@@ -185,94 +379,35 @@ def show_page():
     )
     st.plotly_chart(fig, use_container_width=True)
     
-    # Model comparison
+    # Model comparison, measured by benchmarks/bench_model_comparison.py
     st.markdown("## 🏆 Model Comparison")
     
-    models_data = {
-        'Model': ['Naive Bayes', 'SVM', 'Random Forest', 'Logistic Regression', 'Neural Network'],
-        'Accuracy': [0.973, 0.968, 0.965, 0.962, 0.958],
-        'Training Time (s)': [0.5, 2.3, 15.7, 1.8, 45.2],
-        'Memory Usage (MB)': [12, 25, 180, 18, 320]
-    }
-    
-    models_df = pd.DataFrame(models_data)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        fig = px.scatter(
-            models_df,
-            x='Training Time (s)',
-            y='Accuracy',
-            size='Memory Usage (MB)',
-            hover_name='Model',
-            title="Model Performance vs Training Time",
-            labels={'Training Time (s)': 'Training Time (seconds)'}
+    if comparison is None:
+        st.info(
+            "No measured comparison yet. Run `python -m benchmarks.bench_model_comparison` "
+            f"to train every candidate model on spam.csv and write `{MODEL_COMPARISON_PATH}`."
         )
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        fig = px.bar(
-            models_df,
-            x='Model',
-            y='Accuracy',
-            title="Model Accuracy Comparison",
-            color='Accuracy',
-            color_continuous_scale='Viridis'
-        )
-        fig.update_xaxes(tickangle=45)
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # ROC Curve
-    st.markdown("## 📈 ROC Curve Analysis")
-    
-    # Generate sample ROC curve data
-    fpr = np.linspace(0, 1, 100)
-    tpr_nb = 1 - (1 - fpr) ** 2.5  # Naive Bayes curve
-    tpr_svm = 1 - (1 - fpr) ** 3.0  # SVM curve
-    tpr_rf = 1 - (1 - fpr) ** 2.8   # Random Forest curve
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=fpr, y=tpr_nb, name='Naive Bayes (AUC=0.96)', line=dict(color='#667eea')))
-    fig.add_trace(go.Scatter(x=fpr, y=tpr_svm, name='SVM (AUC=0.94)', line=dict(color='#f093fb')))
-    fig.add_trace(go.Scatter(x=fpr, y=tpr_rf, name='Random Forest (AUC=0.95)', line=dict(color='#51cf66')))
-    fig.add_trace(go.Scatter(x=[0, 1], y=[0, 1], name='Random Classifier', line=dict(dash='dash', color='gray')))
-    
-    fig.update_layout(
-        title='ROC Curves Comparison',
-        xaxis_title='False Positive Rate',
-        yaxis_title='True Positive Rate',
-        height=500
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    else:
+        show_model_comparison(comparison)
     
     # Key Insights
     st.markdown("## 💡 Key Insights")
     
     insights_col1, insights_col2 = st.columns(2)
+    strengths, improvements = insights(comparison, served)
     
     with insights_col1:
-        st.markdown("""
+        st.markdown(f"""
         <div class="info-card success-card">
             <h4>✅ Model Strengths</h4>
-            <ul>
-                <li><strong>High Accuracy:</strong> 97.3% classification accuracy</li>
-                <li><strong>Fast Training:</strong> Only 0.5 seconds to train</li>
-                <li><strong>Low Memory:</strong> Minimal resource requirements</li>
-                <li><strong>Robust:</strong> Handles various message formats well</li>
-            </ul>
+            <ul>{"".join(strengths)}</ul>
         </div>
         """, unsafe_allow_html=True)
     
     with insights_col2:
-        st.markdown("""
+        st.markdown(f"""
         <div class="info-card danger-card">
             <h4>⚠️ Areas for Improvement</h4>
-            <ul>
-                <li><strong>False Positives:</strong> 1.5% legitimate messages flagged</li>
-                <li><strong>New Patterns:</strong> May miss novel spam techniques</li>
-                <li><strong>Language Dependency:</strong> Optimized for English text</li>
-                <li><strong>Context:</strong> Limited understanding of message context</li>
-            </ul>
+            <ul>{"".join(improvements)}</ul>
         </div>
-        """, unsafe_allow_html=True)
\ No newline at end of file
+        """, unsafe_allow_html=True)
@@ -1,8 +1,14 @@
 import streamlit as st
 from datetime import datetime
 
-def show_page():
-    """Contact page with feedback form and support information"""
+def show_page(load_feedback_log):
+    """
+    Contact page with feedback form and support information
+    
+    Misclassified messages reported here are appended to the feedback log
+    returned by load_feedback_log, for the next feedback update (see
+    utils/feedback.py).
+    """
     
     st.markdown("""
     <div class="main-header fade-in">
@@ -116,6 +122,36 @@ def show_page():
             else:
                 st.error("❌ Please fill in all required fields (marked with *)")
     
+    # Corrections the model learns from
+    st.markdown("## 🏷️ Report a Misclassified Message")
+    
+    with st.form("correction_form", clear_on_submit=True):
+        st.caption(
+            "ℹ️ Submitting saves the message text and its label to the local feedback log "
+            "(feedback/feedback.jsonl), which is used to retrain the model."
+        )
+        correction_message = st.text_area(
+            "Message*",
+            placeholder="Paste the message that was classified incorrectly...",
+            height=100
+        )
+        correction_label = st.radio(
+            "This message is:",
+            ["🚫 Spam", "✅ Not Spam"],
+            horizontal=True
+        )
+        
+        correction_submitted = st.form_submit_button("🏷️ Submit Correction")
+        
+        if correction_submitted:
+            if correction_message.strip():
+                load_feedback_log().append(
+                    correction_message, 1 if correction_label == "🚫 Spam" else 0, source="contact"
+                )
+                st.success("✅ Correction recorded for the next model update.")
+            else:
+                st.error("❌ Please paste the message you are reporting")
+    
     # FAQ Section
     st.markdown("## ❓ Frequently Asked Questions")
     
@@ -126,7 +162,7 @@ def show_page():
         },
         {
             "question": "Is my data stored or shared?",
-            "answer": "No, your messages are processed locally and not stored on our servers. We prioritize user privacy and data security. All processing happens in real-time without data retention."
+            "answer": "Messages you classify are processed locally and never shared with external servers. A message is stored only when you submit feedback on its verdict (the 👍/👎 buttons on the Home page) or report it with the correction form above; it is then saved, with its label, to the local feedback log (feedback/feedback.jsonl) used to retrain the model. Nothing else you classify is kept."
         },
         {
             "question": "Can I use this for commercial purposes?",
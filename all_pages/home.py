@@ -1,9 +1,23 @@
 import streamlit as st
-import numpy as np
 import time
+from utils.memory import format_bytes
 
-def show_page(tfidf, model, text_processor, ui_components):
-    """Main spam classification page"""
+def record_verdict_feedback(feedback_log, message, label, predicted, kind):
+    """Button callback: log the user's verdict on a classification"""
+    feedback_log.append(message, label, source="home", predicted=predicted, kind=kind)
+    st.session_state["verdict_feedback"] = (label, kind)
+
+def show_page(load_model_registry, load_text_processor, load_feedback_log, start_feedback_updater, ui_components):
+    """
+    Main spam classification page
+    
+    The loaders are cached by main.py; they are called only after the
+    message input is on screen, so a cold start renders before spaCy and
+    the models have loaded. Verdicts confirmed or corrected by the user go
+    to the feedback log; start_feedback_updater returns the background
+    updater that learns from the corrections, or None when they are only
+    applied offline with `train_model.py --apply-feedback`.
+    """
     
     # Header
     ui_components.show_header(
@@ -76,6 +90,45 @@ def show_page(tfidf, model, text_processor, ui_components):
         **Training:** SMS Spam Collection Dataset  
         **Accuracy:** ~97% on test data
         """)
+        
+        # Shared NLP resources and models are loaded once per process
+        text_processor = load_text_processor()
+        model_registry = load_model_registry()
+        load_stats = text_processor.resources.load_stats
+        st.caption(
+            f"NLP resources ({', '.join(load_stats.get('pipelines', {})) or 'none'}) loaded once in "
+            f"{load_stats.get('load_time_ms', 0):.0f} ms, "
+            f"using ~{format_bytes(load_stats.get('memory_bytes', 0))}"
+        )
+        
+        # Retrained models are swapped in by the registry without a restart
+        model_version = model_registry.current()
+        load_phases = ", ".join(f"{name} {ms:.1f}" for name, ms in model_version.load_report["phases_ms"].items())
+        st.caption(
+            f"Model version {model_version.version} ({model_version.load_report['format']}) "
+            f"loaded in {model_version.load_ms:.0f} ms ({load_phases} ms)"
+        )
+        
+        feedback_log = load_feedback_log()
+        feedback_updater = start_feedback_updater()
+        # Imported with the models rather than at startup; it brings in sklearn
+        from utils.feedback import CONFIRMATION, CORRECTION
+        if feedback_updater is not None:
+            st.caption(f"Learned from {feedback_updater.state['applied']:,} user corrections since training")
+    
+    # Set by the feedback buttons of the previous analysis
+    verdict_feedback = st.session_state.pop("verdict_feedback", None)
+    if verdict_feedback is not None:
+        label, kind = verdict_feedback
+        if kind == CONFIRMATION:
+            # Confirmations are kept for statistics only; training on them would reinforce mistakes
+            st.success("✅ Thanks for confirming!")
+        else:
+            st.success(
+                f"✅ Thanks! Recorded as {'Spam' if label == 1 else 'Not Spam'}; "
+                + ("the model learns from it in the background." if feedback_updater is not None
+                   else "it is reviewed before the model learns from it.")
+            )
     
     # Prediction section
     if st.button("🔍 Analyze Message", type="primary"):
@@ -85,17 +138,14 @@ def show_page(tfidf, model, text_processor, ui_components):
                 time.sleep(1)
                 
                 try:
-                    # Process text
-                    transformed_text = text_processor.transform_text(input_text)
-                    
-                    # Get text statistics
-                    text_stats = text_processor.get_text_stats(input_text)
+                    # Process text and get statistics together: one tokenization plus one sentence parse
+                    transformed_text, text_stats = text_processor.analyze_text(input_text)
                     
-                    # Make prediction
-                    vector_input = tfidf.transform([transformed_text])
-                    prediction = model.predict(vector_input)[0]
-                    prediction_proba = model.predict_proba(vector_input)[0]
-                    confidence = max(prediction_proba)
+                    # Make prediction with a single model evaluation, on the version current now
+                    classifier = model_registry.current().classifier
+                    result = classifier.classify_processed(transformed_text)
+                    prediction = result["label"]
+                    confidence = result["confidence"]
                     
                     # Display results
                     st.markdown("---")
@@ -104,6 +154,25 @@ def show_page(tfidf, model, text_processor, ui_components):
                     # Show prediction result
                     ui_components.show_prediction_result(prediction, confidence)
                     
+                    # Let the user confirm or correct the verdict
+                    st.markdown("#### 🏷️ Was this verdict right?")
+                    st.caption(
+                        "ℹ️ Either button saves this message's text and your answer to the local "
+                        "feedback log (feedback/feedback.jsonl), which is used to retrain the model."
+                    )
+                    feedback_col1, feedback_col2 = st.columns(2)
+                    with feedback_col1:
+                        st.button(
+                            "👍 Correct", key="verdict_correct", on_click=record_verdict_feedback,
+                            args=(feedback_log, input_text, prediction, prediction, CONFIRMATION)
+                        )
+                    with feedback_col2:
+                        st.button(
+                            f"👎 Wrong, it is {'Not Spam' if prediction == 1 else 'Spam'}", key="verdict_wrong",
+                            on_click=record_verdict_feedback,
+                            args=(feedback_log, input_text, 1 - prediction, prediction, CORRECTION)
+                        )
+                    
                     # Show statistics
                     st.markdown("### 📈 Message Statistics")
                     ui_components.show_stats_cards(text_stats)
@@ -119,7 +188,11 @@ def show_page(tfidf, model, text_processor, ui_components):
                             "Uppercase Characters": text_stats.get("uppercase_count", 0),
                             "Punctuation Count": text_stats.get("punctuation_count", 0),
                             "Classification": "Spam" if prediction == 1 else "Not Spam",
-                            "Confidence Score": f"{confidence:.4f}"
+                            "Confidence Score": f"{confidence:.4f}",
+                            "Log-Likelihood Margin": f"{result['margin']:+.4f}",
+                            "Model Timings (ms)": {
+                                stage: round(ms, 3) for stage, ms in result["timings_ms"].items()
+                            }
                         })
                     
                     with col_detail2:
@@ -172,5 +245,5 @@ def show_page(tfidf, model, text_processor, ui_components):
     with feature_cols[2]:
         ui_components.show_info_card("""
         <h4>🔒 Privacy Focused</h4>
-        <p>Your messages are processed locally and not stored or transmitted to external servers.</p>
+        <p>Your messages are processed locally and never transmitted to external servers. A message is kept only when you submit feedback on its verdict or a correction, in the local feedback log used to retrain the model.</p>
         """)
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Compare cold and warm model load times: pickles vs memory-mapped artifacts
+
+Every measurement runs in a fresh Python process, after sklearn is
+imported, so only the load itself is timed. "Cold" first evicts the model
+files from the OS page cache with posix_fadvise(DONTNEED); "warm" loads
+them again right after. Private memory added by the load is reported too:
+mapped artifacts stay in the shared page cache instead.
+
+    python convert_models.py
+    python -m benchmarks.bench_artifact_load --repeat 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+from benchmarks.common import print_table
+from utils.artifacts import artifact_paths
+from utils.model_validator import ModelValidator
+
+# Runs in the child process; prints a JSON line with the load time
+_LOADER = """
+import json, pickle, sys, time, warnings
+warnings.simplefilter("ignore")
+import sklearn.feature_extraction.text, sklearn.naive_bayes
+from utils.artifacts import load_artifacts
+from utils.memory import current_rss_bytes
+
+def private_bytes():
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return sum(int(fields[k].split()[0]) * 1024 for k in ("Private_Clean", "Private_Dirty"))
+    except (OSError, KeyError):
+        return current_rss_bytes()
+
+kind, args = sys.argv[1], sys.argv[2:]
+before = private_bytes()
+start = time.perf_counter()
+if kind == "pickle":
+    with open(args[0], "rb") as f:
+        tfidf = pickle.load(f)
+    with open(args[1], "rb") as f:
+        model = pickle.load(f)
+else:
+    tfidf, model = load_artifacts(args[0], mmap_mode="r" if kind == "mmap" else None)
+load_ms = (time.perf_counter() - start) * 1000
+# First prediction touches the arrays, so page faults are included
+start = time.perf_counter()
+model.predict(tfidf.transform(["free entry win a prize now"]))
+first_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({"load_ms": load_ms, "first_predict_ms": first_ms, "private_bytes": private_bytes() - before}))
+"""
+
+def evict(paths):
+    """Drop files from the page cache; returns False where unsupported"""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
+
+def measure(kind, args, files, cold):
+    """Run one load in a child process and return its measurements"""
+    if cold:
+        evict(files)
+    env = dict(os.environ, PYTHONPATH=os.getcwd() + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    output = subprocess.run([sys.executable, "-c", _LOADER, kind, *args], capture_output=True, text=True, env=env, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifact-dir", default=None, help="Artifact directory (discovered when omitted)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration")
+    args = parser.parse_args()
+
+    tfidf_path, model_path = ModelValidator.find_model_files()
+    artifact_dir = args.artifact_dir or ModelValidator.find_artifact_dir()
+    if not tfidf_path or not artifact_dir:
+        print("❌ Need both the pickles and an artifact directory (run python convert_models.py)")
+        sys.exit(2)
+
+    configs = [
+        ("pickle", [tfidf_path, model_path], [tfidf_path, model_path]),
+        ("copy", [artifact_dir], artifact_paths(artifact_dir)),
+        ("mmap", [artifact_dir], artifact_paths(artifact_dir)),
+    ]
+    if not hasattr(os, "posix_fadvise"):
+        print("⚠️ posix_fadvise unavailable: cold runs may hit the page cache")
+
+    rows = []
+    for kind, loader_args, files in configs:
+        for state in ("cold", "warm"):
+            runs = [measure(kind, loader_args, files, cold=state == "cold") for _ in range(args.repeat)]
+            rows.append({
+                "format": kind,
+                "cache": state,
+                "load_ms": float(np.median([r["load_ms"] for r in runs])),
+                "first_predict_ms": float(np.median([r["first_predict_ms"] for r in runs])),
+                "private_kb": float(np.median([r["private_bytes"] for r in runs])) / 1024,
+                "file_kb": sum(os.path.getsize(p) for p in files) / 1024
+            })
+
+    print_table(rows, ["format", "cache", "load_ms", "first_predict_ms", "private_kb", "file_kb"])
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
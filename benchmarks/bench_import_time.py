@@ -0,0 +1,133 @@
+"""
+Import-time profile of the app and CLI entry points
+
+Each target is imported in a fresh interpreter with `python -X importtime`
+(after one discarded run that warms the bytecode cache). For every target
+the median total is reported with the slowest modules by cumulative time
+and the self time summed per top-level package, so a new eager import of
+spaCy, NLTK, sklearn or plotly shows up by name.
+
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --output import_profile.json
+    python -m benchmarks.bench_import_time --compare import_profile.json --max-regression-pct 20
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+from benchmarks.common import print_table
+
+# Entry points a user or process manager actually starts, plus the pages
+DEFAULT_TARGETS = ["main", "all_pages.home", "all_pages.analytics", "serve", "classify"]
+
+def profile_import(target):
+    """
+    Import one module in a child interpreter
+
+    Returns:
+        dict: Wall time of the child, and self / cumulative microseconds per
+            module; "error" holds the last stderr line when the import failed
+    """
+    env = dict(os.environ, PYTHONPATH=os.getcwd() + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                            capture_output=True, text=True, env=env)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if output.returncode != 0:
+        return {"error": output.stderr.strip().splitlines()[-1]}
+
+    modules = {}
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return {"wall_ms": wall_ms, "modules": modules}
+
+def summarize(target, runs, top):
+    """Median timings of one target across runs"""
+    names = set().union(*(run["modules"] for run in runs))
+
+    def median_ms(name, index):
+        return float(np.median([run["modules"].get(name, (0, 0))[index] for run in runs])) / 1000
+
+    modules = [{"module": name, "self_ms": median_ms(name, 0), "cumulative_ms": median_ms(name, 1)} for name in names]
+    packages = {}
+    for module in modules:
+        package = module["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + module["self_ms"]
+
+    return {
+        "target": target,
+        "import_ms": median_ms(target, 1),
+        "wall_ms": float(np.median([run["wall_ms"] for run in runs])),
+        "modules_imported": len(names),
+        "slowest_modules": sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True)[:top],
+        "packages_ms": dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top])
+    }
+
+def compare(results, baseline_path, max_regression_pct):
+    """Print the change against a saved report; returns the targets over the limit"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {entry["target"]: entry for entry in json.load(f)["targets"]}
+
+    rows, regressions = [], []
+    for result in results:
+        before = baseline.get(result["target"])
+        if before is None:
+            continue
+        change_pct = (result["import_ms"] - before["import_ms"]) / before["import_ms"] * 100
+        rows.append({"target": result["target"], "before_ms": before["import_ms"],
+                     "after_ms": result["import_ms"], "change_pct": change_pct})
+        if change_pct > max_regression_pct:
+            regressions.append(result["target"])
+
+    print(f"\n📏 Against {baseline_path}")
+    print_table(rows, ["target", "before_ms", "after_ms", "change_pct"])
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS, help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target")
+    parser.add_argument("--top", type=int, default=10, help="Modules and packages listed per target")
+    parser.add_argument("--output", default=None, help="Write the report as JSON")
+    parser.add_argument("--compare", default=None, help="JSON report to compare against")
+    parser.add_argument("--max-regression-pct", type=float, default=20.0, help="Exit 1 when a target gets this much slower")
+    args = parser.parse_args()
+
+    results = []
+    for target in args.targets:
+        warmup = profile_import(target)
+        if "error" in warmup:
+            print(f"\n⚠️ Skipping {target}: {warmup['error']}")
+            continue
+        runs = [profile_import(target) for _ in range(args.repeat)]
+        result = summarize(target, runs, args.top)
+        results.append(result)
+
+        print(f"\n📦 {target}: {result['import_ms']:.0f} ms import, {result['wall_ms']:.0f} ms interpreter wall time, "
+              f"{result['modules_imported']} modules")
+        print_table(result["slowest_modules"], ["module", "self_ms", "cumulative_ms"])
+        print("  by package: " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in result["packages_ms"].items()))
+
+    print()
+    print_table(results, ["target", "import_ms", "wall_ms", "modules_imported"])
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "repeat": args.repeat, "targets": results}, f, indent=2)
+        print(f"💾 Wrote {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.max_regression_pct)
+        if regressions:
+            print(f"❌ Import time regressed more than {args.max_regression_pct:.0f}%: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Train and measure candidate classifiers on the same cached TF-IDF features
+
+Naive Bayes (the served model's algorithm and settings), a linear SVM,
+Random Forest, Logistic Regression and a small neural network are fitted
+on the train_model.py split and vectorizer, over messages preprocessed
+the way the app serves them (TextProcessor; the regex backend produces
+the same tokens without loading spaCy, see check_parity.py). Features
+come from the feature cache, so every model sees identical features.
+Each model runs in a fresh spawned process that holds
+only those features, and its peak RSS is reset just before fitting.
+Per model it records:
+
+    fit time            wall clock of fit()
+    per-message latency vectorize + predict of one preprocessed message
+    batch latency       vectorize + predict of the whole test split (best of --repeat)
+    fit memory          peak RSS during fit() above the RSS before it
+    serialized size     pickle of the fitted classifier
+    quality             accuracy, spam precision / recall / F1, ROC AUC,
+                        confusion matrix and ROC curve
+
+Results go to models/model_comparison.json, which the Analytics page charts.
+
+    python -m benchmarks.bench_model_comparison
+    python -m benchmarks.bench_model_comparison --preprocessing regex
+    python -m benchmarks.bench_model_comparison --models "Naive Bayes" "Logistic Regression" --output /tmp/comparison.json
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import platform
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, confusion_matrix, precision_recall_fscore_support, roc_auc_score, roc_curve
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.neural_network import MLPClassifier
+from sklearn.svm import SVC
+from benchmarks.common import load_labeled, preprocess_cached, print_table, summarize_latencies, time_per_item
+from utils.feature_cache import FeatureCache
+from utils.memory import current_rss_bytes, peak_rss_bytes, reset_peak_rss
+from utils.model_comparison import MODEL_COMPARISON_PATH, save_model_comparison
+
+# Unfitted candidates by display name; built inside the worker process
+CANDIDATES = {
+    "Naive Bayes": lambda: MultinomialNB(),
+    "SVM": lambda: SVC(kernel="linear", random_state=42),
+    "Random Forest": lambda: RandomForestClassifier(n_estimators=100, n_jobs=1, random_state=42),
+    "Logistic Regression": lambda: LogisticRegression(max_iter=1000),
+    "Neural Network": lambda: MLPClassifier(hidden_layer_sizes=(100,), early_stopping=True, random_state=42)
+}
+
+TABLE_COLUMNS = ["model", "accuracy", "f1", "roc_auc", "fit_s", "p50_ms", "p99_ms", "batch_ms", "fit_memory_mb", "size_kb"]
+
+def make_vectorizer():
+    """The vectorizer train_model.py trains"""
+    return TfidfVectorizer(max_features=5000, stop_words='english', ngram_range=(1, 2))
+
+def measure_model(name, texts, labels, latency_sample, repeat):
+    """Fit and measure one candidate; runs in its own process"""
+    features, _ = FeatureCache().get_or_build(texts, labels, make_vectorizer)
+    tfidf = features["tfidf"]
+    test_texts = [texts[i] for i in features["test_index"]]
+    # A small warm-up fit loads the estimator's code paths, so they count neither as fit time nor memory
+    CANDIDATES[name]().fit(features["X_train"][:200], features["y_train"][:200])
+    model = CANDIDATES[name]()
+    # Without a reset the peak would be that of importing and loading the features
+    peak_was_reset = reset_peak_rss()
+    rss_before_fit = current_rss_bytes()
+    start = time.perf_counter()
+    model.fit(features["X_train"], features["y_train"])
+    fit_seconds = time.perf_counter() - start
+    fit_peak_rss = peak_rss_bytes()
+
+    predicted = model.predict(features["X_test"])
+    if hasattr(model, "predict_proba"):
+        scores = model.predict_proba(features["X_test"])[:, 1]
+    else:
+        scores = model.decision_function(features["X_test"])
+    precision, recall, f1, _ = precision_recall_fscore_support(
+        features["y_test"], predicted, average="binary", zero_division=0
+    )
+    fpr, tpr, _ = roc_curve(features["y_test"], scores)
+
+    latencies = summarize_latencies(
+        time_per_item(lambda text: model.predict(tfidf.transform([text])), test_texts[:latency_sample])
+    )
+    batch_ms = min(time_per_item(lambda batch: model.predict(tfidf.transform(batch)), [test_texts], repeat))
+
+    return {
+        "model": name,
+        "estimator": type(model).__name__,
+        "params": {key: repr(value) for key, value in model.get_params().items()},
+        "accuracy": float(accuracy_score(features["y_test"], predicted)),
+        "precision": float(precision),
+        "recall": float(recall),
+        "f1": float(f1),
+        "roc_auc": float(roc_auc_score(features["y_test"], scores)),
+        "confusion": confusion_matrix(features["y_test"], predicted).tolist(),
+        "roc_curve": {"fpr": np.round(fpr, 4).tolist(), "tpr": np.round(tpr, 4).tolist()},
+        "fit_seconds": fit_seconds,
+        "per_message_ms": latencies,
+        "batch_ms": float(batch_ms),
+        "batch_messages": len(test_texts),
+        "rss_before_fit_bytes": rss_before_fit,
+        "fit_peak_rss_bytes": fit_peak_rss,
+        "fit_memory_bytes": max(fit_peak_rss - rss_before_fit, 0) if peak_was_reset else None,
+        "serialized_bytes": len(pickle.dumps(model))
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="spam.csv", help="Labeled dataset (spam.csv layout)")
+    parser.add_argument("--preprocessing", choices=["spacy", "regex", "simple"], default="spacy",
+                        help="The app's TextProcessor with that backend, or train_model.py's preprocess_text")
+    parser.add_argument("--models", nargs="+", choices=list(CANDIDATES), default=list(CANDIDATES), help="Models to compare")
+    parser.add_argument("--latency-sample", type=int, default=500, help="Test messages timed one at a time")
+    parser.add_argument("--repeat", type=int, default=5, help="Batch predictions timed per model (best is kept)")
+    parser.add_argument("--output", default=MODEL_COMPARISON_PATH, help="Results file the Analytics page reads")
+    args = parser.parse_args()
+
+    messages, labels = load_labeled(args.data)
+    texts, report = preprocess_cached(messages, args.preprocessing, "model comparison")
+    print(f"♻️ Preprocessing: {report['hits']:,} of {report['rows']:,} messages cached, "
+          f"{report['computed']:,} preprocessed in {report['seconds']:.2f}s")
+
+    # Build the cache entry once here, so no worker's fit is measured alongside TF-IDF fitting
+    features, cache_report = FeatureCache().get_or_build(texts, labels, make_vectorizer)
+    print(f"🔤 TF-IDF features {'loaded from' if cache_report['hit'] else 'built into'} the feature cache "
+          f"({features['X_train'].shape[0]:,} train / {features['X_test'].shape[0]:,} test rows, "
+          f"{features['X_train'].shape[1]:,} features)")
+
+    rows = []
+    spawn = multiprocessing.get_context("spawn")
+    for name in args.models:
+        print(f"🤖 {name}...", end=" ", flush=True)
+        with ProcessPoolExecutor(1, mp_context=spawn) as pool:
+            result = pool.submit(measure_model, name, texts, labels, args.latency_sample, args.repeat).result()
+        print(f"fitted in {result['fit_seconds']:.2f}s")
+        rows.append(result)
+
+    save_model_comparison({
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "dataset": {
+            "path": args.data,
+            "messages": len(messages),
+            "spam": int(labels.sum()),
+            "train": features["X_train"].shape[0],
+            "test": features["X_test"].shape[0]
+        },
+        "features": {
+            "preprocessing": args.preprocessing,
+            "vectorizer": repr(make_vectorizer()),
+            "columns": features["X_train"].shape[1],
+            "vectorizer_bytes": len(pickle.dumps(features["tfidf"]))
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "sklearn": sklearn.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count()
+        },
+        "models": rows
+    }, args.output)
+
+    print()
+    print_table([{
+        "model": row["model"],
+        "accuracy": row["accuracy"],
+        "f1": row["f1"],
+        "roc_auc": row["roc_auc"],
+        "fit_s": row["fit_seconds"],
+        "p50_ms": row["per_message_ms"]["p50_ms"],
+        "p99_ms": row["per_message_ms"]["p99_ms"],
+        "batch_ms": row["batch_ms"],
+        "fit_memory_mb": row["fit_memory_bytes"] and row["fit_memory_bytes"] / 2**20,
+        "size_kb": row["serialized_bytes"] / 1024
+    } for row in rows], TABLE_COLUMNS)
+    print(f"\n💾 Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Per-message latency of TextProcessor.transform_text for each spaCy pipeline profile
+
+"full" is the behaviour before pipeline profiles existed; "tokenizer" and
+"blank" skip every trained component.
+
+    python -m benchmarks.bench_pipeline_profiles --limit 2000
+"""
+
+import argparse
+from benchmarks.common import load_messages, time_per_item, summarize_latencies, print_table
+from utils.nlp_resources import NLPResources, PIPELINE_PROFILES
+from utils.text_processor import TextProcessor
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="spam.csv", help="CSV file with raw messages")
+    parser.add_argument("--limit", type=int, default=None, help="Only use the first N messages")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the messages per profile")
+    args = parser.parse_args()
+
+    messages = load_messages(args.data, args.limit)
+    print(f"📊 Benchmarking {len(messages)} messages from {args.data}")
+
+    rows = []
+    for profile in PIPELINE_PROFILES:
+        try:
+            NLPResources.get().pipeline(profile)
+        except OSError as e:
+            print(f"⚠️ Skipping profile '{profile}': {e}")
+            continue
+
+        processor = TextProcessor(profile=profile)
+        # Warm up the tokenizer caches before timing
+        for message in messages[:50]:
+            processor.transform_text(message)
+
+        stats = summarize_latencies(time_per_item(processor.transform_text, messages, args.repeat))
+        stats["profile"] = profile
+        stats["load_time_ms"] = NLPResources.get().load_stats["pipelines"][profile]["load_time_ms"]
+        rows.append(stats)
+
+    baseline = next((r["mean_ms"] for r in rows if r["profile"] == "full"), None)
+    for row in rows:
+        row["speedup"] = f"{baseline / row['mean_ms']:.1f}x" if baseline else "n/a"
+
+    print_table(rows, ["profile", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "load_time_ms", "speedup"])
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""
+Memory of N pre-forked workers vs N independent server processes
+
+Starts `serve.py --workers N` and, separately, N single-process
+`serve.py` instances, drives both with the same load so every worker has
+served traffic, then reads /proc/<pid>/smaps_rollup for every process.
+The sum of PSS is what the group really costs; USS is what each worker
+holds privately. Linux only.
+
+    python -m benchmarks.bench_prefork_memory --workers 4 --backend regex
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from benchmarks.common import load_messages, print_table
+from benchmarks.load_generator import run_client, wait_until_ready
+from utils.memory import process_memory
+
+def child_pids(pid):
+    """Direct children of a process"""
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+def drive(ports, messages, seconds, connections_per_port):
+    """Closed-loop load on every port; returns the number of successful requests"""
+    results, threads = [], []
+    stop_at = time.perf_counter() + seconds
+    for port in ports:
+        for c in range(connections_per_port):
+            thread = threading.Thread(target=run_client, args=("127.0.0.1", port, messages, c * 97, 1, stop_at, results))
+            thread.start()
+            threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return sum(1 for _, status, _ in results if status == 200)
+
+def summarize(mode, processes, workers, requests):
+    """Memory totals for a group of processes; workers are the ones serving requests"""
+    memory = {pid: process_memory(pid) for pid in processes}
+    worker_uss = [memory[pid]["uss"] for pid in workers]
+    return {
+        "mode": mode,
+        "processes": len(processes),
+        "requests": requests,
+        "rss_mb": sum(m["rss"] for m in memory.values()) / 2**20,
+        "pss_mb": sum(m["pss"] for m in memory.values()) / 2**20,
+        "uss_mb": sum(m["uss"] for m in memory.values()) / 2**20,
+        "worker_uss_mb": sum(worker_uss) / len(worker_uss) / 2**20
+    }
+
+def start_server(port, extra_args):
+    return subprocess.Popen([sys.executable, "serve.py", "--port", str(port), *extra_args],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def stop_servers(servers):
+    for server in servers:
+        server.terminate()
+    for server in servers:
+        server.wait(timeout=10)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes in each mode")
+    parser.add_argument("--backend", choices=["spacy", "regex"], default="spacy", help="Tokenizer backend")
+    parser.add_argument("--port", type=int, default=8300, help="First port to use")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Load duration per mode")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for the servers to load")
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("❌ Needs Linux /proc/<pid>/smaps_rollup")
+        sys.exit(2)
+
+    messages = load_messages()
+    server_args = ["--backend", args.backend, "--validation", "receipt"]
+    rows = []
+
+    prefork = start_server(args.port, server_args + ["--workers", str(args.workers)])
+    try:
+        if not wait_until_ready("127.0.0.1", args.port, args.timeout):
+            print("❌ Pre-fork server did not become ready")
+            sys.exit(1)
+        requests = drive([args.port], messages, args.seconds, args.workers * 2)
+        workers = child_pids(prefork.pid)
+        rows.append(summarize("prefork", [prefork.pid] + workers, workers, requests))
+    finally:
+        stop_servers([prefork])
+
+    ports = [args.port + 1 + i for i in range(args.workers)]
+    independent = [start_server(port, server_args) for port in ports]
+    try:
+        if not all(wait_until_ready("127.0.0.1", port, args.timeout) for port in ports):
+            print("❌ Independent servers did not become ready")
+            sys.exit(1)
+        requests = drive(ports, messages, args.seconds, 2)
+        pids = [server.pid for server in independent]
+        rows.append(summarize("independent", pids, pids, requests))
+    finally:
+        stop_servers(independent)
+
+    print_table(rows, ["mode", "processes", "requests", "rss_mb", "pss_mb", "uss_mb", "worker_uss_mb"])
+    saved = rows[1]["pss_mb"] - rows[0]["pss_mb"]
+    print(f"💾 Pre-forking saves {saved:.1f} MB of PSS ({saved / rows[1]['pss_mb']:.0%}) for {args.workers} workers")
+
+if __name__ == "__main__":
+    main()
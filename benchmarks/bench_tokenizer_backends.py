@@ -0,0 +1,65 @@
+"""
+Throughput of TextProcessor per tokenizer backend
+
+Measures messages per second for single-message transform_text calls and for
+the batched transform_many path, plus the time to construct the processor.
+
+    python -m benchmarks.bench_tokenizer_backends --repeat 3
+"""
+
+import argparse
+import time
+from benchmarks.common import PROCESSOR_CONFIGS, build_processor, load_messages, print_table
+from utils.nlp_resources import NLPResources
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="spam.csv", help="CSV file with raw messages")
+    parser.add_argument("--limit", type=int, default=None, help="Only use the first N messages")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the messages per configuration")
+    parser.add_argument("--configs", nargs="+", default=PROCESSOR_CONFIGS, help="Configurations to benchmark")
+    parser.add_argument("--stem-table", default=None, help="Precomputed stem table to load, e.g. stem_table.json")
+    args = parser.parse_args()
+
+    messages = load_messages(args.data, args.limit) * args.repeat
+    print(f"📊 Benchmarking {len(messages)} messages from {args.data}")
+
+    if args.stem_table:
+        loaded = NLPResources.get().stemmer.load_table(args.stem_table)
+        print(f"📚 Loaded {loaded} precomputed stems from {args.stem_table}")
+
+    rows = []
+    for config in args.configs:
+        start = time.perf_counter()
+        processor = build_processor(config)
+        if processor is None:
+            continue
+        setup_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for message in messages:
+            processor.transform_text(message)
+        single_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in processor.transform_many(messages):
+            pass
+        batch_seconds = time.perf_counter() - start
+
+        rows.append({
+            "config": config,
+            "setup_ms": setup_ms,
+            "single_msgs_per_s": f"{len(messages) / single_seconds:,.0f}",
+            "batch_msgs_per_s": f"{len(messages) / batch_seconds:,.0f}"
+        })
+
+    print_table(rows, ["config", "setup_ms", "single_msgs_per_s", "batch_msgs_per_s"])
+
+    # Every configuration shares the process-wide stemmer
+    stem_stats = NLPResources.get().stemmer.stats()
+    print(f"\n🔁 Stem cache: {stem_stats['hit_ratio']:.1%} hit ratio "
+          f"({stem_stats['table_hits']} table hits, {stem_stats['cache_hits']} LRU hits, "
+          f"{stem_stats['cache_misses']} misses, {stem_stats['cache_size']}/{stem_stats['cache_maxsize']} cached)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
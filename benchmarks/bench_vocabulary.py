@@ -0,0 +1,126 @@
+"""
+Compare the vectorizer's vocabulary_ dict with CompactVocabulary
+
+Reports byte-level memory (deep dict size vs array bytes, and traced
+allocations while loading each form), load time from disk, lookup latency,
+and checks that tfidf.transform and the compiled scorer give identical
+results with the compact vocabulary swapped in.
+
+    python -m benchmarks.bench_vocabulary --export models/vocabulary.vocab
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from benchmarks.common import build_processor, load_messages, print_table
+from utils.compact_vocabulary import CompactVocabulary, dict_memory_bytes
+from utils.compiled_scorer import CompiledScorer
+from utils.memory import format_bytes
+from utils.model_validator import ModelValidator
+
+def traced_load(load):
+    """Return (result, seconds, bytes still allocated) for a loader call"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current
+
+def lookup_ns(vocabulary, terms):
+    """Mean nanoseconds per vocabulary.get over terms"""
+    get = vocabulary.get
+    start = time.perf_counter()
+    for term in terms:
+        get(term)
+    return (time.perf_counter() - start) / len(terms) * 1e9
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="spam.csv", help="CSV file with raw messages")
+    parser.add_argument("--config", default="regex", help="TextProcessor configuration used to preprocess")
+    parser.add_argument("--export", default=None, help="Also write the compact vocabulary to this path")
+    args = parser.parse_args()
+
+    tfidf_path, model_path = ModelValidator.find_model_files()
+    if not tfidf_path:
+        print("❌ Model files not found")
+        sys.exit(2)
+    with open(tfidf_path, 'rb') as f:
+        tfidf = pickle.load(f)
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    vocabulary = dict(tfidf.vocabulary_)
+    compact = CompactVocabulary.from_dict(vocabulary)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dict_path = os.path.join(tmp, "vocabulary.pkl")
+        compact_path = os.path.join(tmp, "vocabulary.vocab")
+        with open(dict_path, 'wb') as f:
+            pickle.dump(vocabulary, f)
+        compact.save(compact_path)
+
+        def unpickle_dict():
+            with open(dict_path, 'rb') as f:
+                return pickle.load(f)
+
+        _, dict_seconds, dict_traced = traced_load(unpickle_dict)
+        copied, copy_seconds, copy_traced = traced_load(lambda: CompactVocabulary.load(compact_path, mmap_mode=False))
+        mapped, map_seconds, map_traced = traced_load(lambda: CompactVocabulary.load(compact_path))
+        file_sizes = (os.path.getsize(dict_path), os.path.getsize(compact_path))
+
+        if dict(mapped.items()) != vocabulary or dict(copied.items()) != vocabulary:
+            print("❌ Compact vocabulary does not round-trip")
+            sys.exit(1)
+
+        probe = list(vocabulary) * 5 + [f"{term}zz" for term in list(vocabulary)[:5000]]
+        rows = [
+            {"vocabulary": "dict (pickle)", "entries": len(vocabulary), "deep_bytes": dict_memory_bytes(vocabulary),
+             "file_bytes": file_sizes[0], "traced_load_bytes": dict_traced, "load_ms": dict_seconds * 1000,
+             "lookup_ns": lookup_ns(vocabulary, probe)},
+            {"vocabulary": "compact (copy)", "entries": len(copied), "deep_bytes": copied.memory_bytes(),
+             "file_bytes": file_sizes[1], "traced_load_bytes": copy_traced, "load_ms": copy_seconds * 1000,
+             "lookup_ns": lookup_ns(copied, probe)},
+            {"vocabulary": "compact (mmap)", "entries": len(mapped), "deep_bytes": mapped.memory_bytes(),
+             "file_bytes": file_sizes[1], "traced_load_bytes": map_traced, "load_ms": map_seconds * 1000,
+             "lookup_ns": lookup_ns(mapped, probe)},
+        ]
+        print_table(rows, ["vocabulary", "entries", "deep_bytes", "file_bytes", "traced_load_bytes", "load_ms", "lookup_ns"])
+        print(f"💾 Deep size {format_bytes(rows[0]['deep_bytes'])} -> {format_bytes(rows[1]['deep_bytes'])} "
+              f"({rows[0]['deep_bytes'] / rows[1]['deep_bytes']:.1f}x smaller)")
+
+        # Parity: sparse batch path and compiled scorer
+        texts = list(build_processor(args.config).transform_many(load_messages(args.data)))
+        start = time.perf_counter()
+        expected = tfidf.transform(texts)
+        dict_transform = time.perf_counter() - start
+        tfidf.vocabulary_ = mapped
+        start = time.perf_counter()
+        actual = tfidf.transform(texts)
+        compact_transform = time.perf_counter() - start
+        transform_diff = abs(expected - actual).max() if expected.nnz else 0.0
+
+        scorer = CompiledScorer.from_models(tfidf, model, compact_vocabulary=True)
+        expected_proba = model.predict_proba(expected)[:, 1]
+        compact_proba = np.array([scorer.predict_proba(t)[1] for t in texts])
+        scorer_diff = np.abs(expected_proba - compact_proba).max()
+
+        ok = transform_diff == 0 and scorer_diff <= 1e-9
+        print(f"{'✅' if ok else '❌'} {len(texts)} messages: tfidf.transform max |Δ| = {transform_diff:.3e} "
+              f"({dict_transform * 1000:.0f} ms dict, {compact_transform * 1000:.0f} ms compact), "
+              f"compiled scorer max |Δ predict_proba| = {scorer_diff:.3e}")
+
+    if args.export:
+        compact.save(args.export)
+        print(f"💾 Exported compact vocabulary to {args.export}")
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
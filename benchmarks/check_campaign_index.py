@@ -0,0 +1,91 @@
+"""
+Measure CampaignIndex hit rate and false-match rate on a labelled dataset
+
+Messages are replayed in a shuffled order as live traffic. Each one is first
+looked up in the index; on a match the index's verdict is compared with what
+the full model says for that message (a false match when they disagree) and
+with the dataset label. Messages the model calls spam are then indexed, as
+the classifier does.
+
+    python -m benchmarks.check_campaign_index --thresholds 0.5 0.6 0.7 0.8
+"""
+
+import argparse
+import pickle
+import sys
+import numpy as np
+import pandas as pd
+from benchmarks.common import build_processor, print_table
+from utils.campaign_index import CampaignIndex
+from utils.model_validator import ModelValidator
+
+def replay(index, processed, model_labels, true_labels, order):
+    """Replay messages through the index; return per-run counters"""
+    hits = false_vs_model = false_vs_truth = exact_hits = 0
+    seen_spam = set()
+    for i in order:
+        verdict, _ = index.query(processed[i])
+        if processed[i] in seen_spam:
+            exact_hits += 1
+        if verdict is not None:
+            hits += 1
+            false_vs_model += verdict["label"] != model_labels[i]
+            false_vs_truth += verdict["label"] != true_labels[i]
+        if model_labels[i] == 1:
+            index.add(processed[i], {"label": 1})
+            seen_spam.add(processed[i])
+
+    stats = index.stats()
+    return {
+        "threshold": index.threshold,
+        "hits": hits,
+        "hit_rate": hits / len(order),
+        "exact_hit_rate": exact_hits / len(order),
+        "false_match_rate": false_vs_model / hits if hits else 0.0,
+        "label_error_rate": false_vs_truth / hits if hits else 0.0,
+        "entries": stats["entries"],
+        "memory_kb": stats["memory_bytes"] / 1024
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="spam.csv", help="CSV with v1 (ham/spam) and v2 (message) columns")
+    parser.add_argument("--config", default="regex", help="TextProcessor configuration used to preprocess")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.5, 0.6, 0.7, 0.8, 0.9], help="Similarity thresholds to compare")
+    parser.add_argument("--seed", type=int, default=42, help="Shuffle seed for the replay order")
+    parser.add_argument("--max-false-match-rate", type=float, default=None, help="Exit 1 if the default threshold exceeds this")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data, encoding='latin-1')
+    messages = df['v2'].fillna("").astype(str).tolist()
+    true_labels = (df['v1'] == 'spam').astype(int).to_numpy()
+
+    tfidf_path, model_path = ModelValidator.find_model_files()
+    if not tfidf_path:
+        print("❌ Model files not found")
+        sys.exit(2)
+    with open(tfidf_path, 'rb') as f:
+        tfidf = pickle.load(f)
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+
+    processor = build_processor(args.config)
+    if processor is None:
+        sys.exit(2)
+    processed = list(processor.transform_many(messages))
+    model_labels = model.predict(tfidf.transform(processed))
+    order = np.random.default_rng(args.seed).permutation(len(messages))
+
+    rows = [replay(CampaignIndex(threshold=t), processed, model_labels, true_labels, order) for t in args.thresholds]
+    print(f"{len(messages)} messages, {int(model_labels.sum())} classified as spam")
+    print_table(rows, ["threshold", "hits", "hit_rate", "exact_hit_rate", "false_match_rate", "label_error_rate", "entries", "memory_kb"])
+
+    if args.max_false_match_rate is not None:
+        default = replay(CampaignIndex(), processed, model_labels, true_labels, order)
+        within = default["false_match_rate"] <= args.max_false_match_rate
+        print(f"{'✅' if within else '❌'} default threshold {default['threshold']}: "
+              f"false-match rate {default['false_match_rate']:.4f}, hit rate {default['hit_rate']:.4f}")
+        sys.exit(0 if within else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""
+Check CompiledScorer against sklearn and compare single-message latency
+
+Every message in the dataset is preprocessed, then scored by
+tfidf.transform + model.predict_proba and by the compiled scorer (also after
+a save/load round trip). Exits with status 1 if any probability differs by
+more than the tolerance.
+
+    python -m benchmarks.check_compiled_scorer --export compiled_scorer.npz
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import numpy as np
+from benchmarks.common import build_processor, load_messages, time_per_item, summarize_latencies, print_table
+from utils.compiled_scorer import CompiledScorer
+from utils.model_validator import ModelValidator
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="spam.csv", help="CSV file with raw messages")
+    parser.add_argument("--config", default="regex", help="TextProcessor configuration used to preprocess")
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="Maximum allowed probability difference")
+    parser.add_argument("--export", default=None, help="Also write the compiled scorer to this .npz path")
+    args = parser.parse_args()
+
+    tfidf_path, model_path = ModelValidator.find_model_files()
+    if not tfidf_path:
+        print("❌ Model files not found")
+        sys.exit(2)
+    with open(tfidf_path, 'rb') as f:
+        tfidf = pickle.load(f)
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+
+    processor = build_processor(args.config)
+    texts = list(processor.transform_many(load_messages(args.data)))
+    scorer = CompiledScorer.from_models(tfidf, model)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "scorer.npz")
+        scorer.save(path)
+        reloaded = CompiledScorer.load(path)
+
+    expected = model.predict_proba(tfidf.transform(texts))[:, 1]
+    compiled = np.array([scorer.predict_proba(t)[1] for t in texts])
+    roundtrip = np.array([reloaded.predict_proba(t)[1] for t in texts])
+    max_diff = max(np.abs(expected - compiled).max(), np.abs(expected - roundtrip).max())
+    labels_match = all(scorer.predict(t) == p for t, p in zip(texts, model.predict(tfidf.transform(texts))))
+
+    status = "✅" if max_diff <= args.tolerance and labels_match else "❌"
+    print(f"{status} {len(texts)} messages: max |Δ predict_proba| = {max_diff:.3e}, labels match: {labels_match}")
+
+    sklearn_stats = summarize_latencies(time_per_item(lambda t: model.predict_proba(tfidf.transform([t])), texts))
+    compiled_stats = summarize_latencies(time_per_item(scorer.predict_proba, texts))
+    sklearn_stats["scorer"] = "sklearn transform + predict_proba"
+    compiled_stats["scorer"] = "compiled"
+    print_table([sklearn_stats, compiled_stats], ["scorer", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+
+    if args.export:
+        scorer.save(args.export)
+        print(f"💾 Exported compiled scorer to {args.export}")
+
+    sys.exit(0 if status == "✅" else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+Differential check that TextProcessor configurations produce identical output
+
+Every configuration ("spacy:<profile>" or "regex") is run over each dataset
+and compared with the reference, the first loadable configuration (the full
+spaCy pipeline by default). Every divergent message is reported and the
+script exits with status 1 if any were found.
+
+    python -m benchmarks.check_parity --data spam.csv cleaned_data.csv
+"""
+
+import argparse
+import sys
+from benchmarks.common import PROCESSOR_CONFIGS, build_processor, load_messages
+
+def find_divergences(messages, reference, candidate):
+    """Return (index, message, expected, actual) for every mismatching output"""
+    divergences = []
+    for i, message in enumerate(messages):
+        expected = reference.transform_text(message)
+        actual = candidate.transform_text(message)
+        if expected != actual:
+            divergences.append((i, message, expected, actual))
+    return divergences
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", nargs="+", default=["spam.csv", "cleaned_data.csv"], help="CSV files with raw messages")
+    parser.add_argument("--configs", nargs="+", default=PROCESSOR_CONFIGS, help="Configurations to compare, reference first")
+    parser.add_argument("--max-report", type=int, default=None, help="Limit divergences printed per comparison")
+    args = parser.parse_args()
+
+    processors = {}
+    for config in args.configs:
+        processor = build_processor(config)
+        if processor is not None:
+            processors[config] = processor
+
+    if len(processors) < 2:
+        print("❌ Need at least two loadable configurations to compare")
+        sys.exit(2)
+
+    reference_name, reference = next(iter(processors.items()))
+    total = 0
+
+    for path in args.data:
+        messages = load_messages(path)
+        for name, candidate in processors.items():
+            if name == reference_name:
+                continue
+
+            divergences = find_divergences(messages, reference, candidate)
+            total += len(divergences)
+            status = "✅" if not divergences else "❌"
+            print(f"{status} {path}: {name} vs {reference_name} -> {len(divergences)}/{len(messages)} divergent")
+
+            for i, message, expected, actual in divergences[:args.max_report]:
+                print(f"   row {i}: {message!r}")
+                print(f"      expected: {expected!r}")
+                print(f"      actual:   {actual!r}")
+
+    sys.exit(1 if total else 0)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
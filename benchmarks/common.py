@@ -0,0 +1,102 @@
+"""
+Shared helpers for the benchmark and parity scripts
+
+Run every script from the repository root as a module, for example:
+    python -m benchmarks.bench_pipeline_profiles
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from utils.nlp_resources import NLPResources, PIPELINE_PROFILES
+from utils.preprocessing_cache import PreprocessingCache, preprocessing_fingerprint
+from utils.text_processor import TextProcessor
+
+# TextProcessor configurations as "backend" or "backend:profile"
+PROCESSOR_CONFIGS = [f"spacy:{profile}" for profile in PIPELINE_PROFILES] + ["regex"]
+
+def load_messages(path="spam.csv", limit=None):
+    """Load raw messages from spam.csv (latin-1) or cleaned_data.csv (utf-8)"""
+    try:
+        df = pd.read_csv(path, encoding='utf-8')
+    except UnicodeDecodeError:
+        df = pd.read_csv(path, encoding='latin-1')
+    column = 'v2' if 'v2' in df.columns else 'input-data'
+    messages = df[column].fillna("").astype(str).tolist()
+    return messages[:limit] if limit else messages
+
+def load_labeled(path="spam.csv"):
+    """Messages and 0 = ham / 1 = spam labels from spam.csv"""
+    df = pd.read_csv(path, encoding='latin-1')[['v1', 'v2']]
+    return df['v2'].fillna("").astype(str).tolist(), df['v1'].map({'ham': 0, 'spam': 1}).to_numpy()
+
+def preprocess_cached(messages, mode, description):
+    """
+    Preprocess messages through the preprocessing cache
+
+    mode "simple" is train_model.py's default preprocess_text (and shares its
+    cache); "regex" and "spacy" are the app's TextProcessor backends.
+
+    Returns:
+        tuple: (list of preprocessed strings, cache report)
+    """
+    if mode == "simple":
+        from train_model import preprocess_text
+        fingerprint = preprocessing_fingerprint(preprocess_text)
+        preprocess_many = lambda texts: [preprocess_text(text) for text in texts]
+    else:
+        processor = build_processor(mode)
+        if processor is None:
+            raise SystemExit(1)
+        fingerprint = processor.fingerprint()
+        preprocess_many = processor.transform_many
+    return PreprocessingCache(fingerprint, description=f"{description} {mode}").preprocess(messages, preprocess_many)
+
+def build_processor(config):
+    """
+    Create a TextProcessor from a "backend[:profile]" string
+
+    Returns None (after printing why) when the spaCy model is not installed.
+    """
+    backend, _, profile = config.partition(":")
+    profile = profile or "tokenizer"
+    if backend == "spacy":
+        try:
+            NLPResources.get().pipeline(profile)
+        except OSError as e:
+            print(f"⚠️ Skipping '{config}': {e}")
+            return None
+    return TextProcessor(profile=profile, backend=backend)
+
+def time_per_item(func, items, repeat=1):
+    """Call func on every item and return per-call latencies in milliseconds"""
+    latencies = []
+    for _ in range(repeat):
+        for item in items:
+            start = time.perf_counter()
+            func(item)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+def summarize_latencies(latencies_ms):
+    """Summarize latencies as mean and percentiles in milliseconds"""
+    return {
+        "mean_ms": float(np.mean(latencies_ms)),
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "p99_ms": float(np.percentile(latencies_ms, 99))
+    }
+
+def print_table(rows, columns):
+    """Print a list of dicts as an aligned plain-text table"""
+    widths = {c: max(len(c), *(len(_fmt(r.get(c))) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+    for row in rows:
+        print("  ".join(_fmt(row.get(c)).ljust(widths[c]) for c in columns))
+
+def _fmt(value):
+    """Format a table cell"""
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    return "" if value is None else str(value)
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Drive a running serve.py instance and report throughput and latency percentiles
+
+Each concurrent client holds one keep-alive connection and sends messages
+from the dataset back to back for the given duration (closed-loop load).
+
+    python serve.py --backend regex &
+    python -m benchmarks.load_generator --concurrency 8 --duration 10
+    python -m benchmarks.load_generator --batch-size 64
+"""
+
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+import numpy as np
+from benchmarks.common import load_messages, summarize_latencies, print_table
+
+def wait_until_ready(host, port, timeout):
+    """Poll /readyz until the server reports ready or the timeout expires"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/readyz")
+            response = conn.getresponse()
+            response.read()
+            conn.close()
+            if response.status == 200:
+                return True
+        except OSError:
+            pass
+        time.sleep(0.2)
+    return False
+
+def run_client(host, port, messages, offset, batch_size, stop_at, results):
+    """Send requests on one connection until stop_at; append (latency_ms, status, n_messages)"""
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    i = offset
+    while time.perf_counter() < stop_at:
+        if batch_size > 1:
+            batch = [messages[(i + k) % len(messages)] for k in range(batch_size)]
+            body = json.dumps({"texts": batch})
+        else:
+            body = json.dumps({"text": messages[i % len(messages)]})
+        i += batch_size
+
+        start = time.perf_counter()
+        try:
+            conn.request("POST", "/classify", body, headers)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            status = 0
+        results.append(((time.perf_counter() - start) * 1000, status, batch_size))
+    conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Server host")
+    parser.add_argument("--port", type=int, default=8000, help="Server port")
+    parser.add_argument("--data", default="spam.csv", help="CSV file with raw messages")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent client connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load")
+    parser.add_argument("--batch-size", type=int, default=1, help="Messages per request (>1 uses the batch form)")
+    parser.add_argument("--p99-budget-ms", type=float, default=None, help="Exit with status 1 when p99 exceeds this")
+    parser.add_argument("--ready-timeout", type=float, default=120.0, help="Seconds to wait for /readyz")
+    args = parser.parse_args()
+
+    if not wait_until_ready(args.host, args.port, args.ready_timeout):
+        print(f"❌ Server at {args.host}:{args.port} not ready after {args.ready_timeout:.0f}s")
+        sys.exit(2)
+
+    messages = load_messages(args.data)
+    results = []
+    stop_at = time.perf_counter() + args.duration
+    stride = max(1, len(messages) // args.concurrency)
+    clients = [
+        threading.Thread(target=run_client, args=(args.host, args.port, messages, n * stride, args.batch_size, stop_at, results))
+        for n in range(args.concurrency)
+    ]
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start
+
+    ok = [r for r in results if r[1] == 200]
+    if not ok:
+        print("❌ No successful requests")
+        sys.exit(1)
+
+    row = summarize_latencies(np.array([r[0] for r in ok]))
+    row.update({
+        "concurrency": args.concurrency,
+        "batch_size": args.batch_size,
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "req_per_s": len(ok) / elapsed,
+        "msg_per_s": sum(r[2] for r in ok) / elapsed
+    })
+    print_table([row], ["concurrency", "batch_size", "requests", "errors", "req_per_s", "msg_per_s", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+
+    if args.p99_budget_ms is not None:
+        within = row["p99_ms"] <= args.p99_budget_ms
+        print(f"{'✅' if within else '❌'} p99 {row['p99_ms']:.2f} ms vs budget {args.p99_budget_ms:.2f} ms")
+        sys.exit(0 if within else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+Sweep TF-IDF and naive Bayes settings and export the best configuration
+
+Every combination of max_features, ngram_range, min_df and sublinear_tf
+is fitted once in a process pool; each worker then trains MultinomialNB
+for every alpha on the same matrices. Preprocessed messages come from
+the preprocessing cache and fitted matrices from the feature cache
+(utils/preprocessing_cache.py, utils/feature_cache.py), so a rerun or a
+wider alpha grid only fits what is new. Per configuration it records
+accuracy, spam precision / recall / F1, model size (pickled vectorizer
+and classifier), fit time and single-message inference latency
+(vectorize + predict_proba on preprocessed test messages; workers share
+the CPU, so compare latencies within one run).
+
+The leaderboard is written to leaderboard.csv and results.json, and the
+best configuration (optionally within latency and size budgets) is
+retrained and exported as an artifact directory. Exporting to
+models/artifacts installs it for the app and servers.
+
+    python -m benchmarks.sweep_hyperparameters
+    python -m benchmarks.sweep_hyperparameters --alpha 0.05 0.1 0.5 --max-latency-ms 1.0 --workers 8
+    python -m benchmarks.sweep_hyperparameters --preprocessing regex --export models/artifacts
+"""
+
+import argparse
+import itertools
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+from sklearn.naive_bayes import MultinomialNB
+from benchmarks.common import load_labeled, preprocess_cached, print_table, summarize_latencies, time_per_item
+from utils.artifacts import export_artifacts
+from utils.feature_cache import FeatureCache
+
+LEADERBOARD_COLUMNS = ["rank", "max_features", "ngram_range", "min_df", "sublinear_tf", "alpha", "accuracy", "f1",
+                       "precision", "recall", "features", "model_kb", "vectorizer_fit_s", "nb_fit_ms", "p50_ms", "p99_ms"]
+
+# Set in each worker by _init_worker
+_texts = _labels = _settings = None
+
+def parse_max_features(value):
+    return None if value.lower() == "none" else int(value)
+
+def parse_ngram_range(value):
+    low, high = value.split(",")
+    return int(low), int(high)
+
+def parse_bool(value):
+    if value.lower() not in ("true", "false"):
+        raise argparse.ArgumentTypeError(f"expected true or false, got '{value}'")
+    return value.lower() == "true"
+
+def parse_min_df(value):
+    return float(value) if "." in value else int(value)
+
+def vectorizer_factory(config):
+    """Callable building the unfitted TfidfVectorizer of a configuration"""
+    return lambda: TfidfVectorizer(
+        max_features=config["max_features"], ngram_range=config["ngram_range"], min_df=config["min_df"],
+        sublinear_tf=config["sublinear_tf"], stop_words='english'
+    )
+
+def _init_worker(texts, labels, settings):
+    global _texts, _labels, _settings
+    _texts, _labels, _settings = texts, labels, settings
+
+def evaluate_config(config):
+    """Fit (or load) one vectorizer configuration and score every alpha on it"""
+    features, report = FeatureCache().get_or_build(
+        _texts, _labels, vectorizer_factory(config), split_seed=_settings["seed"], test_size=_settings["test_size"]
+    )
+    tfidf = features["tfidf"]
+    vectorizer_bytes = len(pickle.dumps(tfidf))
+    sample = [_texts[i] for i in features["test_index"][:_settings["latency_sample"]]]
+
+    rows = []
+    for alpha in _settings["alphas"]:
+        start = time.perf_counter()
+        model = MultinomialNB(alpha=alpha).fit(features["X_train"], features["y_train"])
+        nb_fit_ms = (time.perf_counter() - start) * 1000
+
+        predicted = model.predict(features["X_test"])
+        precision, recall, f1, _ = precision_recall_fscore_support(
+            features["y_test"], predicted, average="binary", zero_division=0
+        )
+        latencies = summarize_latencies(time_per_item(lambda text: model.predict_proba(tfidf.transform([text])), sample))
+        rows.append({
+            **config,
+            "ngram_range": f"{config['ngram_range'][0]},{config['ngram_range'][1]}",
+            "alpha": alpha,
+            "accuracy": accuracy_score(features["y_test"], predicted),
+            "precision": float(precision),
+            "recall": float(recall),
+            "f1": float(f1),
+            "features": len(tfidf.vocabulary_),
+            "model_kb": round((vectorizer_bytes + len(pickle.dumps(model))) / 1024, 1),
+            "vectorizer_fit_s": features["build_seconds"],
+            "feature_cache_hit": report["hit"],
+            "nb_fit_ms": nb_fit_ms,
+            "p50_ms": latencies["p50_ms"],
+            "p99_ms": latencies["p99_ms"]
+        })
+    return rows
+
+def choose(rows, metric, max_latency_ms=None, max_model_kb=None):
+    """Best row by metric within the budgets; ties go to the faster, then smaller model"""
+    eligible = [
+        row for row in rows
+        if (max_latency_ms is None or row["p99_ms"] <= max_latency_ms)
+        and (max_model_kb is None or row["model_kb"] <= max_model_kb)
+    ]
+    if not eligible:
+        return None
+    return min(eligible, key=lambda row: (-row[metric], row["p50_ms"], row["model_kb"]))
+
+def export_choice(row, texts, labels, settings, directory):
+    """Retrain the chosen configuration on the training split and export its artifacts"""
+    config = {
+        "max_features": row["max_features"],
+        "ngram_range": parse_ngram_range(row["ngram_range"]),
+        "min_df": row["min_df"],
+        "sublinear_tf": row["sublinear_tf"]
+    }
+    features, _ = FeatureCache().get_or_build(
+        texts, labels, vectorizer_factory(config), split_seed=settings["seed"], test_size=settings["test_size"]
+    )
+    model = MultinomialNB(alpha=row["alpha"]).fit(features["X_train"], features["y_train"])
+    export_artifacts(features["tfidf"], model, directory, source={
+        "sweep": {
+            "config": {**config, "alpha": row["alpha"]},
+            "preprocessing": settings["preprocessing"],
+            "metrics": {name: row[name] for name in ("accuracy", "precision", "recall", "f1", "p50_ms", "model_kb")}
+        }
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="spam.csv", help="Labeled dataset (spam.csv layout)")
+    parser.add_argument("--preprocessing", choices=["simple", "regex", "spacy"], default="simple",
+                        help="train_model.py's preprocess_text, or the app's TextProcessor with that backend")
+    parser.add_argument("--max-features", nargs="+", type=parse_max_features, default=[2000, 5000, 10000, None],
+                        help="Vocabulary sizes ('none' for unlimited)")
+    parser.add_argument("--ngram-range", nargs="+", type=parse_ngram_range, default=[(1, 1), (1, 2)],
+                        help="n-gram ranges as low,high")
+    parser.add_argument("--min-df", nargs="+", type=parse_min_df, default=[1, 2], help="Minimum document frequencies")
+    parser.add_argument("--sublinear-tf", nargs="+", type=parse_bool, default=[False, True], help="true and/or false")
+    parser.add_argument("--alpha", nargs="+", type=float, default=[0.01, 0.05, 0.1, 0.5, 1.0], help="MultinomialNB alphas")
+    parser.add_argument("--seed", type=int, default=42, help="Train/test split seed")
+    parser.add_argument("--test-size", type=float, default=0.2, help="Share of messages held out")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--latency-sample", type=int, default=200, help="Test messages timed one at a time per configuration")
+    parser.add_argument("--metric", choices=["f1", "accuracy", "precision", "recall"], default="f1", help="Leaderboard order")
+    parser.add_argument("--max-latency-ms", type=float, default=None, help="Only choose configurations with p99 latency under this")
+    parser.add_argument("--max-model-kb", type=float, default=None, help="Only choose configurations smaller than this")
+    parser.add_argument("--top", type=int, default=15, help="Leaderboard rows printed")
+    parser.add_argument("--output-dir", default="sweep_results", help="Where the leaderboard and results are written")
+    parser.add_argument("--export", default=None, help="Artifact directory for the chosen configuration "
+                                                       "(default <output-dir>/artifacts; models/artifacts installs it)")
+    args = parser.parse_args()
+
+    messages, labels = load_labeled(args.data)
+    texts, report = preprocess_cached(messages, args.preprocessing, "sweep")
+    print(f"♻️ Preprocessing: {report['hits']:,} of {report['rows']:,} messages cached, "
+          f"{report['computed']:,} preprocessed in {report['seconds']:.2f}s")
+
+    settings = {
+        "seed": args.seed,
+        "test_size": args.test_size,
+        "alphas": args.alpha,
+        "latency_sample": args.latency_sample,
+        "preprocessing": args.preprocessing
+    }
+    configs = [
+        {"max_features": max_features, "ngram_range": ngram_range, "min_df": min_df, "sublinear_tf": sublinear_tf}
+        for max_features, ngram_range, min_df, sublinear_tf
+        in itertools.product(args.max_features, args.ngram_range, args.min_df, args.sublinear_tf)
+    ]
+    print(f"🔄 {len(configs)} vectorizer configurations x {len(args.alpha)} alphas on {args.workers} workers...")
+
+    start = time.perf_counter()
+    rows = []
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(texts, labels, settings)) as pool:
+        for config_rows in pool.map(evaluate_config, configs):
+            rows.extend(config_rows)
+    seconds = time.perf_counter() - start
+    hits = sum(1 for row in rows[::len(args.alpha)] if row["feature_cache_hit"])
+    print(f"⏱️ Swept {len(rows)} configurations in {seconds:.1f}s ({hits} of {len(configs)} vectorizers from the feature cache)")
+
+    rows.sort(key=lambda row: (-row[args.metric], row["p50_ms"], row["model_kb"]))
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    print()
+    print_table(rows[:args.top], LEADERBOARD_COLUMNS)
+
+    chosen = choose(rows, args.metric, args.max_latency_ms, args.max_model_kb)
+    os.makedirs(args.output_dir, exist_ok=True)
+    pd.DataFrame(rows, columns=LEADERBOARD_COLUMNS + ["feature_cache_hit"]).to_csv(
+        os.path.join(args.output_dir, "leaderboard.csv"), index=False
+    )
+    with open(os.path.join(args.output_dir, "results.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "data": args.data,
+            "metric": args.metric,
+            "budgets": {"max_latency_ms": args.max_latency_ms, "max_model_kb": args.max_model_kb},
+            "settings": settings,
+            "seconds": seconds,
+            "chosen": chosen,
+            "results": rows
+        }, f, indent=2)
+    print(f"\n💾 Wrote {args.output_dir}/leaderboard.csv and results.json")
+
+    if chosen is None:
+        print("❌ No configuration fits the latency and size budgets; nothing exported")
+        return
+    export_dir = args.export or os.path.join(args.output_dir, "artifacts")
+    export_choice(chosen, texts, labels, settings, export_dir)
+    print(f"🏆 Chose #{chosen['rank']}: max_features={chosen['max_features']}, ngram_range=({chosen['ngram_range']}), "
+          f"min_df={chosen['min_df']}, sublinear_tf={chosen['sublinear_tf']}, alpha={chosen['alpha']} "
+          f"({args.metric} {chosen[args.metric]:.4f}, p99 {chosen['p99_ms']:.2f} ms, {chosen['model_kb']:.0f} KB)")
+    print(f"📦 Exported its artifacts to {export_dir}/")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Regenerate cleaned_data.csv from spam.csv
+
+Mirrors the cleaning steps in main.ipynb (drop empty columns and duplicates,
+encode the target, count characters, tokens and sentences) but streams every
+message through spaCy's nlp.pipe instead of calling nlp() row by row. The
+cleaned_text column uses TextProcessor.transform_many, the same preprocessing
+the app applies at prediction time. Both spaCy passes go through the
+preprocessing cache (utils/preprocessing_cache.py), so a rerun only
+processes messages that are new or edited since the last one.
+"""
+
+import argparse
+import pandas as pd
+from utils.preprocessing_cache import PreprocessingCache, preprocessing_fingerprint
+from utils.text_processor import TextProcessor
+
+def build_cleaned_data(source='spam.csv', output='cleaned_data.csv', batch_size=1000, n_process=1, use_cache=True):
+    """Build the cleaned dataset and write it to output"""
+    print(f"🚀 Loading {source}...")
+    df = pd.read_csv(source, encoding='latin-1')
+    df = df[['v1', 'v2']]
+    df.columns = ['target', 'input-data']
+    df['target'] = df['target'].map({'ham': 0, 'spam': 1})
+    df = df.drop_duplicates(keep='first')
+    print(f"📊 {len(df)} unique messages")
+
+    text_processor = TextProcessor()
+    messages = df['input-data'].tolist()
+
+    df['num_char'] = df['input-data'].apply(len)
+
+    # The full pipeline is only needed for sentence boundaries; token counts come from the same docs
+    print("🔄 Counting tokens and sentences...")
+    full_nlp = text_processor.resources.pipeline("full")
+
+    def count_tokens_and_sentences(texts):
+        # Cached as "<tokens> <sentences>" strings
+        for doc in full_nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+            yield f"{len(doc)} {len(list(doc.sents))}"
+
+    counts = cached(
+        messages, count_tokens_and_sentences, use_cache,
+        preprocessing_fingerprint(count_tokens_and_sentences, full_nlp.meta.get("name"), full_nlp.meta.get("version")),
+        "build_cleaned_data.py token and sentence counts"
+    )
+    df['num_words'] = [int(count.split()[0]) for count in counts]
+    df['num_sent'] = [int(count.split()[1]) for count in counts]
+
+    print("🔄 Cleaning text...")
+    df['cleaned_text'] = cached(
+        messages, lambda texts: text_processor.transform_many(texts, batch_size=batch_size, n_process=n_process),
+        use_cache, text_processor.fingerprint(), "TextProcessor.transform_text"
+    )
+
+    df.to_csv(output)
+    print(f"✅ Wrote {output}")
+
+def cached(messages, process_many, use_cache, fingerprint, description):
+    """Run process_many over messages, through the preprocessing cache unless use_cache is False"""
+    if not use_cache:
+        return list(process_many(messages))
+
+    cache = PreprocessingCache(fingerprint, description=description)
+    results, report = cache.preprocess(messages, process_many)
+    print(f"♻️ {report['hits']:,} of {report['rows']:,} rows reused from {cache.directory}, "
+          f"{report['computed']:,} processed in {report['seconds']:.2f}s")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate cleaned_data.csv from spam.csv")
+    parser.add_argument("--source", default="spam.csv", help="Raw SMS dataset")
+    parser.add_argument("--output", default="cleaned_data.csv", help="Where to write the cleaned dataset")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Messages per nlp.pipe batch")
+    parser.add_argument("--n-process", type=int, default=1, help="spaCy worker processes (-1 for all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="Process every message instead of reusing cached results")
+    args = parser.parse_args()
+
+    build_cleaned_data(args.source, args.output, args.batch_size, args.n_process, use_cache=not args.no_cache)
\ No newline at end of file
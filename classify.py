@@ -0,0 +1,60 @@
+"""
+Classify large message files offline
+
+Streams CSV, JSONL or plain text input (one message per line) in chunks,
+scores each chunk as one sparse batch, optionally across worker processes,
+and writes row_id, label and spam_probability incrementally.
+
+    python classify.py messages.csv -o results.csv --workers 4
+    cat messages.txt | python classify.py - --format txt -o - > results.csv
+"""
+
+import argparse
+import sys
+from utils.batch_classifier import classify_file
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Input file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output file (.csv or .jsonl), - for stdout")
+    parser.add_argument("--format", choices=["csv", "jsonl", "txt"], default=None, help="Input format (default: from extension)")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], default=None, help="Output format (default: from extension)")
+    parser.add_argument("--text-field", default=None, help="CSV column or JSON field with the message")
+    parser.add_argument("--id-field", default=None, help="CSV column or JSON field with the row id")
+    parser.add_argument("--encoding", default="utf-8", help="Input encoding, e.g. latin-1 for spam.csv")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Messages per batch")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--backend", choices=["spacy", "regex"], default="spacy", help="Tokenizer backend")
+    parser.add_argument("--profile", default="tokenizer", help="spaCy pipeline profile for the spacy backend")
+    parser.add_argument("--campaign-index", action="store_true", help="Reuse verdicts for near copies of spam already seen")
+    parser.add_argument("--compact-vocabulary", action="store_true", help="Use the array-backed vocabulary (smaller workers)")
+    parser.add_argument("--cache-size", type=int, default=0, help="Verdict cache entries per worker (0 disables)")
+    parser.add_argument("--watch-models", action="store_true", help="Pick up retrained models between chunks")
+    args = parser.parse_args()
+
+    stats = classify_file(
+        args.input, args.output,
+        fmt=args.format, output_fmt=args.output_format,
+        chunk_size=args.chunk_size, workers=args.workers,
+        profile=args.profile, backend=args.backend,
+        text_field=args.text_field, id_field=args.id_field,
+        encoding=args.encoding, cache_size=args.cache_size,
+        campaign_index=args.campaign_index, compact_vocabulary=args.compact_vocabulary,
+        watch_models=args.watch_models
+    )
+
+    # Report on stderr so results can be piped from stdout
+    print(f"✅ Classified {stats['messages']:,} messages in {stats['seconds']:.2f}s "
+          f"({stats['messages_per_second']:,.0f} messages/s)", file=sys.stderr)
+    if stats.get("model_reloads"):
+        print(f"🔄 Models reloaded {stats['model_reloads']} time(s); finished on version {stats['model_version']}", file=sys.stderr)
+    if "cache" in stats:
+        cache = stats["cache"]
+        print(f"🗃️ Verdict cache: {cache['hit_ratio']:.1%} hits ({cache['raw_hit_ratio']:.1%} raw), "
+              f"{cache['entries']:,} entries, {cache['evictions']:,} evictions", file=sys.stderr)
+    if "campaign_index" in stats:
+        index = stats["campaign_index"]
+        print(f"🧬 Campaign index: {index['hit_rate']:.1%} near-duplicate hits, {index['entries']:,} campaigns", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
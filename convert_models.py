@@ -0,0 +1,67 @@
+"""
+Convert vectorizer.pkl / mnb_model.pkl into the memory-mappable artifact format
+
+Writes a JSON manifest, .npy arrays and the compact vocabulary table (see
+utils/artifacts.py), then reloads them and checks that predictions on the
+dataset match the pickles exactly. ModelValidator prefers the artifacts
+from then on, until the pickles are retrained.
+
+    python convert_models.py
+    python convert_models.py --tfidf-path vectorizer.pkl --model-path mnb_model.pkl --output models/artifacts
+"""
+
+import argparse
+import pickle
+import sys
+import numpy as np
+import pandas as pd
+from utils.artifacts import export_artifacts, file_sha256, load_artifacts
+from utils.model_validator import ModelValidator
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tfidf-path", default=None, help="Vectorizer pickle (discovered when omitted)")
+    parser.add_argument("--model-path", default=None, help="Classifier pickle (discovered when omitted)")
+    parser.add_argument("--output", default="models/artifacts", help="Artifact directory to write")
+    parser.add_argument("--data", default="spam.csv", help="Messages used for the parity check")
+    args = parser.parse_args()
+
+    tfidf_path, model_path = args.tfidf_path, args.model_path
+    if not tfidf_path or not model_path:
+        tfidf_path, model_path = ModelValidator.find_model_files()
+    if not tfidf_path:
+        print("❌ Model files not found")
+        sys.exit(2)
+
+    with open(tfidf_path, 'rb') as f:
+        tfidf = pickle.load(f)
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    is_valid, message = ModelValidator.validate_models(tfidf, model)
+    if not is_valid:
+        print(f"❌ {message}")
+        sys.exit(2)
+
+    source = {"pickles": {tfidf_path: file_sha256(tfidf_path), model_path: file_sha256(model_path)}}
+    manifest = export_artifacts(tfidf, model, args.output, source=source)
+    vocabulary = manifest['files'].get('vocabulary')
+    features = f"{vocabulary['entries']} terms" if vocabulary else f"{tfidf.n_features} hashed features"
+    print(f"💾 Wrote artifact version {manifest['version']} to {args.output}/ "
+          f"({len(manifest['files'])} files, {features})")
+
+    # Parity check: the rebuilt objects must reproduce the pickles exactly
+    loaded_tfidf, loaded_model = load_artifacts(args.output, verify=True)
+    df = pd.read_csv(args.data, encoding='latin-1')
+    texts = df['v2'].fillna("").astype(str).str.lower().tolist()
+    expected = model.predict_proba(tfidf.transform(texts))
+    actual = loaded_model.predict_proba(loaded_tfidf.transform(texts))
+    max_diff = float(np.abs(expected - actual).max())
+
+    if max_diff == 0.0:
+        print(f"✅ {len(texts)} messages score identically from the artifacts")
+    else:
+        print(f"❌ Artifacts differ from the pickles: max |Δ predict_proba| = {max_diff:.3e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
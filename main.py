@@ -1,9 +1,8 @@
+import importlib
+import os
+import threading
 import streamlit as st
-import pickle
-from utils.text_processor import TextProcessor
 from utils.ui_components import UIComponents
-from utils.model_validator import ModelValidator
-from all_pages import about, home, analytics, contact
 
 # Page configuration
 st.set_page_config(
@@ -13,18 +12,102 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Page modules are imported when first opened, so a visit that never leaves
+# Home does not pay for plotly and pandas in Analytics
+PAGES = {
+    "🏠 Home": "all_pages.home",
+    "📊 Analytics": "all_pages.analytics",
+    "ℹ️ About": "all_pages.about",
+    "📞 Contact": "all_pages.contact",
+}
+
+# Imported in the background after the first render, ahead of the first analysis
+DEFERRED_IMPORTS = ["nltk.stem.porter", "plotly.graph_objects"]
+
+# Anyone can submit feedback, so by default it is only logged and applied with
+# `train_model.py --apply-feedback`; set to 1 to apply it while the app runs
+AUTO_APPLY_FEEDBACK = os.environ.get("SPAM_AUTO_APPLY_FEEDBACK") == "1"
+
 # Load models and initialize components
 @st.cache_resource
-def load_models():
-    """Load pre-trained models with caching and validation"""
-    return ModelValidator.load_and_validate_models()
+def load_model_registry():
+    """Load pre-trained models once and swap in retrained ones as their files change"""
+    # sklearn, scipy and the model code are only imported once a page needs the models
+    from utils.classifier import SpamClassifier
+    from utils.model_registry import ModelRegistry
+    from utils.model_validator import ModelValidator
+    
+    text_processor = load_text_processor()
+    registry = ModelRegistry(
+        lambda tfidf, model: SpamClassifier(tfidf, model, text_processor.transform_text)
+    )
+    try:
+        registry.load()
+    except Exception:
+        # Renders the matching error message and stops the script
+        ModelValidator.load_and_validate_models()
+        raise
+    registry.start_watching()
+    return registry
 
-def main():
-    # Load models
-    tfidf, model = load_models()
+@st.cache_resource
+def load_text_processor():
+    """Create the text processor once per process on top of the shared NLP resources"""
+    # spaCy is imported here rather than at startup
+    from utils.model_validator import ModelValidator
+    from utils.text_processor import TextProcessor
     
-    # Initialize components
     text_processor = TextProcessor()
+    
+    # Common tokens are looked up in the training stem table instead of reaching NLTK
+    stem_table_path = ModelValidator.find_stem_table()
+    if stem_table_path:
+        text_processor.stemmer.load_table(stem_table_path)
+    
+    return text_processor
+
+@st.cache_resource
+def load_feedback_log():
+    """Open the log that the Home and Contact pages append user corrections to"""
+    from utils.feedback import FeedbackLog
+    
+    return FeedbackLog()
+
+@st.cache_resource
+def start_feedback_updater():
+    """
+    Learn from logged corrections on a background thread, once per process
+    
+    Returns None unless AUTO_APPLY_FEEDBACK is set.
+    """
+    if not AUTO_APPLY_FEEDBACK:
+        return None
+    from utils.feedback import FeedbackUpdater, load_holdout
+    
+    text_processor = load_text_processor()
+    # Updates that lose accuracy on the held-out messages are not published
+    holdout = load_holdout(text_processor.transform_many) if os.path.exists("spam.csv") else None
+    # Updates are published as new model files; the registry swaps them in between requests
+    updater = FeedbackUpdater(load_model_registry(), load_feedback_log(), text_processor.transform_many,
+                              holdout=holdout)
+    return updater.start()
+
+@st.cache_resource
+def start_deferred_imports():
+    """Import modules needed by later interactions on a background thread, once per process"""
+    def import_all():
+        for name in DEFERRED_IMPORTS:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+    
+    thread = threading.Thread(target=import_all, name="deferred-imports", daemon=True)
+    thread.start()
+    return thread
+
+def main():
+    # Initialize components
     ui_components = UIComponents()
     
     # Apply custom CSS
@@ -34,21 +117,24 @@ def main():
     st.sidebar.title("🛡️ Navigation")
     page = st.sidebar.selectbox(
         "Choose a page:",
-        ["🏠 Home", "📊 Analytics", "ℹ️ About", "📞 Contact"]
+        list(PAGES)
     )
     
     # Route to different pages
+    page_module = importlib.import_module(PAGES[page])
     if page == "🏠 Home":
-        home.show_page(tfidf, model, text_processor, ui_components)
-    elif page == "📊 Analytics":
-        analytics.show_page()
-    elif page == "ℹ️ About":
-        about.show_page()
+        # Home loads the models and NLP resources itself, after its inputs are on screen
+        page_module.show_page(load_model_registry, load_text_processor, load_feedback_log, start_feedback_updater,
+                              ui_components)
     elif page == "📞 Contact":
-        contact.show_page()
+        page_module.show_page(load_feedback_log)
+    else:
+        page_module.show_page()
     
     # Footer
     ui_components.show_footer()
+    
+    start_deferred_imports()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Serve the spam classifier over HTTP without Streamlit
+
+Models are loaded once through ModelValidator on a background thread;
+/readyz turns 200 once they are usable. With --watch-models, retrained
+model files are picked up and swapped in without a restart. With
+--workers N the models are loaded once and N pre-forked workers share
+them copy-on-write (Linux/macOS); send SIGUSR1 to the parent for a
+per-worker memory report.
+
+    python serve.py --port 8000 --backend regex
+    curl -s localhost:8000/classify -d '{"text": "WINNER! Claim your prize"}'
+    curl -s localhost:8000/classify -d '{"texts": ["hi mom", "FREE entry"]}'
+    python serve.py --port 8000 --workers 4
+"""
+
+import argparse
+import signal
+import sys
+import threading
+import time
+from utils.inference_server import InferenceServer, InferenceService
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--backend", choices=["spacy", "regex"], default="spacy", help="Tokenizer backend")
+    parser.add_argument("--profile", default="tokenizer", help="spaCy pipeline profile for the spacy backend")
+    parser.add_argument("--tfidf-path", default=None, help="Vectorizer pickle (discovered when omitted)")
+    parser.add_argument("--model-path", default=None, help="Classifier pickle (discovered when omitted)")
+    parser.add_argument("--p99-budget-ms", type=float, default=50.0, help="p99 latency budget reported by /readyz")
+    parser.add_argument("--micro-batch-size", type=int, default=0, help="Coalesce single-text requests into batches of up to this size (0 disables)")
+    parser.add_argument("--micro-batch-wait-ms", type=float, default=2.0, help="Longest a request waits for its batch to fill")
+    parser.add_argument("--max-queue-size", type=int, default=10000, help="Requests allowed to wait for a batch before returning 503")
+    parser.add_argument("--cache-size", type=int, default=0, help="Verdict cache entries (0 disables)")
+    parser.add_argument("--cache-ttl", type=float, default=3600.0, help="Seconds a cached verdict stays valid")
+    parser.add_argument("--campaign-index", action="store_true", help="Reuse verdicts for near copies of recent spam campaigns")
+    parser.add_argument("--compact-vocabulary", action="store_true", help="Use the array-backed vectorizer vocabulary")
+    parser.add_argument("--validation", choices=["always", "receipt", "deferred", "background"], default="deferred",
+                        help="Model validation: skip on a matching receipt, otherwise validate inline (always/receipt) "
+                             "or after the first request (deferred) or immediately in the background")
+    parser.add_argument("--watch-models", action="store_true", help="Reload the models when their files change")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between model file checks")
+    parser.add_argument("--workers", type=int, default=1, help="Pre-forked worker processes sharing one model load (1 serves in-process)")
+    parser.add_argument("--access-log", action="store_true", help="Log every request to stderr")
+    args = parser.parse_args()
+
+    service = InferenceService(
+        profile=args.profile, backend=args.backend,
+        tfidf_path=args.tfidf_path, model_path=args.model_path,
+        p99_budget_ms=args.p99_budget_ms, micro_batch_size=args.micro_batch_size,
+        micro_batch_wait_ms=args.micro_batch_wait_ms, max_queue_size=args.max_queue_size,
+        cache_size=args.cache_size, cache_ttl=args.cache_ttl, campaign_index=args.campaign_index,
+        compact_vocabulary=args.compact_vocabulary, validation=args.validation,
+        watch_models=args.watch_models, poll_interval=args.poll_interval
+    )
+    service.start_loading()
+    if args.workers > 1:
+        serve_prefork(service, args)
+        return
+
+    server = InferenceServer((args.host, args.port), service, access_log=args.access_log)
+    print(f"🚀 Listening on http://{args.host}:{args.port} (loading models in the background)", file=sys.stderr)
+
+    # Serve health checks while the models load, then report the outcome
+    serving = threading.Thread(target=server.serve_forever, name="http-server", daemon=True)
+    serving.start()
+    try:
+        if service.wait_until_loaded():
+            print_load_report(service)
+        else:
+            print(f"❌ Model loading failed: {service.load_error}", file=sys.stderr)
+        while serving.is_alive():
+            serving.join(timeout=1.0)
+    except KeyboardInterrupt:
+        server.shutdown()
+    finally:
+        server.server_close()
+
+def serve_prefork(service, args):
+    """Load once in this process, then fork the workers that serve"""
+    from utils.prefork import PreforkServer
+
+    # Connections queue in the listen backlog until the workers exist
+    server = InferenceServer((args.host, args.port), service, access_log=args.access_log)
+    if not service.wait_until_loaded():
+        print(f"❌ Model loading failed: {service.load_error}", file=sys.stderr)
+        server.server_close()
+        sys.exit(1)
+    print_load_report(service)
+
+    prefork = PreforkServer(server, service, workers=args.workers)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    signal.signal(signal.SIGUSR1, lambda signum, frame: prefork.print_memory_report())
+    try:
+        prefork.start()
+        print(f"🚀 Listening on http://{args.host}:{args.port} with {args.workers} pre-forked workers", file=sys.stderr)
+        time.sleep(1.0)
+        prefork.print_memory_report()
+        prefork.supervise()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        prefork.stop()
+        server.server_close()
+
+def print_load_report(service):
+    report = service.load_report()
+    phases = ", ".join(f"{name} {ms:.1f}" for name, ms in report["phases_ms"].items())
+    version = service.registry.current().version
+    print(f"✅ Models ready in {service.load_time_ms:.0f} ms (version {version}, {report['format']}: {phases} ms; "
+          f"validation {report['validation']})", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
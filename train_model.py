@@ -7,10 +7,19 @@ import pandas as pd
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 import pickle
 import os
+import argparse
+from utils.artifacts import export_artifacts, file_sha256
+from utils.stemming import STEM_TABLE_FILENAME, build_stem_table, save_stem_table
+from utils.classifier import SpamClassifier
+from utils.feature_cache import FeatureCache, build_features
+from utils.feedback import FEEDBACK_LOG_PATH, FeedbackLog, FeedbackUpdater, load_holdout
+from utils.memory import format_bytes
+from utils.model_registry import ModelRegistry
+from utils.preprocessing_cache import PreprocessingCache, preprocessing_fingerprint
+from utils.streaming_training import train_streaming
 
 def create_sample_data():
     """Create sample dataset if original dataset is not available"""
@@ -1863,8 +1872,23 @@ def preprocess_text(text):
     
     return text
 
-def train_and_save_models():
-    """Train and save the models"""
+def train_and_save_models(text_processor=None, batch_size=1000, n_process=1, preprocessing_cache=True,
+                          feature_cache=True):
+    """
+    Train and save the models
+    
+    Args:
+        text_processor (TextProcessor): If given, preprocess with its spaCy
+            pipeline through transform_many instead of preprocess_text
+        batch_size (int): Messages per nlp.pipe batch when using text_processor
+        n_process (int): Tokenizer worker processes when using text_processor
+        preprocessing_cache (bool): Reuse preprocessed messages from earlier
+            runs (see utils/preprocessing_cache.py); only new or edited
+            messages are preprocessed
+        feature_cache (bool): Reuse the fitted TF-IDF vectorizer and the
+            train/test matrices of an earlier run on the same data and split
+            (see utils/feature_cache.py)
+    """
     
     print("🚀 Starting model training...")
     
@@ -1886,18 +1910,42 @@ def train_and_save_models():
     print(f"📱 Ham messages: {len(df) - sum(df['label'])} ({(len(df) - sum(df['label']))/len(df)*100:.1f}%)")
     
     # Preprocess messages
-    df['processed_message'] = df['message'].apply(preprocess_text)
-    
-    # Split the data
-    X = df['processed_message']
-    y = df['label']
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
-    
-    # Create and train TF-IDF vectorizer
-    print("🔄 Training TF-IDF vectorizer...")
-    tfidf = TfidfVectorizer(max_features=5000, stop_words='english', ngram_range=(1, 2))
-    X_train_tfidf = tfidf.fit_transform(X_train)
-    X_test_tfidf = tfidf.transform(X_test)
+    if text_processor is not None:
+        print("🔄 Preprocessing messages with TextProcessor...")
+        preprocess = text_processor.transform_text
+        preprocess_many = lambda messages: text_processor.transform_many(
+            messages, batch_size=batch_size, n_process=n_process
+        )
+        fingerprint = text_processor.fingerprint()
+    else:
+        preprocess = preprocess_text
+        preprocess_many = lambda messages: [preprocess_text(message) for message in messages]
+        fingerprint = preprocessing_fingerprint(preprocess_text)
+    
+    if preprocessing_cache:
+        cache = PreprocessingCache(fingerprint, description=f"train_model.py {preprocess.__qualname__}")
+        df['processed_message'], report = cache.preprocess(df['message'].tolist(), preprocess_many)
+        print(f"♻️ Preprocessing cache: {report['hits']:,} of {report['rows']:,} messages reused, "
+              f"{report['computed']:,} preprocessed in {report['seconds']:.2f}s ({cache.directory})")
+    else:
+        df['processed_message'] = list(preprocess_many(df['message'].tolist()))
+    
+    # Split the data and train the TF-IDF vectorizer, unless an earlier run already did
+    make_vectorizer = lambda: TfidfVectorizer(max_features=5000, stop_words='english', ngram_range=(1, 2))
+    if feature_cache:
+        features, report = FeatureCache().get_or_build(
+            df['processed_message'], df['label'], make_vectorizer, split_seed=42, test_size=0.2
+        )
+        if report["hit"]:
+            print(f"♻️ Loaded TF-IDF features from the feature cache in {report['seconds'] * 1000:.0f} ms")
+        else:
+            print(f"🔄 Trained TF-IDF vectorizer in {report['seconds']:.2f}s (cached as {report['key']})")
+    else:
+        print("🔄 Training TF-IDF vectorizer...")
+        features = build_features(df['processed_message'], df['label'], make_vectorizer, split_seed=42, test_size=0.2)
+    tfidf = features["tfidf"]
+    X_train_tfidf, X_test_tfidf = features["X_train"], features["X_test"]
+    y_train, y_test = features["y_train"], features["y_test"]
     
     # Train Naive Bayes model
     print("🤖 Training Naive Bayes classifier...")
@@ -1912,6 +1960,119 @@ def train_and_save_models():
     print("\n📋 Classification Report:")
     print(classification_report(y_test, y_pred, target_names=['Ham', 'Spam']))
     
+    # Precompute stems for the whole training vocabulary so serving rarely calls NLTK
+    stem_table = build_stem_table(
+        token for message in df['message'] for token in preprocess_text(message).split()
+    )
+    save_models(tfidf, model, stem_table)
+    test_saved_models(preprocess)
+
+def train_streaming_and_save_models(data_path, text_processor=None, chunk_size=50000, n_features=2 ** 16,
+                                    alpha=0.1, test_percent=20, text_field='v2', label_field='v1', encoding='latin-1',
+                                    batch_size=1000, n_process=1):
+    """
+    Train out of core on a labeled file of any size and save the models
+    
+    The file is streamed in chunks (see utils/streaming_training.py): a
+    HashingTfidfVectorizer learns IDF weights in a first pass and
+    MultinomialNB.partial_fit learns the class counts in a second, so
+    peak memory depends on chunk_size and n_features, not on the corpus.
+    The result is saved exactly like train_and_save_models output.
+    
+    Args:
+        data_path (str): Labeled CSV or JSONL file (labels "spam"/"ham" or 1/0)
+        text_processor (TextProcessor): If given, preprocess with its spaCy
+            pipeline through transform_many instead of preprocess_text
+        chunk_size (int): Messages held in memory at a time
+        n_features (int): Hashed feature columns
+        alpha (float): MultinomialNB smoothing
+        test_percent (int): Share of messages held out for evaluation
+    """
+    print(f"🚀 Starting streaming training on {data_path}...")
+    
+    if text_processor is not None:
+        preprocess = text_processor.transform_text
+        preprocess_many = lambda messages: list(
+            text_processor.transform_many(messages, batch_size=batch_size, n_process=n_process)
+        )
+    else:
+        preprocess = preprocess_text
+        preprocess_many = lambda messages: [preprocess_text(message) for message in messages]
+    
+    def progress(pass_name, rows):
+        print(f"\r🔄 {pass_name}: {rows:,} rows", end="", flush=True)
+    
+    tfidf, model, stem_tokens, report = train_streaming(
+        data_path, preprocess_many, chunk_size=chunk_size, text_field=text_field, label_field=label_field,
+        encoding=encoding, n_features=n_features, alpha=alpha, test_percent=test_percent,
+        stem_tokens=lambda message: preprocess_text(message).split(), progress=progress
+    )
+    print()
+    
+    print(f"📊 Dataset size: {report['rows']:,} messages ({report['train_rows']:,} train, {report['test_rows']:,} test)")
+    print(f"📧 Spam messages: {report['spam_rows']:,} ({report['spam_rows'] / report['rows'] * 100:.1f}%)")
+    print("⏱️ Passes: " + ", ".join(f"{name} {seconds:.1f}s" for name, seconds in report['seconds'].items()))
+    print(f"🧠 Peak memory: {format_bytes(report['peak_rss_bytes'])} with {chunk_size:,}-message chunks")
+    print(f"💾 Preprocessed training text spilled between passes: {format_bytes(report['spill_bytes'])}")
+    if report.get("accuracy") is not None:
+        (tn, fp), (fn, tp) = report["confusion"]
+        print(f"📈 Model accuracy: {report['accuracy']:.3f} "
+              f"(spam precision {tp / max(tp + fp, 1):.3f}, spam recall {tp / max(tp + fn, 1):.3f})")
+    
+    save_models(tfidf, model, build_stem_table(stem_tokens))
+    test_saved_models(preprocess)
+
+def apply_feedback(log_path=FEEDBACK_LOG_PATH, backend='spacy', batch_size=16, max_accuracy_drop=0.0):
+    """
+    Apply pending user corrections to the served models without retraining
+    
+    Runs the same micro-batch updates as the app's optional background
+    FeedbackUpdater (see utils/feedback.py) until the log is caught up.
+    Each update is checked against the spam.csv test split and published
+    to feedback/artifacts, which the app and servers load ahead of the
+    trained models; the files in models/ are never modified. Running
+    servers with --watch-models pick the new versions up.
+    
+    Args:
+        log_path (str): Feedback log written by the Home and Contact pages
+        backend (str): Tokenizer backend, matching the one used for serving
+        batch_size (int): Corrections per partial_fit update
+        max_accuracy_drop (float): Holdout accuracy an update may lose before it is rejected
+    """
+    registry = ModelRegistry.for_classifier(backend=backend)
+    registry.load()
+    version = registry.current()
+    preprocess_many = version.classifier.text_processor.transform_many
+    holdout = load_holdout(preprocess_many) if os.path.exists('spam.csv') else None
+    updater = FeedbackUpdater(
+        registry, FeedbackLog(log_path), preprocess_many, batch_size=batch_size, holdout=holdout,
+        max_accuracy_drop=max_accuracy_drop
+    )
+    print(f"📬 {log_path}: {updater.info()['pending_bytes']:,} bytes pending, "
+          f"{updater.state['applied']:,} corrections already applied")
+    print(f"🤖 Starting from model version {version.version} ({version.load_report['format']})")
+    if holdout is None:
+        print("⚠️ spam.csv not found; updates are published without a holdout accuracy check")
+    else:
+        print(f"🎯 Checking every update against {len(holdout[1]):,} held-out messages")
+    
+    while True:
+        result = updater.run_once(force=True)
+        if result is None:
+            break
+        accuracy = ""
+        if result['accuracy_after'] is not None:
+            accuracy = f", holdout accuracy {result['accuracy_before']:.4f} → {result['accuracy_after']:.4f}"
+        if result['published']:
+            print(f"✅ Applied {result['records']} corrections → version {result['version']} "
+                  f"(fit {result['fit_ms']:.1f} ms, publish {result['publish_ms']:.1f} ms{accuracy})")
+        else:
+            print(f"🚫 Rejected {result['records']} corrections{accuracy}; they stay in {log_path} for review")
+    
+    print(f"🎉 {updater.state['applied']:,} corrections applied in total, {updater.state['rejected']:,} rejected")
+
+def save_models(tfidf, model, stem_table):
+    """Write the pickles, stem table and artifacts to every location the app loads from"""
     # Create models directory if it doesn't exist
     os.makedirs('models', exist_ok=True)
     
@@ -1930,13 +2091,27 @@ def train_and_save_models():
     with open('models/mnb_model.pkl', 'wb') as f:
         pickle.dump(model, f)
     
+    save_stem_table(stem_table, STEM_TABLE_FILENAME)
+    save_stem_table(stem_table, os.path.join('models', STEM_TABLE_FILENAME))
+    
+    # Memory-mappable copy that ModelValidator prefers over the pickles
+    export_artifacts(tfidf, model, os.path.join('models', 'artifacts'), source={
+        "pickles": {path: file_sha256(path) for path in ('vectorizer.pkl', 'mnb_model.pkl')}
+    })
+    
     print("✅ Models saved successfully!")
     print("📁 Model files created:")
     print("   - vectorizer.pkl")
     print("   - mnb_model.pkl")
+    print(f"   - {STEM_TABLE_FILENAME} ({len(stem_table)} stems)")
     print("   - models/vectorizer.pkl") 
     print("   - models/mnb_model.pkl")
-    
+    print(f"   - models/{STEM_TABLE_FILENAME}")
+    vocabulary = ", vocabulary.vocab" if hasattr(tfidf, 'vocabulary_') else ""
+    print(f"   - models/artifacts/ (manifest.json, .npy arrays{vocabulary})")
+
+def test_saved_models(preprocess):
+    """Reload the saved pickles and classify two sample messages"""
     # Test the saved models
     print("\n🧪 Testing saved models...")
     with open('vectorizer.pkl', 'rb') as f:
@@ -1951,17 +2126,59 @@ def train_and_save_models():
         "Hi, how are you doing today?"
     ]
     
+    classifier = SpamClassifier(loaded_tfidf, loaded_model, preprocess)
     for msg in test_messages:
-        processed_msg = preprocess_text(msg)
-        vectorized = loaded_tfidf.transform([processed_msg])
-        prediction = loaded_model.predict(vectorized)[0]
-        confidence = max(loaded_model.predict_proba(vectorized)[0])
+        classification = classifier.classify(msg)
+        timings = classification["timings_ms"]
         
-        result = "SPAM" if prediction == 1 else "HAM"
-        print(f"📝 '{msg}' → {result} (confidence: {confidence:.3f})")
+        result = "SPAM" if classification["label"] == 1 else "HAM"
+        print(f"📝 '{msg}' → {result} (confidence: {classification['confidence']:.3f}, "
+              f"margin: {classification['margin']:+.3f}, {timings['total']:.2f} ms)")
     
     print("\n🎉 Model training completed successfully!")
     print("🚀 You can now run your Streamlit app: streamlit run main.py")
 
 if __name__ == "__main__":
-    train_and_save_models()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train and save the spam classifier models")
+    parser.add_argument("--text-processor", action="store_true",
+                        help="Preprocess with the app's spaCy TextProcessor instead of preprocess_text")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Messages per nlp.pipe batch")
+    parser.add_argument("--n-process", type=int, default=1, help="Tokenizer worker processes (-1 for all cores)")
+    parser.add_argument("--no-preprocessing-cache", action="store_true",
+                        help="Preprocess every message instead of reusing results cached by earlier runs")
+    parser.add_argument("--no-feature-cache", action="store_true",
+                        help="Refit TF-IDF instead of loading the vectorizer and matrices cached by an earlier run")
+    parser.add_argument("--streaming", metavar="DATA", default=None,
+                        help="Train out of core on this labeled CSV/JSONL file instead of loading spam.csv into memory")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Messages per chunk in streaming mode")
+    parser.add_argument("--n-features", type=int, default=2 ** 16, help="Hashed feature columns in streaming mode")
+    parser.add_argument("--alpha", type=float, default=0.1, help="Naive Bayes smoothing in streaming mode")
+    parser.add_argument("--test-percent", type=int, default=20, help="Messages held out for evaluation in streaming mode")
+    parser.add_argument("--text-field", default="v2", help="Message column or JSON field in streaming mode")
+    parser.add_argument("--label-field", default="v1", help="Label column or JSON field in streaming mode")
+    parser.add_argument("--encoding", default="latin-1", help="Input encoding in streaming mode")
+    parser.add_argument("--apply-feedback", metavar="LOG", nargs="?", const=FEEDBACK_LOG_PATH, default=None,
+                        help=f"Update the saved models from the feedback log (default {FEEDBACK_LOG_PATH}) instead of training")
+    parser.add_argument("--backend", choices=["spacy", "regex"], default="spacy",
+                        help="Tokenizer backend the served models use, for --apply-feedback")
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.0,
+                        help="Holdout accuracy a feedback update may lose before it is rejected, for --apply-feedback")
+    args = parser.parse_args()
+    
+    text_processor = None
+    if args.text_processor:
+        from utils.text_processor import TextProcessor
+        text_processor = TextProcessor()
+    
+    if args.apply_feedback:
+        apply_feedback(args.apply_feedback, backend=args.backend, max_accuracy_drop=args.max_accuracy_drop)
+    elif args.streaming:
+        train_streaming_and_save_models(
+            args.streaming, text_processor, chunk_size=args.chunk_size, n_features=args.n_features, alpha=args.alpha,
+            test_percent=args.test_percent, text_field=args.text_field, label_field=args.label_field,
+            encoding=args.encoding, batch_size=args.batch_size, n_process=args.n_process
+        )
+    else:
+        train_and_save_models(text_processor, batch_size=args.batch_size, n_process=args.n_process,
+                              preprocessing_cache=not args.no_preprocessing_cache,
+                              feature_cache=not args.no_feature_cache)
\ No newline at end of file
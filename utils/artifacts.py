@@ -0,0 +1,259 @@
+import hashlib
+import json
+import os
+import re
+import time
+import numpy as np
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+from utils.compact_vocabulary import CompactVocabulary
+from utils.hashing_tfidf import HashingTfidfVectorizer
+
+ARTIFACT_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+VOCABULARY_FILENAME = "vocabulary.vocab"
+
+# Fitted array attributes stored as .npy, by owner
+VECTORIZER_ARRAYS = ["idf"]
+MODEL_ARRAYS = ["classes", "class_log_prior", "feature_log_prob", "class_count", "feature_count"]
+HASHING_ARRAYS = ["document_frequency"]
+
+# Vectorizer parameters that must be plain data to be stored in the manifest
+_CALLABLE_PARAMS = ["tokenizer", "preprocessor", "analyzer"]
+
+# Data files written by export_artifacts, with or without a content hash in the name
+_DATA_FILE_PATTERN = re.compile(r"^[a-z_]+(\.[0-9a-f]{12})?\.(npy|vocab)$")
+
+
+def export_artifacts(tfidf, model, directory, source=None):
+    """
+    Write a fitted TfidfVectorizer and MultinomialNB as a versioned artifact directory
+
+    Layout (every data file carries the first 12 hex digits of its SHA-256):
+        manifest.json             version, parameters, shapes and SHA-256 of every file
+        vocabulary.<hash>.vocab   CompactVocabulary (sorted string table + offsets)
+        idf.<hash>.npy            vectorizer IDF weights
+        classes, class_log_prior, feature_log_prob, class_count and
+        feature_count .<hash>.npy
+
+    A HashingTfidfVectorizer has no vocabulary; its document frequencies
+    are stored as document_frequency.<hash>.npy instead, so training can
+    resume from the artifacts.
+
+    Exporting over an existing directory publishes atomically: data files
+    are new files under content-addressed names (unchanged ones are reused),
+    and the manifest is swapped in last with os.replace. A reader sees the
+    old manifest and files or the new ones, and never a file rewritten
+    under a process that has it memory-mapped. Files referenced by neither
+    the new nor the previous manifest are removed afterwards; the previous
+    version's stay for readers that are still loading it.
+
+    Args:
+        tfidf (TfidfVectorizer): Fitted vectorizer using a built-in analyzer,
+            or a HashingTfidfVectorizer
+        model (MultinomialNB): Fitted classifier
+        directory (str): Output directory, created if needed
+        source (dict): Optional provenance recorded in the manifest
+
+    Returns:
+        dict: The manifest that was written
+    """
+    params = tfidf.get_params()
+    hashed = isinstance(tfidf, HashingTfidfVectorizer)
+    for name in _CALLABLE_PARAMS:
+        if callable(params.get(name)):
+            raise ValueError(f"Vectorizers with a custom {name} cannot be exported")
+    if not tfidf.use_idf:
+        raise ValueError("Only vectorizers with use_idf=True can be exported")
+
+    os.makedirs(directory, exist_ok=True)
+    try:
+        previous_files = {entry["file"] for entry in read_manifest(directory)["files"].values()}
+    except (OSError, ValueError, KeyError):
+        previous_files = set()
+
+    files = {}
+    vocabulary = None
+    if not hashed:
+        vocabulary = tfidf.vocabulary_
+        if not isinstance(vocabulary, CompactVocabulary):
+            vocabulary = CompactVocabulary.from_dict(vocabulary)
+        files["vocabulary"] = _write_content_addressed(directory, VOCABULARY_FILENAME, vocabulary.save)
+        files["vocabulary"]["entries"] = len(vocabulary)
+
+    arrays = {
+        "idf": np.asarray(tfidf.idf_, dtype=np.float64),
+        "classes": np.asarray(model.classes_),
+        "class_log_prior": np.asarray(model.class_log_prior_, dtype=np.float64),
+        "feature_log_prob": np.asarray(model.feature_log_prob_, dtype=np.float64),
+        "class_count": np.asarray(model.class_count_, dtype=np.float64),
+        "feature_count": np.asarray(model.feature_count_, dtype=np.float64),
+    }
+    if hashed:
+        arrays["document_frequency"] = np.asarray(tfidf.document_frequency_, dtype=np.int64)
+    for name, array in arrays.items():
+        files[name] = _write_content_addressed(directory, f"{name}.npy", lambda path, array=array: _save_array(path, array))
+        files[name].update({"dtype": array.dtype.str, "shape": list(array.shape)})
+
+    manifest = {
+        "version": ARTIFACT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "sklearn_version": sklearn.__version__,
+        "numpy_version": np.__version__,
+        "vectorizer": {"class": type(tfidf).__name__, "params": json_params(params)},
+        "model": {"class": "MultinomialNB", "params": json_params(model.get_params())},
+        "files": files,
+        "source": source or {}
+    }
+    if hashed:
+        manifest["vectorizer"]["document_count"] = int(tfidf.document_count_)
+    manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+    temporary_path = manifest_path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, manifest_path)
+
+    _remove_unreferenced(directory, {entry["file"] for entry in files.values()} | previous_files)
+    return manifest
+
+
+def read_manifest(directory):
+    """Read and version-check an artifact manifest"""
+    with open(os.path.join(directory, MANIFEST_FILENAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported artifact version {manifest.get('version')} (expected {ARTIFACT_VERSION})")
+    return manifest
+
+
+def load_artifacts(directory, mmap_mode="r", verify=False):
+    """
+    Rebuild the vectorizer and classifier from an artifact directory without unpickling
+
+    Arrays are opened with np.load(mmap_mode="r") and the vocabulary is
+    memory-mapped, so processes loading the same directory share the pages
+    through the OS page cache instead of each holding a private copy.
+
+    Args:
+        directory (str): Directory written by export_artifacts
+        mmap_mode (str): "r" to memory-map, None to read into memory
+        verify (bool): Check every file's SHA-256 against the manifest first
+
+    Returns:
+        tuple: (tfidf, model) ready for transform / predict
+    """
+    manifest = read_manifest(directory)
+    files = manifest["files"]
+    if verify:
+        for name, entry in files.items():
+            if file_sha256(os.path.join(directory, entry["file"])) != entry["sha256"]:
+                raise ValueError(f"Artifact file {entry['file']} does not match its manifest checksum")
+
+    hashed = manifest["vectorizer"]["class"] == "HashingTfidfVectorizer"
+    arrays = {
+        name: np.load(os.path.join(directory, files[name]["file"]), mmap_mode=mmap_mode, allow_pickle=False)
+        for name in VECTORIZER_ARRAYS + MODEL_ARRAYS + (HASHING_ARRAYS if hashed else [])
+    }
+
+    params = restore_params(manifest["vectorizer"]["params"])
+    if hashed:
+        tfidf = HashingTfidfVectorizer(**params)
+        tfidf.document_frequency_ = np.array(arrays["document_frequency"])
+        tfidf.document_count_ = manifest["vectorizer"]["document_count"]
+    else:
+        tfidf = TfidfVectorizer(**params)
+        tfidf.vocabulary_ = CompactVocabulary.load(
+            os.path.join(directory, files["vocabulary"]["file"]), mmap_mode=mmap_mode is not None
+        )
+        tfidf.fixed_vocabulary_ = False
+    tfidf.idf_ = arrays["idf"]
+
+    model = MultinomialNB(**manifest["model"]["params"])
+    model.classes_ = np.array(arrays["classes"])
+    model.class_log_prior_ = arrays["class_log_prior"]
+    model.feature_log_prob_ = arrays["feature_log_prob"]
+    model.class_count_ = arrays["class_count"]
+    model.feature_count_ = arrays["feature_count"]
+    model.n_features_in_ = arrays["feature_log_prob"].shape[1]
+    return tfidf, model
+
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def artifact_paths(directory):
+    """Return every file of an artifact directory, manifest first"""
+    manifest = read_manifest(directory)
+    return [os.path.join(directory, MANIFEST_FILENAME)] + [
+        os.path.join(directory, entry["file"]) for entry in manifest["files"].values()
+    ]
+
+
+def json_params(params):
+    """Convert estimator parameters to JSON-safe values"""
+    converted = {}
+    for name, value in params.items():
+        if isinstance(value, type) and issubclass(value, np.generic):
+            value = np.dtype(value).name
+        elif isinstance(value, tuple):
+            value = list(value)
+        elif isinstance(value, (frozenset, set)):
+            value = sorted(value)
+        converted[name] = value
+    return converted
+
+
+def restore_params(params):
+    """Undo json_params for TfidfVectorizer and HashingTfidfVectorizer"""
+    params = dict(params)
+    params["dtype"] = np.dtype(params["dtype"]).type
+    params["ngram_range"] = tuple(params["ngram_range"])
+    return params
+
+
+def _write_content_addressed(directory, filename, write):
+    """
+    Write a file through write(path) and name it after its SHA-256
+
+    Returns:
+        dict: The manifest entry (file and sha256); an existing file with
+            the same content is reused instead of being replaced
+    """
+    stem, extension = os.path.splitext(filename)
+    temporary_path = os.path.join(directory, f".{stem}.{os.getpid()}.tmp")
+    write(temporary_path)
+    sha256 = file_sha256(temporary_path)
+    final_name = f"{stem}.{sha256[:12]}{extension}"
+    final_path = os.path.join(directory, final_name)
+    if os.path.exists(final_path) and file_sha256(final_path) == sha256:
+        os.remove(temporary_path)
+    else:
+        os.replace(temporary_path, final_path)
+    return {"file": final_name, "sha256": sha256}
+
+
+def _save_array(path, array):
+    with open(path, "wb") as f:
+        np.save(f, np.ascontiguousarray(array), allow_pickle=False)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _remove_unreferenced(directory, keep):
+    """Delete data files of older exports; open memory maps stay valid after unlinking"""
+    for filename in os.listdir(directory):
+        if filename in keep or not _DATA_FILE_PATTERN.match(filename):
+            continue
+        try:
+            os.remove(os.path.join(directory, filename))
+        except OSError:
+            pass
@@ -0,0 +1,202 @@
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from utils.model_registry import ModelRegistry
+
+# Column/field names tried, in order, when the caller does not name one
+MESSAGE_FIELDS = ["message", "text", "v2", "input-data"]
+
+_worker_registry = None
+
+
+def detect_format(path):
+    """Guess the input format from a file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    return "txt"
+
+
+def read_chunks(path, fmt=None, chunk_size=5000, text_field=None, id_field=None, encoding="utf-8"):
+    """
+    Stream (row_ids, messages) chunks from a CSV, JSONL or plain text file
+
+    Only one chunk is held in memory at a time. Row ids come from id_field
+    when given, otherwise they are the 0-based record number.
+
+    Args:
+        path (str): Input file, "-" for stdin (JSONL or text only)
+        fmt (str): "csv", "jsonl" or "txt"; detected from the extension when omitted
+        chunk_size (int): Messages per chunk
+        text_field (str): CSV column or JSON field holding the message
+        id_field (str): CSV column or JSON field holding the row id
+
+    Yields:
+        tuple: (list of row ids, list of messages)
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == "csv":
+        yield from _read_csv_chunks(path, chunk_size, text_field, id_field, encoding)
+        return
+
+    row_ids, messages = [], []
+    stream = sys.stdin if path == "-" else open(path, encoding=encoding, errors="replace")
+    try:
+        for line_number, line in enumerate(stream):
+            line = line.rstrip("\r\n")
+            if fmt == "jsonl":
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                field = text_field or next((f for f in MESSAGE_FIELDS if f in record), None)
+                message = record.get(field, "") if field else ""
+                row_id = record.get(id_field or "id", line_number)
+            else:
+                message, row_id = line, line_number
+
+            row_ids.append(row_id)
+            messages.append(message if isinstance(message, str) else "")
+            if len(messages) >= chunk_size:
+                yield row_ids, messages
+                row_ids, messages = [], []
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    if messages:
+        yield row_ids, messages
+
+
+def _read_csv_chunks(path, chunk_size, text_field, id_field, encoding):
+    """Stream CSV chunks through pandas without loading the whole file"""
+    reader = pd.read_csv(path, chunksize=chunk_size, encoding=encoding, encoding_errors="replace", dtype=str)
+    offset = 0
+    for frame in reader:
+        field = text_field or next((f for f in MESSAGE_FIELDS if f in frame.columns), frame.columns[0])
+        if id_field:
+            row_ids = frame[id_field].tolist()
+        else:
+            row_ids = list(range(offset, offset + len(frame)))
+        offset += len(frame)
+        yield row_ids, frame[field].fillna("").tolist()
+
+
+class ResultWriter:
+    """Incrementally write row_id, label and spam probability as CSV or JSONL"""
+
+    def __init__(self, path, fmt=None):
+        self.fmt = fmt or ("jsonl" if detect_format(path) == "jsonl" else "csv")
+        self.stream = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+        self._csv = None
+        if self.fmt == "csv":
+            self._csv = csv.writer(self.stream)
+            self._csv.writerow(["row_id", "label", "spam_probability"])
+
+    def write(self, row_ids, labels, spam_probabilities):
+        """Append one chunk of results"""
+        for row_id, label, probability in zip(row_ids, labels, spam_probabilities):
+            label = "spam" if label == 1 else "ham"
+            if self._csv is not None:
+                self._csv.writerow([row_id, label, f"{probability:.6f}"])
+            else:
+                self.stream.write(json.dumps({"row_id": row_id, "label": label, "spam_probability": float(probability)}) + "\n")
+        self.stream.flush()
+
+    def close(self):
+        """Close the output unless it is stdout"""
+        if self.stream is not sys.stdout:
+            self.stream.close()
+
+
+def _init_worker(profile, backend, cache_size=0, campaign_index=False, compact_vocabulary=False, watch_models=False):
+    """Load the models and TextProcessor once per worker process"""
+    global _worker_registry
+    _worker_registry = ModelRegistry.for_classifier(
+        profile=profile, backend=backend, cache_size=cache_size,
+        campaign_index=campaign_index, compact_vocabulary=compact_vocabulary
+    )
+    _worker_registry.load()
+    if watch_models:
+        _worker_registry.start_watching()
+
+
+def _classify_chunk(chunk):
+    """Classify one chunk inside a worker process"""
+    row_ids, messages = chunk
+    # The whole chunk is scored by one model version, even across a reload
+    classifier = _worker_registry.current().classifier
+    labels, probabilities, _ = classifier.classify_many(messages)
+    return row_ids, labels, probabilities[:, -1]
+
+
+def classify_file(input_path, output_path, fmt=None, output_fmt=None, chunk_size=5000,
+                  workers=1, profile="tokenizer", backend="spacy", text_field=None,
+                  id_field=None, encoding="utf-8", cache_size=0, campaign_index=False,
+                  compact_vocabulary=False, watch_models=False):
+    """
+    Classify every message in a file and write results as they complete
+
+    Chunks are scored as single sparse batches. With workers > 1 they are
+    spread over a process pool; at most two chunks per worker are in flight,
+    so memory stays bounded however large the input is, and results are
+    written in input order. With cache_size, each worker keeps a verdict
+    cache so repeated campaign messages are scored once, and campaign_index
+    extends that to near copies of spam already seen. compact_vocabulary
+    trades a little lookup speed for a much smaller per-worker vocabulary.
+    With watch_models, long runs pick up retrained models between chunks.
+
+    Returns:
+        dict: Message count, elapsed seconds and messages per second
+    """
+    start = time.perf_counter()
+    chunks = read_chunks(input_path, fmt, chunk_size, text_field, id_field, encoding)
+    writer = ResultWriter(output_path, output_fmt)
+    total = 0
+
+    try:
+        if workers <= 1:
+            _init_worker(profile, backend, cache_size, campaign_index, compact_vocabulary, watch_models)
+            for chunk in chunks:
+                total += _write_result(writer, _classify_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(profile, backend, cache_size, campaign_index, compact_vocabulary, watch_models)) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(_classify_chunk, chunk))
+                    if len(pending) >= workers * 2:
+                        total += _write_result(writer, pending.popleft().result())
+                while pending:
+                    total += _write_result(writer, pending.popleft().result())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "messages": total,
+        "seconds": elapsed,
+        "messages_per_second": total / elapsed if elapsed else 0.0
+    }
+    if workers <= 1:
+        registry_info = _worker_registry.info()
+        stats["model_version"] = registry_info["current"]["version"]
+        stats["model_reloads"] = registry_info["reloads"]
+        classifier = _worker_registry.current().classifier
+        if classifier.cache is not None:
+            stats["cache"] = classifier.cache.stats()
+        if classifier.campaign_index is not None:
+            stats["campaign_index"] = classifier.campaign_index.stats()
+    return stats
+
+
+def _write_result(writer, result):
+    """Write one finished chunk and return its size"""
+    row_ids, labels, spam_probabilities = result
+    writer.write(row_ids, labels, spam_probabilities)
+    return len(row_ids)
\ No newline at end of file
@@ -0,0 +1,200 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+# Mersenne prime for the universal hash family (a * x + b) mod p
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+class CampaignIndex:
+    """
+    MinHash LSH index over recently classified spam
+
+    Spam arrives in campaigns whose copies differ only by a name, a number or
+    a URL. After TextProcessor those differences shrink to one or two stemmed
+    tokens, so copies share most of their token shingles. Each spam message is
+    reduced to a MinHash signature whose agreement rate with another
+    signature estimates the Jaccard similarity of their shingle sets; banding
+    the signature into LSH buckets finds candidate copies without comparing
+    against every entry.
+
+    A message whose estimated similarity to an indexed campaign reaches the
+    threshold takes that campaign's verdict, skipping vectorization and
+    scoring. Entries are kept in LRU order, bounded by maxsize and aged out
+    after ttl_seconds.
+    """
+
+    def __init__(self, num_perm=64, bands=16, threshold=0.9, shingle_size=2, min_shingles=3,
+                 maxsize=20000, ttl_seconds=6 * 3600.0, seed=1):
+        """
+        Args:
+            num_perm (int): MinHash permutations per signature
+            bands (int): LSH bands; num_perm must be divisible by it. More
+                bands find weaker matches as candidates
+            threshold (float): Minimum estimated Jaccard similarity for a match
+            shingle_size (int): Consecutive stemmed tokens per shingle
+            min_shingles (int): Shorter messages are neither indexed nor
+                matched, since a few shared tokens say little about them
+            maxsize (int): Signatures kept; least recently matched go first
+            ttl_seconds (float): Age after which a campaign entry is dropped
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+        self._entries = OrderedDict()
+        self._buckets = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._counts = {"lookups": 0, "hits": 0, "skipped": 0, "added": 0, "evictions": 0, "expirations": 0}
+
+    def shingles(self, processed_text):
+        """Return the set of token shingles of a preprocessed message"""
+        tokens = processed_text.split()
+        n = self.shingle_size
+        if len(tokens) < n:
+            return set(tokens)
+        return {" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)}
+
+    def signature(self, processed_text):
+        """
+        Return the MinHash signature of a preprocessed message
+
+        Returns:
+            np.ndarray: num_perm uint32 values, or None if the message has
+                fewer than min_shingles shingles
+        """
+        shingles = self.shingles(processed_text)
+        if len(shingles) < self.min_shingles:
+            return None
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (hashes[:, None] * self._a + self._b) % _MERSENNE_PRIME
+        return (permuted.min(axis=0) & 0xFFFFFFFF).astype(np.uint32)
+
+    def query(self, processed_text):
+        """
+        Find the closest indexed campaign for a preprocessed message
+
+        Returns:
+            tuple: (verdict, similarity) of the best match at or above the
+                threshold, or (None, best similarity seen)
+        """
+        signature = self.signature(processed_text)
+        with self._lock:
+            self._counts["lookups"] += 1
+            if signature is None:
+                self._counts["skipped"] += 1
+                return None, 0.0
+
+            best_id, best_similarity = None, 0.0
+            now = time.monotonic()
+            for entry_id in self._candidates(signature):
+                entry = self._entries.get(entry_id)
+                if entry is None:
+                    continue
+                if self.ttl_seconds and now - entry[2] > self.ttl_seconds:
+                    self._remove(entry_id)
+                    self._counts["expirations"] += 1
+                    continue
+                similarity = float(np.mean(entry[0] == signature))
+                if similarity > best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+
+            if best_id is None or best_similarity < self.threshold:
+                return None, best_similarity
+
+            self._entries.move_to_end(best_id)
+            self._counts["hits"] += 1
+            return self._entries[best_id][1], best_similarity
+
+    def add(self, processed_text, verdict):
+        """Index a classified spam message as a campaign representative"""
+        signature = self.signature(processed_text)
+        if signature is None:
+            return False
+
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (signature, verdict, time.monotonic())
+            for band_key in self._band_keys(signature):
+                self._buckets.setdefault(band_key, set()).add(entry_id)
+            self._counts["added"] += 1
+
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._counts["evictions"] += 1
+        return True
+
+    def expire(self):
+        """Drop every entry older than ttl_seconds; returns how many were dropped"""
+        if not self.ttl_seconds:
+            return 0
+        cutoff = time.monotonic() - self.ttl_seconds
+        with self._lock:
+            expired = [entry_id for entry_id, entry in self._entries.items() if entry[2] < cutoff]
+            for entry_id in expired:
+                self._remove(entry_id)
+            self._counts["expirations"] += len(expired)
+        return len(expired)
+
+    def clear(self):
+        """Drop every indexed campaign"""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def stats(self):
+        """Return hit rate, size, evictions and approximate memory use"""
+        with self._lock:
+            counts = dict(self._counts)
+            entries = len(self._entries)
+            bucket_refs = sum(len(ids) for ids in self._buckets.values())
+            buckets = len(self._buckets)
+
+        # Signature array plus entry tuple, and one set slot per bucket membership
+        memory = entries * (self.num_perm * 4 + 112 + 160) + buckets * 260 + bucket_refs * 40
+        return {
+            **counts,
+            "hit_rate": counts["hits"] / counts["lookups"] if counts["lookups"] else 0.0,
+            "entries": entries,
+            "buckets": buckets,
+            "maxsize": self.maxsize,
+            "memory_bytes": memory
+        }
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands)]
+
+    def _candidates(self, signature):
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        return candidates
+
+    def _remove(self, entry_id):
+        """Remove an entry and its bucket memberships; caller holds the lock"""
+        signature = self._entries.pop(entry_id)[0]
+        for band_key in self._band_keys(signature):
+            ids = self._buckets.get(band_key)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del self._buckets[band_key]
\ No newline at end of file
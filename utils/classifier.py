@@ -0,0 +1,347 @@
+import time
+import numpy as np
+from scipy.special import logsumexp
+
+def evaluate_model(model, vectors):
+    """
+    Evaluate a fitted naive Bayes model once for a batch of vectors
+
+    predict and predict_proba each recompute the joint log-likelihood; this
+    computes it a single time and derives labels, probabilities and the
+    spam-vs-ham margin from it.
+
+    Args:
+        model (MultinomialNB): Fitted classifier
+        vectors (scipy.sparse matrix): Vectorized messages, one row each
+
+    Returns:
+        tuple: (labels, probabilities, margins) as NumPy arrays
+    """
+    if hasattr(model, "predict_joint_log_proba"):
+        jll = model.predict_joint_log_proba(vectors)
+    else:
+        # scikit-learn < 1.2
+        jll = model._joint_log_likelihood(vectors)
+
+    labels = model.classes_[np.argmax(jll, axis=1)]
+    probabilities = np.exp(jll - logsumexp(jll, axis=1, keepdims=True))
+    margins = jll[:, -1] - jll[:, 0]
+    return labels, probabilities, margins
+
+
+class SpamClassifier:
+    """Single classification entry point shared by the app, the pages and training"""
+
+    def __init__(self, tfidf, model, preprocess=None, text_processor=None, cache=None, campaign_index=None):
+        """
+        Args:
+            tfidf (TfidfVectorizer): Fitted vectorizer
+            model (MultinomialNB): Fitted classifier
+            preprocess (callable): Maps raw text to the vectorizer's input;
+                defaults to text_processor.transform_text, None passes text through
+            text_processor (TextProcessor): Enables batched preprocessing
+                through transform_many in classify_many
+            cache (VerdictCache): Reuses verdicts for repeated messages
+            campaign_index (CampaignIndex): Reuses spam verdicts for near
+                copies of recently seen spam campaigns
+        """
+        self.tfidf = tfidf
+        self.model = model
+        self.text_processor = text_processor
+        self.cache = cache
+        self.campaign_index = campaign_index
+        self.load_report = None
+        if preprocess is None and text_processor is not None:
+            preprocess = text_processor.transform_text
+        self.preprocess = preprocess
+
+    @classmethod
+    def from_artifacts(cls, profile="tokenizer", backend="spacy", tfidf_path=None, model_path=None,
+                       artifact_dir=None, cache_size=0, cache_ttl=3600.0, campaign_index=False,
+                       compact_vocabulary=False, validation="receipt"):
+        """
+        Load the model artifacts and a TextProcessor outside of Streamlit
+
+        Args:
+            profile (str): spaCy pipeline profile for the TextProcessor
+            backend (str): Tokenizer backend for the TextProcessor
+            tfidf_path (str): Vectorizer pickle, discovered when omitted
+            model_path (str): Classifier pickle, discovered when omitted
+            artifact_dir (str): Memory-mappable artifact directory, preferred
+                over discovered pickles and discovered when omitted
+            cache_size (int): Attach a VerdictCache of this many entries,
+                invalidated when the model files change; 0 disables caching
+            cache_ttl (float): Seconds a cached verdict stays valid
+            campaign_index (bool): Attach a CampaignIndex for near-duplicate spam
+            compact_vocabulary (bool): Swap the vectorizer's vocabulary_ dict
+                for an array-backed CompactVocabulary
+            validation (str): Validation mode for ModelValidator.load_models_with_report;
+                the load report is kept as load_report
+
+        Returns:
+            SpamClassifier: Classifier preprocessing with TextProcessor.transform_text
+        """
+        # Imported here so the Streamlit-free App/app.py path stays lightweight
+        from utils.model_validator import ModelValidator
+
+        tfidf, model, load_report = ModelValidator.load_models_with_report(
+            tfidf_path, model_path, artifact_dir, validation
+        )
+        classifier = cls.build(
+            tfidf, model, cls.load_text_processor(profile, backend),
+            cache_size=cache_size, cache_ttl=cache_ttl, campaign_index=campaign_index,
+            compact_vocabulary=compact_vocabulary, cache_watch_paths=load_report["paths"]
+        )
+        classifier.load_report = load_report
+        return classifier
+
+    @staticmethod
+    def load_text_processor(profile="tokenizer", backend="spacy"):
+        """Create a TextProcessor with the shipped stem table loaded"""
+        from utils.model_validator import ModelValidator
+        from utils.text_processor import TextProcessor
+
+        text_processor = TextProcessor(profile=profile, backend=backend)
+        stem_table_path = ModelValidator.find_stem_table()
+        if stem_table_path:
+            text_processor.stemmer.load_table(stem_table_path)
+        return text_processor
+
+    @classmethod
+    def build(cls, tfidf, model, text_processor, cache_size=0, cache_ttl=3600.0, campaign_index=False,
+              compact_vocabulary=False, cache_watch_paths=None):
+        """
+        Wrap already loaded models with the optional serving features
+
+        Used by from_artifacts and by ModelRegistry, which builds one
+        classifier per model version around a shared TextProcessor.
+
+        Args:
+            cache_watch_paths (list): Model files whose change clears the
+                verdict cache; not needed when each version gets its own cache
+        """
+        from utils.campaign_index import CampaignIndex
+        from utils.compact_vocabulary import compact_vectorizer_vocabulary
+        from utils.verdict_cache import VerdictCache
+
+        if compact_vocabulary:
+            compact_vectorizer_vocabulary(tfidf)
+
+        cache = None
+        if cache_size:
+            cache = VerdictCache(maxsize=cache_size, ttl_seconds=cache_ttl, artifact_paths=cache_watch_paths)
+
+        return cls(
+            tfidf, model, text_processor=text_processor, cache=cache,
+            campaign_index=CampaignIndex() if campaign_index else None
+        )
+
+    def classify(self, text):
+        """
+        Preprocess and classify one raw message
+
+        Args:
+            text (str): Raw message
+
+        Returns:
+            dict: Result of classify_processed plus the processed text and
+                its preprocessing time
+        """
+        start = time.perf_counter()
+        if self.cache is not None:
+            verdict = self.cache.get_raw(text)
+            if verdict is not None:
+                return _cached_result(verdict, start)
+
+        processed_text = self.preprocess(text) if self.preprocess else text
+        preprocess_ms = (time.perf_counter() - start) * 1000
+
+        result = self.classify_processed(processed_text, raw_text=text)
+        result["timings_ms"]["preprocess"] = preprocess_ms
+        result["timings_ms"]["total"] += preprocess_ms
+        return result
+
+    def classify_processed(self, processed_text, raw_text=None):
+        """
+        Classify one already preprocessed message with a single model evaluation
+
+        Args:
+            processed_text (str): Output of the preprocessing step
+            raw_text (str): Original message, stored as a cache pre-key
+
+        Returns:
+            dict: label, probabilities, confidence, margin (spam minus ham
+                joint log-likelihood), processed_text, cached, campaign_similarity
+                (set when a near-duplicate campaign supplied the verdict) and
+                per-stage timings
+        """
+        start = time.perf_counter()
+        if self.cache is not None:
+            verdict = self.cache.get(processed_text)
+            if verdict is not None:
+                if raw_text is not None:
+                    self.cache.put(processed_text, verdict, raw_text)
+                return _cached_result(verdict, start)
+
+        if self.campaign_index is not None:
+            verdict, similarity = self.campaign_index.query(processed_text)
+            if verdict is not None:
+                result = _cached_result({**verdict, "processed_text": processed_text}, start)
+                result["campaign_similarity"] = similarity
+                return result
+
+        vector = self.tfidf.transform([processed_text])
+        vectorized = time.perf_counter()
+        labels, probabilities, margins = evaluate_model(self.model, vector)
+        scored = time.perf_counter()
+
+        verdict = _verdict(labels[0], probabilities[0], margins[0], processed_text)
+        if self.cache is not None:
+            self.cache.put(processed_text, verdict, raw_text)
+        self._index_campaign(verdict)
+
+        return {
+            **verdict,
+            "cached": False,
+            "timings_ms": {
+                "preprocess": 0.0,
+                "vectorize": (vectorized - start) * 1000,
+                "score": (scored - vectorized) * 1000,
+                "total": (scored - start) * 1000
+            }
+        }
+
+    def classify_many(self, texts, batch_size=1000):
+        """
+        Preprocess, vectorize and score a batch of raw messages as one sparse matrix
+
+        Args:
+            texts (list): Raw messages
+            batch_size (int): nlp.pipe batch size when a TextProcessor is attached
+
+        Returns:
+            tuple: (labels, probabilities, margins) as NumPy arrays
+        """
+        if self.cache is None and self.campaign_index is None:
+            return evaluate_model(self.model, self.tfidf.transform(self._preprocess_many(texts, batch_size)))
+
+        verdicts, _, _, _ = self._verdicts_many(texts, batch_size)
+        return (
+            np.array([v["label"] for v in verdicts]),
+            np.array([v["probabilities"] for v in verdicts]).reshape(len(verdicts), len(self.model.classes_)),
+            np.array([v["margin"] for v in verdicts])
+        )
+
+    def classify_many_results(self, texts, batch_size=1000):
+        """
+        Classify a batch of raw messages into one classify()-style result each
+
+        Scored like classify_many, with the same keys as classify: label,
+        probabilities, confidence, margin, processed_text, cached,
+        campaign_similarity and timings_ms. A batch is timed per stage, so
+        each message's timings are its share of the batch's.
+
+        Returns:
+            list: One result dict per message, in order
+        """
+        texts = list(texts)
+        verdicts, cached, similarities, timings_ms = self._verdicts_many(texts, batch_size)
+        share = {stage: ms / max(len(texts), 1) for stage, ms in timings_ms.items()}
+        share["total"] = sum(share.values())
+        return [
+            {**verdict, "cached": was_cached, "campaign_similarity": similarity, "timings_ms": dict(share)}
+            for verdict, was_cached, similarity in zip(verdicts, cached, similarities)
+        ]
+
+    def _verdicts_many(self, texts, batch_size):
+        """
+        Verdicts for a batch, reusing cached and campaign verdicts
+
+        Returns:
+            tuple: (verdicts, cached flags, campaign similarities or None,
+                batch timings_ms per stage)
+        """
+        # Only messages missing from the cache are preprocessed and scored
+        start = time.perf_counter()
+        texts = list(texts)
+        cache = self.cache
+        verdicts = [cache.get_raw(text) for text in texts] if cache is not None else [None] * len(texts)
+        cached = [verdict is not None for verdict in verdicts]
+        similarities = [None] * len(texts)
+        pending = [i for i, verdict in enumerate(verdicts) if verdict is None]
+        processed = self._preprocess_many([texts[i] for i in pending], batch_size)
+        preprocessed = time.perf_counter()
+
+        # Copies within the batch are scored once too
+        to_score = {}
+        for i, processed_text in zip(pending, processed):
+            if processed_text in to_score:
+                to_score[processed_text].append(i)
+                continue
+            verdict = cache.get(processed_text) if cache is not None else None
+            if verdict is not None:
+                cache.put(processed_text, verdict, texts[i])
+                verdicts[i] = verdict
+                cached[i] = True
+                continue
+            if self.campaign_index is not None:
+                verdict, similarity = self.campaign_index.query(processed_text)
+                if verdict is not None:
+                    verdicts[i] = {**verdict, "processed_text": processed_text}
+                    cached[i] = True
+                    similarities[i] = similarity
+                    continue
+            to_score[processed_text] = [i]
+
+        vectorize_ms = score_ms = 0.0
+        if to_score:
+            vector_start = time.perf_counter()
+            vectors = self.tfidf.transform(list(to_score))
+            vectorized = time.perf_counter()
+            labels, probabilities, margins = evaluate_model(self.model, vectors)
+            vectorize_ms = (vectorized - vector_start) * 1000
+            score_ms = (time.perf_counter() - vectorized) * 1000
+            for (processed_text, indices), label, probability, margin in zip(to_score.items(), labels, probabilities, margins):
+                verdict = _verdict(label, probability, margin, processed_text)
+                self._index_campaign(verdict)
+                for i in indices:
+                    verdicts[i] = verdict
+                    if cache is not None:
+                        cache.put(processed_text, verdict, texts[i])
+
+        timings_ms = {"preprocess": (preprocessed - start) * 1000, "vectorize": vectorize_ms, "score": score_ms}
+        return verdicts, cached, similarities, timings_ms
+
+    def _index_campaign(self, verdict):
+        """Remember a freshly scored spam verdict as a campaign representative"""
+        if self.campaign_index is not None and verdict["label"] == self.model.classes_[-1]:
+            self.campaign_index.add(verdict["processed_text"], verdict)
+
+    def _preprocess_many(self, texts, batch_size):
+        """Preprocess a batch, through nlp.pipe when a TextProcessor is attached"""
+        if self.text_processor is not None:
+            return list(self.text_processor.transform_many(texts, batch_size=batch_size))
+        if self.preprocess is not None:
+            return [self.preprocess(text) for text in texts]
+        return list(texts)
+
+
+def _verdict(label, probabilities, margin, processed_text):
+    """Cacheable part of a classification result"""
+    return {
+        "label": label.item() if hasattr(label, "item") else label,
+        "probabilities": probabilities,
+        "confidence": float(probabilities.max()),
+        "margin": float(margin),
+        "processed_text": processed_text
+    }
+
+
+def _cached_result(verdict, start):
+    """Wrap a cached verdict as a classify result with its lookup time"""
+    lookup_ms = (time.perf_counter() - start) * 1000
+    return {
+        **verdict,
+        "cached": True,
+        "timings_ms": {"preprocess": 0.0, "vectorize": 0.0, "score": 0.0, "total": lookup_ms}
+    }
\ No newline at end of file
@@ -0,0 +1,213 @@
+import json
+import mmap
+import sys
+import zlib
+from collections.abc import Mapping
+import numpy as np
+
+VOCABULARY_MAGIC = b"SPAMVOC1"
+_ALIGNMENT = 8
+_EMPTY_SLOT = -1
+
+
+class CompactVocabulary(Mapping):
+    """
+    Read-only term -> feature index mapping stored in four flat NumPy arrays
+
+        blob     uint8   UTF-8 bytes of every term, concatenated in sorted order
+        offsets  uint32  start of each term in blob (n + 1 entries)
+        indices  int32   feature index of each sorted term
+        slots    int32   open-addressing hash table (CRC-32, linear probing)
+                         holding sorted positions, -1 when empty
+
+    A dict of 5000 short strings spends most of its memory on per-object
+    headers (a str object and a hash-table entry per term); here every term
+    costs its UTF-8 bytes plus 12-20 bytes of array slots, and the arrays can
+    be memory-mapped straight from a file so worker processes share one copy.
+
+    The class implements the Mapping protocol, so it can replace a fitted
+    TfidfVectorizer's vocabulary_ directly: transform only needs lookups,
+    len and iteration.
+    """
+
+    def __init__(self, blob, offsets, indices, slots, _buffer=None):
+        self.blob = blob
+        self.offsets = offsets
+        self.indices = indices
+        self.slots = slots
+        self._mask = len(slots) - 1
+        # Lookups index memoryviews, which return plain ints and compare
+        # against bytes without creating a NumPy scalar or array per probe
+        self._blob_view = memoryview(blob)
+        self._offsets_view = memoryview(offsets)
+        self._indices_view = memoryview(indices)
+        self._slots_view = memoryview(slots)
+        self._buffer = _buffer
+
+    @classmethod
+    def from_dict(cls, vocabulary):
+        """
+        Build a compact vocabulary from a term -> index dict
+
+        Args:
+            vocabulary (dict): e.g. TfidfVectorizer.vocabulary_
+
+        Returns:
+            CompactVocabulary: Mapping with the same items
+        """
+        terms = sorted(vocabulary)
+        encoded = [term.encode("utf-8") for term in terms]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8).copy()
+        indices = np.array([vocabulary[term] for term in terms], dtype=np.int32)
+
+        # Load factor at most 0.5 keeps probe chains short
+        size = 1
+        while size < 2 * max(len(terms), 1):
+            size <<= 1
+        slots = np.full(size, _EMPTY_SLOT, dtype=np.int32)
+        mask = size - 1
+        for position, term_bytes in enumerate(encoded):
+            slot = zlib.crc32(term_bytes) & mask
+            while slots[slot] != _EMPTY_SLOT:
+                slot = (slot + 1) & mask
+            slots[slot] = position
+
+        return cls(blob, offsets, indices, slots)
+
+    def position(self, term):
+        """Return the sorted position of term, or -1 when absent"""
+        term_bytes = term.encode("utf-8")
+        slots, offsets, view = self._slots_view, self._offsets_view, self._blob_view
+        slot = zlib.crc32(term_bytes) & self._mask
+        while True:
+            position = slots[slot]
+            if position == _EMPTY_SLOT:
+                return -1
+            if view[offsets[position]:offsets[position + 1]] == term_bytes:
+                return position
+            slot = (slot + 1) & self._mask
+
+    def get(self, term, default=None):
+        position = self.position(term)
+        return self._indices_view[position] if position >= 0 else default
+
+    def __getitem__(self, term):
+        position = self.position(term)
+        if position < 0:
+            raise KeyError(term)
+        return self._indices_view[position]
+
+    def __contains__(self, term):
+        return isinstance(term, str) and self.position(term) >= 0
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __iter__(self):
+        view, offsets = self._blob_view, self._offsets_view
+        for position in range(len(self.indices)):
+            yield bytes(view[offsets[position]:offsets[position + 1]]).decode("utf-8")
+
+    def terms(self):
+        """Return all terms ordered by feature index"""
+        ordered = [None] * len(self.indices)
+        for term, index in zip(self, self.indices):
+            ordered[index] = term
+        return ordered
+
+    def memory_bytes(self):
+        """Bytes held by the arrays (shared page cache when memory-mapped)"""
+        return int(self.blob.nbytes + self.offsets.nbytes + self.indices.nbytes + self.slots.nbytes)
+
+    @property
+    def is_mmapped(self):
+        return self._buffer is not None
+
+    def save(self, path):
+        """
+        Write the arrays to a single file that load() can memory-map
+
+        Layout: magic, uint32 header length, JSON header describing each
+        array's dtype, offset and length, then the arrays at 8-byte alignment.
+        """
+        arrays = {"blob": self.blob, "offsets": self.offsets, "indices": self.indices, "slots": self.slots}
+        header = {"version": 1, "arrays": {}}
+        # Offsets depend on the header size, so size it with placeholder offsets first
+        data_start = 0
+        for _ in range(2):
+            position = data_start
+            for name, array in arrays.items():
+                header["arrays"][name] = {"dtype": array.dtype.str, "offset": position, "count": int(array.size)}
+                position = _align(position + array.nbytes)
+            header_bytes = json.dumps(header).encode("utf-8")
+            data_start = _align(len(VOCABULARY_MAGIC) + 4 + len(header_bytes))
+
+        with open(path, "wb") as f:
+            f.write(VOCABULARY_MAGIC)
+            f.write(len(header_bytes).to_bytes(4, "little"))
+            f.write(header_bytes)
+            for name, array in arrays.items():
+                f.seek(header["arrays"][name]["offset"])
+                f.write(np.ascontiguousarray(array).tobytes())
+
+    @classmethod
+    def load(cls, path, mmap_mode=True):
+        """
+        Load a vocabulary written by save()
+
+        Args:
+            path (str): Vocabulary file
+            mmap_mode (bool): Map the file read-only instead of copying it
+                into process memory
+        """
+        with open(path, "rb") as f:
+            if mmap_mode:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = f.read()
+
+        if bytes(buffer[:len(VOCABULARY_MAGIC)]) != VOCABULARY_MAGIC:
+            raise ValueError(f"{path} is not a compact vocabulary file")
+        header_length = int.from_bytes(buffer[len(VOCABULARY_MAGIC):len(VOCABULARY_MAGIC) + 4], "little")
+        header_start = len(VOCABULARY_MAGIC) + 4
+        header = json.loads(bytes(buffer[header_start:header_start + header_length]))
+        if header["version"] != 1:
+            raise ValueError(f"Unsupported compact vocabulary version {header['version']}")
+
+        arrays = {
+            name: np.frombuffer(buffer, dtype=np.dtype(spec["dtype"]), count=spec["count"], offset=spec["offset"])
+            for name, spec in header["arrays"].items()
+        }
+        return cls(arrays["blob"], arrays["offsets"], arrays["indices"], arrays["slots"],
+                   _buffer=buffer if mmap_mode else None)
+
+    def __reduce__(self):
+        # Pickle as plain arrays; unpickling is then a few memcpy calls
+        return (CompactVocabulary, (np.array(self.blob), np.array(self.offsets), np.array(self.indices), np.array(self.slots)))
+
+
+def dict_memory_bytes(vocabulary):
+    """
+    Deep size of a term -> index dict: the dict table, every key string and
+    every int value object (small ints are cached and shared, so not counted)
+    """
+    total = sys.getsizeof(vocabulary)
+    for term, index in vocabulary.items():
+        total += sys.getsizeof(term)
+        if not -5 <= index <= 256:
+            total += sys.getsizeof(index)
+    return total
+
+
+def compact_vectorizer_vocabulary(tfidf):
+    """Replace a fitted vectorizer's vocabulary_ dict with a CompactVocabulary in place"""
+    # Hashing vectorizers have no vocabulary to compact
+    if hasattr(tfidf, "vocabulary_") and not isinstance(tfidf.vocabulary_, CompactVocabulary):
+        tfidf.vocabulary_ = CompactVocabulary.from_dict(tfidf.vocabulary_)
+    return tfidf
+
+
+def _align(position):
+    return (position + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
\ No newline at end of file
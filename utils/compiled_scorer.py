@@ -0,0 +1,231 @@
+import json
+import math
+import re
+from collections.abc import Mapping
+import numpy as np
+from utils.compact_vocabulary import CompactVocabulary
+
+COMPILED_SCORER_VERSION = 1
+
+class CompiledScorer:
+    """
+    Linear scorer folded from a fitted TfidfVectorizer and binary MultinomialNB
+
+    For two classes MultinomialNB reduces to a log-odds margin:
+
+        margin = x . (feature_log_prob_[1] - feature_log_prob_[0])
+                 + (class_log_prior_[1] - class_log_prior_[0])
+
+    where x is the normalized TF-IDF row. Each vocabulary term (unigrams and
+    bigrams alike) is mapped straight to (idf, idf * log-prob difference), so
+    scoring a message is a dict lookup per n-gram plus one normalization, with
+    no sparse matrices and no sklearn calls. The spam probability is the
+    logistic function of the margin.
+    """
+
+    def __init__(self, term_weights, bias, classes, analyzer_config, tf_config):
+        self.term_weights = term_weights
+        self.bias = bias
+        self.classes = list(classes)
+        self.analyzer_config = analyzer_config
+        self.tf_config = tf_config
+
+        self._token_pattern = re.compile(analyzer_config["token_pattern"])
+        self._stop_words = frozenset(analyzer_config["stop_words"] or ())
+        self._min_n, self._max_n = analyzer_config["ngram_range"]
+
+    @classmethod
+    def from_models(cls, tfidf, model, compact_vocabulary=False):
+        """
+        Compile a fitted TfidfVectorizer and MultinomialNB pair
+
+        Args:
+            tfidf (TfidfVectorizer): Fitted vectorizer using the built-in word analyzer
+            model (MultinomialNB): Fitted binary classifier
+            compact_vocabulary (bool): Keep terms in a CompactVocabulary and
+                weights in arrays instead of a dict of tuples
+
+        Returns:
+            CompiledScorer: Scorer reproducing model.predict_proba(tfidf.transform(texts))
+        """
+        if tfidf.analyzer != "word" or tfidf.tokenizer is not None or tfidf.preprocessor is not None:
+            raise ValueError("Only the built-in word analyzer can be compiled")
+        if tfidf.strip_accents is not None:
+            raise ValueError("strip_accents is not supported by the compiled scorer")
+        if len(model.classes_) != 2:
+            raise ValueError("The compiled scorer only supports binary classifiers")
+
+        idf = tfidf.idf_ if tfidf.use_idf else np.ones(len(tfidf.vocabulary_))
+        log_prob_delta = model.feature_log_prob_[1] - model.feature_log_prob_[0]
+        weights = idf * log_prob_delta
+
+        if compact_vocabulary:
+            vocabulary = tfidf.vocabulary_
+            if not isinstance(vocabulary, CompactVocabulary):
+                vocabulary = CompactVocabulary.from_dict(vocabulary)
+            term_weights = _CompactTermWeights(vocabulary, idf, weights)
+        else:
+            term_weights = {
+                term: (float(idf[index]), float(weights[index]))
+                for term, index in tfidf.vocabulary_.items()
+            }
+        bias = float(model.class_log_prior_[1] - model.class_log_prior_[0])
+
+        stop_words = tfidf.get_stop_words()
+        analyzer_config = {
+            "token_pattern": tfidf.token_pattern,
+            "lowercase": bool(tfidf.lowercase),
+            "stop_words": sorted(stop_words) if stop_words else None,
+            "ngram_range": list(tfidf.ngram_range)
+        }
+        tf_config = {
+            "binary": bool(tfidf.binary),
+            "sublinear_tf": bool(tfidf.sublinear_tf),
+            "norm": tfidf.norm
+        }
+        return cls(term_weights, bias, model.classes_.tolist(), analyzer_config, tf_config)
+
+    def analyze(self, text):
+        """Split text into n-grams exactly as the vectorizer's word analyzer does"""
+        if self.analyzer_config["lowercase"]:
+            text = text.lower()
+
+        tokens = self._token_pattern.findall(text)
+        if self._stop_words:
+            tokens = [token for token in tokens if token not in self._stop_words]
+
+        if self._max_n == 1:
+            return tokens
+
+        original_tokens = tokens
+        if self._min_n == 1:
+            ngrams = list(original_tokens)
+            min_n = 2
+        else:
+            ngrams = []
+            min_n = self._min_n
+
+        n_original = len(original_tokens)
+        for n in range(min_n, min(self._max_n + 1, n_original + 1)):
+            for i in range(n_original - n + 1):
+                ngrams.append(" ".join(original_tokens[i:i + n]))
+        return ngrams
+
+    def decision_function(self, text):
+        """
+        Return the spam-vs-ham log-likelihood margin for one processed text
+
+        Args:
+            text (str): Output of TextProcessor.transform_text
+
+        Returns:
+            float: jll[spam] - jll[ham]; positive means spam
+        """
+        counts = {}
+        term_weights = self.term_weights
+        for term in self.analyze(text):
+            if term in term_weights:
+                counts[term] = counts.get(term, 0) + 1
+
+        if not counts:
+            return self.bias
+
+        binary = self.tf_config["binary"]
+        sublinear = self.tf_config["sublinear_tf"]
+        norm = self.tf_config["norm"]
+
+        dot = 0.0
+        norm_total = 0.0
+        for term, count in counts.items():
+            if binary:
+                count = 1
+            tf = math.log(count) + 1 if sublinear else count
+            idf, weight = term_weights[term]
+            dot += tf * weight
+            value = tf * idf
+            norm_total += value * value if norm == "l2" else abs(value)
+
+        if norm == "l2":
+            dot /= math.sqrt(norm_total)
+        elif norm == "l1":
+            dot /= norm_total
+
+        return dot + self.bias
+
+    def predict_proba(self, text):
+        """Return [P(ham), P(spam)] for one processed text"""
+        spam = _sigmoid(self.decision_function(text))
+        return np.array([1.0 - spam, spam])
+
+    def predict(self, text):
+        """Return the predicted class label for one processed text"""
+        return self.classes[1] if self.decision_function(text) > 0 else self.classes[0]
+
+    def save(self, path):
+        """Export the scorer as a .npz archive that loads without pickle"""
+        terms = list(self.term_weights)
+        weights = np.array([self.term_weights[t] for t in terms], dtype=np.float64).reshape(-1, 2)
+        config = {
+            "version": COMPILED_SCORER_VERSION,
+            "bias": self.bias,
+            "classes": self.classes,
+            "analyzer": self.analyzer_config,
+            "tf": self.tf_config
+        }
+        np.savez(
+            path,
+            terms=np.array(terms, dtype=str),
+            idf=weights[:, 0],
+            weights=weights[:, 1],
+            config=np.array(json.dumps(config))
+        )
+
+    @classmethod
+    def load(cls, path, compact_vocabulary=False):
+        """Load a scorer exported with save()"""
+        with np.load(path, allow_pickle=False) as data:
+            config = json.loads(str(data["config"]))
+            if config["version"] != COMPILED_SCORER_VERSION:
+                raise ValueError(f"Unsupported compiled scorer version {config['version']}")
+            if compact_vocabulary:
+                vocabulary = CompactVocabulary.from_dict({str(term): i for i, term in enumerate(data["terms"])})
+                term_weights = _CompactTermWeights(vocabulary, np.array(data["idf"]), np.array(data["weights"]))
+            else:
+                term_weights = {
+                    str(term): (float(idf), float(weight))
+                    for term, idf, weight in zip(data["terms"], data["idf"], data["weights"])
+                }
+        return cls(term_weights, config["bias"], config["classes"], config["analyzer"], config["tf"])
+
+
+class _CompactTermWeights(Mapping):
+    """term -> (idf, weight) view over a CompactVocabulary and two float arrays"""
+
+    def __init__(self, vocabulary, idf, weights):
+        self.vocabulary = vocabulary
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+    def __getitem__(self, term):
+        index = self.vocabulary[term]
+        return float(self.idf[index]), float(self.weights[index])
+
+    def __contains__(self, term):
+        return term in self.vocabulary
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def __iter__(self):
+        return iter(self.vocabulary.terms())
+
+    def memory_bytes(self):
+        return self.vocabulary.memory_bytes() + self.idf.nbytes + self.weights.nbytes
+
+
+def _sigmoid(margin):
+    """Numerically stable logistic function"""
+    if margin >= 0:
+        return 1.0 / (1.0 + math.exp(-margin))
+    z = math.exp(margin)
+    return z / (1.0 + z)
\ No newline at end of file
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import numpy as np
+import scipy.sparse
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import train_test_split
+from utils.artifacts import json_params, restore_params
+from utils.compact_vocabulary import CompactVocabulary
+
+FEATURE_CACHE_DIR = os.path.join(".cache", "features")
+CACHE_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+# Entries kept; the least recently used are removed first
+MAX_ENTRIES = 64
+
+
+def build_features(texts, labels, make_vectorizer, split_seed=42, test_size=0.2):
+    """
+    Split preprocessed messages and fit TF-IDF on the training part
+
+    The split is stratified by label, so with the same seed it selects the
+    same rows as train_test_split(texts, labels, stratify=labels).
+
+    Args:
+        texts (sequence): Preprocessed messages
+        labels (sequence): 0 = ham / 1 = spam
+        make_vectorizer (callable): Returns an unfitted TfidfVectorizer
+        split_seed (int): random_state of the split
+        test_size (float): Share of rows held out
+
+    Returns:
+        dict: tfidf, X_train, X_test (CSR), y_train, y_test, train_index and
+            test_index (row numbers into texts), and build_seconds
+    """
+    start = time.perf_counter()
+    texts = np.asarray(texts, dtype=object)
+    labels = np.asarray(labels)
+    train_index, test_index = train_test_split(
+        np.arange(len(texts)), test_size=test_size, random_state=split_seed, stratify=labels
+    )
+    tfidf = make_vectorizer()
+    features = {
+        "tfidf": tfidf,
+        "X_train": tfidf.fit_transform(texts[train_index]).tocsr(),
+        "X_test": tfidf.transform(texts[test_index]).tocsr(),
+        "y_train": labels[train_index],
+        "y_test": labels[test_index],
+        "train_index": train_index,
+        "test_index": test_index
+    }
+    features["build_seconds"] = time.perf_counter() - start
+    return features
+
+
+class FeatureCache:
+    """
+    On-disk cache of fitted TF-IDF features for train/test splits
+
+    An entry is keyed by a hash of the preprocessed messages and labels,
+    the split seed and size, the vectorizer class and parameters and the
+    sklearn version. It holds everything build_features returns:
+
+        manifest.json             key parts, shapes and vectorizer parameters
+        vocabulary.vocab, idf.npy the fitted vectorizer (no pickles)
+        X_train.npz, X_test.npz   scipy.sparse CSR matrices
+        y_train.npy, y_test.npy, train_index.npy, test_index.npy
+
+    Changing only MultinomialNB hyperparameters, or rerunning a sweep,
+    loads an entry in milliseconds instead of re-tokenizing and refitting;
+    the manifest keeps the original build time for reporting. Entries are
+    written to a temporary directory and renamed into place, so a
+    concurrent reader sees a complete entry or none.
+    """
+
+    def __init__(self, directory=FEATURE_CACHE_DIR, max_entries=MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def key(self, texts, labels, vectorizer, split_seed=42, test_size=0.2):
+        """
+        Cache key of a dataset, split and vectorizer configuration
+
+        Returns:
+            str: SHA-256 hex digest, or None when the vectorizer parameters
+                cannot be stored (a custom tokenizer, preprocessor or analyzer)
+        """
+        params = json_params(vectorizer.get_params())
+        if any(callable(value) for value in params.values()):
+            return None
+
+        digest = hashlib.sha256()
+        for text in texts:
+            digest.update(text.encode("utf-8") + b"\0")
+        digest.update(np.asarray(labels, dtype=np.int64).tobytes())
+        digest.update(json.dumps({
+            "version": CACHE_VERSION,
+            "split": {"seed": split_seed, "test_size": test_size, "stratify": True},
+            "vectorizer": {"class": type(vectorizer).__name__, "params": params},
+            "sklearn": sklearn.__version__
+        }, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_or_build(self, texts, labels, make_vectorizer, split_seed=42, test_size=0.2):
+        """
+        Load the features for this configuration, building and storing them on a miss
+
+        Args:
+            As build_features
+
+        Returns:
+            tuple: (features dict as build_features, report dict with key,
+                hit and seconds)
+        """
+        start = time.perf_counter()
+        texts = list(texts)
+        labels = np.asarray(labels)
+        key = self.key(texts, labels, make_vectorizer(), split_seed, test_size)
+
+        features = self.load(key) if key else None
+        hit = features is not None
+        if not hit:
+            features = build_features(texts, labels, make_vectorizer, split_seed, test_size)
+            if key:
+                self.save(key, features, split_seed, test_size)
+        return features, {"key": key and key[:16], "hit": hit, "seconds": time.perf_counter() - start}
+
+    def load(self, key):
+        """Return the cached features for key, or None"""
+        entry = os.path.join(self.directory, key[:16])
+        try:
+            with open(os.path.join(entry, MANIFEST_FILENAME), encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != CACHE_VERSION or manifest.get("key") != key:
+                return None
+
+            tfidf = TfidfVectorizer(**restore_params(manifest["vectorizer"]["params"]))
+            # A plain dict, so models trained from the cache pickle like freshly fitted ones
+            tfidf.vocabulary_ = dict(CompactVocabulary.load(os.path.join(entry, "vocabulary.vocab"), mmap_mode=False))
+            tfidf.fixed_vocabulary_ = False
+            tfidf.idf_ = np.load(os.path.join(entry, "idf.npy"), allow_pickle=False)
+            features = {"tfidf": tfidf, "build_seconds": manifest.get("build_seconds")}
+            for name in ("X_train", "X_test"):
+                features[name] = scipy.sparse.load_npz(os.path.join(entry, f"{name}.npz")).tocsr()
+            for name in ("y_train", "y_test", "train_index", "test_index"):
+                features[name] = np.load(os.path.join(entry, f"{name}.npy"), allow_pickle=False)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        # Recently used entries survive pruning
+        os.utime(os.path.join(entry, MANIFEST_FILENAME))
+        return features
+
+    def save(self, key, features, split_seed=42, test_size=0.2):
+        """Store features under key; an entry written concurrently by another process wins"""
+        entry = os.path.join(self.directory, key[:16])
+        if os.path.exists(entry):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        temporary = os.path.join(self.directory, f".{key[:16]}.{os.getpid()}.tmp")
+        shutil.rmtree(temporary, ignore_errors=True)
+        os.makedirs(temporary)
+
+        tfidf = features["tfidf"]
+        CompactVocabulary.from_dict(tfidf.vocabulary_).save(os.path.join(temporary, "vocabulary.vocab"))
+        np.save(os.path.join(temporary, "idf.npy"), np.asarray(tfidf.idf_, dtype=np.float64), allow_pickle=False)
+        for name in ("X_train", "X_test"):
+            scipy.sparse.save_npz(os.path.join(temporary, f"{name}.npz"), features[name], compressed=False)
+        for name in ("y_train", "y_test", "train_index", "test_index"):
+            np.save(os.path.join(temporary, f"{name}.npy"), np.asarray(features[name]), allow_pickle=False)
+
+        with open(os.path.join(temporary, MANIFEST_FILENAME), "w", encoding="utf-8") as f:
+            json.dump({
+                "version": CACHE_VERSION,
+                "key": key,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "sklearn_version": sklearn.__version__,
+                "split": {"seed": split_seed, "test_size": test_size, "stratify": True},
+                "vectorizer": {"class": type(tfidf).__name__, "params": json_params(tfidf.get_params())},
+                "shapes": {name: list(features[name].shape) for name in ("X_train", "X_test")},
+                "build_seconds": features["build_seconds"]
+            }, f, indent=2)
+
+        try:
+            os.rename(temporary, entry)
+        except OSError:
+            shutil.rmtree(temporary, ignore_errors=True)
+        self._prune()
+
+    def _prune(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            manifest_path = os.path.join(self.directory, name, MANIFEST_FILENAME)
+            if not name.startswith(".") and os.path.exists(manifest_path):
+                entries.append((os.path.getmtime(manifest_path), name))
+        for _, name in sorted(entries)[:max(len(entries) - self.max_entries, 0)]:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
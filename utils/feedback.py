@@ -0,0 +1,389 @@
+import copy
+import json
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from utils.artifacts import export_artifacts, file_sha256, read_manifest
+
+FEEDBACK_LOG_PATH = os.path.join("feedback", "feedback.jsonl")
+# Where updated models are published: untracked, and found by ModelValidator before models/artifacts
+FEEDBACK_ARTIFACT_DIR = os.path.join("feedback", "artifacts")
+
+# Same spellings as the v1 column of spam.csv, so the log doubles as JSONL training data
+LABEL_NAMES = {0: "ham", 1: "spam"}
+LABEL_VALUES = {"ham": 0, "spam": 1}
+
+# Record kinds: a correction says the model was wrong (or gives a label it never predicted);
+# a confirmation repeats the model's own verdict and is never trained on
+CORRECTION = "correction"
+CONFIRMATION = "confirmation"
+RECORD_KINDS = (CORRECTION, CONFIRMATION)
+
+
+class FeedbackLog:
+    """
+    Durable append-only log of user corrections, one JSON object per line
+
+    Records hold the message, its true label ("spam" or "ham"), where the
+    correction came from, when known the label the model predicted, and
+    its kind:
+
+        {"time": "...", "label": "spam", "message": "...", "source": "home", "predicted": "ham", "kind": "correction"}
+
+    Confirmations ("kind": "confirmation") record that a user agreed with
+    the model. Their label is the model's own verdict, so learning from
+    them would only reinforce it, mistakes included: FeedbackUpdater and
+    streaming training skip them.
+
+    Each record is written with a single O_APPEND write and fsynced, so
+    concurrent writers (Streamlit sessions, forked workers) never interleave
+    lines and an acknowledged correction survives a crash. The file is also
+    valid input for `train_model.py --streaming` with --text-field message
+    --label-field label, so a full retrain can include the feedback.
+    """
+
+    def __init__(self, path=FEEDBACK_LOG_PATH):
+        self.path = path
+
+    def append(self, message, label, source, predicted=None, kind=CORRECTION):
+        """
+        Record one correction
+
+        Args:
+            message (str): Raw message text
+            label (int or str): True label, 0 / 1 or "ham" / "spam"
+            source (str): Where the correction was made, e.g. "home" or "contact"
+            predicted (int or str): The model's label, if it was shown one
+            kind (str): CORRECTION or CONFIRMATION
+
+        Returns:
+            dict: The record that was written
+
+        Raises:
+            ValueError: For an empty message, an unknown label or kind, or a
+                confirmation that differs from the predicted label
+        """
+        if not message or not message.strip():
+            raise ValueError("Feedback needs a message")
+        if kind not in RECORD_KINDS:
+            raise ValueError(f"Unknown feedback kind {kind!r}, expected one of {', '.join(RECORD_KINDS)}")
+        if kind == CONFIRMATION and (predicted is None or _label_name(predicted) != _label_name(label)):
+            raise ValueError("A confirmation repeats the predicted label")
+        record = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "label": _label_name(label),
+            "message": message,
+            "source": source,
+            "predicted": None if predicted is None else _label_name(predicted),
+            "kind": kind
+        }
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return record
+
+    def read_from(self, offset=0, limit=None):
+        """
+        Read complete records after a byte offset
+
+        A line still being written (no trailing newline yet) is left for the
+        next read, and lines that are not valid records are skipped.
+
+        Returns:
+            tuple: (list of records, byte offset just past the last line consumed)
+        """
+        records = []
+        if not os.path.exists(self.path):
+            return records, offset
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            while limit is None or len(records) < limit:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                    record["label"] = LABEL_VALUES[record["label"]]
+                    # Records written before kinds existed were all corrections
+                    record.setdefault("kind", CORRECTION)
+                except (ValueError, KeyError, TypeError):
+                    continue
+                records.append(record)
+        return records, offset
+
+    def size(self):
+        """Bytes in the log"""
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+
+def load_holdout(preprocess_many, path="spam.csv", split_seed=42, test_size=0.2):
+    """
+    The test split train_model.py holds out, preprocessed for the served model
+
+    Returns:
+        tuple: (list of preprocessed messages, int array of 0 = ham / 1 = spam)
+    """
+    df = pd.read_csv(path, encoding='latin-1')[['v1', 'v2']]
+    labels = df['v1'].map(LABEL_VALUES).to_numpy()
+    # Same stratified split as utils/feature_cache.build_features, so these rows were not trained on
+    _, test_index = train_test_split(
+        np.arange(len(df)), test_size=test_size, random_state=split_seed, stratify=labels
+    )
+    messages = df['v2'].fillna("").astype(str).to_numpy()[test_index].tolist()
+    return list(preprocess_many(messages)), labels[test_index]
+
+
+class FeedbackUpdater:
+    """
+    Fold logged corrections into the served model in micro-batches
+
+    Reads new corrections from the FeedbackLog and, once batch_size have
+    arrived (or the oldest has waited max_wait seconds), applies
+    MultinomialNB.partial_fit to a copy of the registry's current model.
+    The vectorizer, and so the feature space, stays fixed: words it has
+    never seen are ignored, as at prediction time.
+
+    Feedback is unauthenticated, so a candidate is only published when its
+    accuracy on a labeled holdout (see load_holdout) has not dropped by
+    more than max_accuracy_drop; a rejected batch is skipped, and stays in
+    the log for review. Published models are written atomically with
+    export_artifacts to artifact_dir, an untracked directory ModelValidator
+    loads ahead of the trained models, so files in the checkout are never
+    modified; the registry then swaps them in. Requests never wait on any
+    of this; they keep using the version they took from the registry.
+
+    Updates are versioned by the model they were built on: the manifest
+    and the state file next to the log record its hashes. When a retrain or
+    a checkout replaces that model, ModelValidator ignores the outdated
+    updates and this updater applies every logged correction again on top
+    of the new one. Run one updater per log, either on a daemon thread
+    (start) or from `train_model.py --apply-feedback`.
+    """
+
+    def __init__(self, registry, log, preprocess_many, batch_size=16, max_wait=30.0, poll_interval=2.0,
+                 holdout=None, max_accuracy_drop=0.0, artifact_dir=FEEDBACK_ARTIFACT_DIR):
+        """
+        Args:
+            registry (ModelRegistry): Loaded registry whose model is updated;
+                it must discover its models (not be pinned to other files)
+            log (FeedbackLog): Corrections to learn from
+            preprocess_many (callable): Raw messages -> vectorizer inputs, the
+                same preprocessing the served model uses
+            batch_size (int): Corrections per update
+            max_wait (float): Seconds a smaller batch waits before it is applied anyway
+            poll_interval (float): Seconds between log checks
+            holdout (tuple): (preprocessed messages, labels) every update is
+                checked against; None publishes unchecked
+            max_accuracy_drop (float): Holdout accuracy an update may lose
+            artifact_dir (str): Where updated models are published
+        """
+        self.registry = registry
+        self.log = log
+        self.preprocess_many = preprocess_many
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.holdout = holdout
+        self.max_accuracy_drop = max_accuracy_drop
+        self.artifact_dir = artifact_dir
+        self.state_path = log.path + ".state.json"
+        self.state = self._read_state()
+        self.last_error = None
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pending_since = None
+
+    def start(self):
+        """Apply feedback on a daemon thread; returns self"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="feedback-updater", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the updater thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def run_once(self, force=False):
+        """
+        Apply the next micro-batch if it is due
+
+        Args:
+            force (bool): Apply whatever is pending without waiting for a full batch
+
+        Returns:
+            dict: Summary of the batch (records, published, holdout
+                accuracies, version, timings), or None when nothing was due
+        """
+        with self._lock:
+            # Pick up a retrain published since the last check before building on the current model
+            self.registry.check()
+            version = self.registry.current()
+            base = self._base(version)
+            if self.state["base"] != base:
+                if self.state["base"] is not None:
+                    # The corrections applied so far were on a model that has been replaced
+                    self.state = self._initial_state()
+                self.state["base"] = base
+                self._write_state()
+
+            records, offset = self.log.read_from(self.state["offset"], limit=self.batch_size)
+            corrections = [record for record in records if record["kind"] == CORRECTION]
+            while records and not corrections:
+                # Only confirmations: nothing to learn, just move past them
+                self.state["offset"] = offset
+                self._write_state()
+                records, offset = self.log.read_from(offset, limit=self.batch_size)
+                corrections = [record for record in records if record["kind"] == CORRECTION]
+            if not corrections:
+                self._pending_since = None
+                return None
+            records = corrections
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            waited = time.monotonic() - self._pending_since
+            if len(records) < self.batch_size and waited < self.max_wait and not force:
+                return None
+
+            start = time.perf_counter()
+            processed = list(self.preprocess_many([record["message"] for record in records]))
+            vectors = version.tfidf.transform(processed)
+            model = _trainable_copy(version.model)
+            model.partial_fit(vectors, np.array([record["label"] for record in records]))
+            fit_ms = (time.perf_counter() - start) * 1000
+
+            accuracy_before, accuracy_after = self._holdout_accuracy(version, model)
+            self._pending_since = None
+            if accuracy_after is not None and accuracy_after < accuracy_before - self.max_accuracy_drop:
+                # Skipped, not retried: the records stay in the log for review
+                self.state.update(
+                    offset=offset,
+                    rejected=self.state["rejected"] + len(records),
+                    last_rejection=time.strftime("%Y-%m-%dT%H:%M:%S%z")
+                )
+                self._write_state()
+                return {"records": len(records), "published": False, "accuracy_before": accuracy_before,
+                        "accuracy_after": accuracy_after, "version": version.version, "fit_ms": fit_ms,
+                        "publish_ms": 0.0}
+
+            start = time.perf_counter()
+            applied = self.state["applied"] + len(records)
+            updates = self.state["updates"] + 1
+            self._publish(version, model, base, {"log": self.log.path, "offset": offset, "applied": applied,
+                                                 "update": updates, "holdout_accuracy": accuracy_after})
+            # The files now include these records, so they must not be applied twice
+            self.state.update(
+                offset=offset,
+                applied=applied,
+                updates=updates,
+                last_update=time.strftime("%Y-%m-%dT%H:%M:%S%z")
+            )
+            self._write_state()
+
+            # The watcher may have swapped it in already; either way it must not still be the old version
+            self.registry.reload()
+            if self.registry.current() is version:
+                raise RuntimeError(f"The updated model was not loaded: {self.registry.last_error}")
+            publish_ms = (time.perf_counter() - start) * 1000
+            return {"records": len(records), "published": True, "accuracy_before": accuracy_before,
+                    "accuracy_after": accuracy_after, "version": self.registry.current().version, "fit_ms": fit_ms,
+                    "publish_ms": publish_ms}
+
+    def info(self):
+        """Log position, counts and the last error"""
+        return {
+            "log": self.log.path,
+            "running": self._thread is not None,
+            "pending_bytes": max(self.log.size() - self.state["offset"], 0),
+            **self.state,
+            "last_error": self.last_error
+        }
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                while self.run_once() is not None:
+                    pass
+                self.last_error = None
+            except Exception as e:
+                # Records stay in the log past the stored offset and are retried
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    def _base(self, version):
+        """SHA-256 of the files of the model the corrections are applied to"""
+        report = version.load_report
+        if report["format"] == "artifacts" and os.path.dirname(report["paths"][0]) == os.path.normpath(self.artifact_dir):
+            # An earlier update: it records the model it was built on
+            return read_manifest(self.artifact_dir)["source"]["base"]
+        return {path: file_sha256(path) for path in report["paths"]}
+
+    def _holdout_accuracy(self, version, model):
+        """Holdout accuracy of the current and the updated model, (None, None) without a holdout"""
+        if self.holdout is None:
+            return None, None
+        texts, labels = self.holdout
+        vectors = version.tfidf.transform(texts)
+        return (float(np.mean(version.model.predict(vectors) == labels)),
+                float(np.mean(model.predict(vectors) == labels)))
+
+    def _publish(self, version, model, base, feedback):
+        # ModelValidator skips these artifacts once a base file no longer has these hashes
+        export_artifacts(version.tfidf, model, self.artifact_dir, source={"base": base, "feedback": feedback})
+
+    @staticmethod
+    def _initial_state():
+        return {"offset": 0, "applied": 0, "updates": 0, "rejected": 0, "last_update": None,
+                "last_rejection": None, "base": None}
+
+    def _read_state(self):
+        state = self._initial_state()
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                state.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        return state
+
+    def _write_state(self):
+        temporary_path = self.state_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(temporary_path, self.state_path)
+
+
+def _label_name(label):
+    if isinstance(label, str):
+        name = label.strip().lower()
+        if name in LABEL_VALUES:
+            return name
+    elif label in LABEL_NAMES:
+        return LABEL_NAMES[int(label)]
+    raise ValueError(f"Unknown label {label!r}, expected 0 / 1 or 'ham' / 'spam'")
+
+
+def _trainable_copy(model):
+    """Copy of a fitted MultinomialNB whose counts can be updated without touching the served one"""
+    # Loaded artifacts are read-only memory maps, and the served model must not change under requests
+    updated = copy.copy(model)
+    for name in ("class_count_", "feature_count_", "class_log_prior_", "feature_log_prob_"):
+        setattr(updated, name, np.array(getattr(model, name), dtype=np.float64))
+    updated.classes_ = np.array(model.classes_)
+    return updated
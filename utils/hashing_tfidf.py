@@ -0,0 +1,88 @@
+import numpy as np
+from sklearn.exceptions import NotFittedError
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+
+
+class HashingTfidfVectorizer(TfidfVectorizer):
+    """
+    TF-IDF over a fixed hashed feature space instead of a learned vocabulary
+
+    Terms are mapped to columns by HashingVectorizer, so nothing grows with
+    the corpus: the only fitted state is the document frequency of each of
+    the n_features columns, which partial_fit accumulates chunk by chunk.
+    IDF and normalization follow TfidfVectorizer exactly, and it is a
+    TfidfVectorizer subclass so ModelValidator, SpamClassifier and the
+    artifact format accept it wherever the vocabulary-based one is used.
+    Hash collisions merge rare terms; more columns mean fewer collisions
+    but spread naive Bayes smoothing thinner (see train_streaming).
+    """
+
+    def __init__(self, *, n_features=2 ** 16, lowercase=True, stop_words=None, token_pattern=r"(?u)\b\w\w+\b",
+                 ngram_range=(1, 1), binary=False, dtype=np.float64, norm="l2", use_idf=True,
+                 smooth_idf=True, sublinear_tf=False):
+        super().__init__(
+            lowercase=lowercase, stop_words=stop_words, token_pattern=token_pattern,
+            ngram_range=ngram_range, binary=binary, dtype=dtype, norm=norm, use_idf=use_idf,
+            smooth_idf=smooth_idf, sublinear_tf=sublinear_tf
+        )
+        self.n_features = n_features
+
+    def hashing_vectorizer(self):
+        """The stateless term-count vectorizer behind transform"""
+        return HashingVectorizer(
+            n_features=self.n_features, lowercase=self.lowercase, stop_words=self.stop_words,
+            token_pattern=self.token_pattern, ngram_range=self.ngram_range, binary=self.binary,
+            norm=None, alternate_sign=False, dtype=self.dtype
+        )
+
+    def partial_fit(self, raw_documents, y=None):
+        """
+        Add a chunk of documents to the document frequencies and refresh idf_
+
+        Args:
+            raw_documents (iterable): Preprocessed messages
+
+        Returns:
+            HashingTfidfVectorizer: self
+        """
+        counts = self.hashing_vectorizer().transform(raw_documents).tocsr()
+        if not hasattr(self, "document_frequency_"):
+            self.document_frequency_ = np.zeros(self.n_features, dtype=np.int64)
+            self.document_count_ = 0
+        # Columns within a CSR row are unique, so counting indices counts documents
+        self.document_frequency_ += np.bincount(counts.indices, minlength=self.n_features)
+        self.document_count_ += counts.shape[0]
+        self._update_idf()
+        return self
+
+    def fit(self, raw_documents, y=None):
+        """Learn document frequencies from scratch"""
+        for name in ("document_frequency_", "document_count_"):
+            if hasattr(self, name):
+                delattr(self, name)
+        return self.partial_fit(raw_documents)
+
+    def fit_transform(self, raw_documents, y=None):
+        raw_documents = list(raw_documents)
+        return self.fit(raw_documents).transform(raw_documents)
+
+    def transform(self, raw_documents):
+        """Hash documents into TF-IDF weighted, normalized rows"""
+        if not hasattr(self, "_tfidf"):
+            raise NotFittedError("The hashing TF-IDF vectorizer is not fitted")
+        counts = self.hashing_vectorizer().transform(raw_documents)
+        return self._tfidf.transform(counts, copy=False)
+
+    def _update_idf(self):
+        if not self.use_idf:
+            # The transformer only normalizes; there are no weights to learn
+            self._tfidf = TfidfTransformer(norm=self.norm, use_idf=False, sublinear_tf=self.sublinear_tf)
+            self._tfidf.n_features_in_ = self.n_features
+            return
+
+        # Same formula as TfidfTransformer.fit; unseen columns get the maximum weight
+        smooth = int(self.smooth_idf)
+        df = self.document_frequency_ + smooth
+        if not self.smooth_idf:
+            df = np.maximum(df, 1)
+        self.idf_ = np.log((self.document_count_ + smooth) / df) + 1.0
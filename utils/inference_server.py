@@ -0,0 +1,370 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from utils.memory import process_memory
+from utils.micro_batcher import MicroBatcher, QueueFullError
+
+# Upper bound on messages accepted by one batch request
+MAX_BATCH_SIZE = 1000
+
+
+class LatencyTracker:
+    """Rolling window of request latencies checked against a p99 budget"""
+
+    def __init__(self, p99_budget_ms=50.0, window=10000):
+        self.p99_budget_ms = p99_budget_ms
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, latency_ms, error=False):
+        """Add one request latency to the window"""
+        with self._lock:
+            self._latencies.append(latency_ms)
+            self.requests += 1
+            if error:
+                self.errors += 1
+
+    def snapshot(self):
+        """Return request counts, latency percentiles and whether p99 is within budget"""
+        with self._lock:
+            latencies = np.array(self._latencies)
+            requests, errors = self.requests, self.errors
+
+        stats = {"requests": requests, "errors": errors, "window": len(latencies), "p99_budget_ms": self.p99_budget_ms}
+        if len(latencies):
+            for name, q in (("p50_ms", 50), ("p95_ms", 95), ("p99_ms", 99)):
+                stats[name] = float(np.percentile(latencies, q))
+            stats["within_budget"] = stats["p99_ms"] <= self.p99_budget_ms
+        else:
+            stats["within_budget"] = True
+        return stats
+
+
+class InferenceService:
+    """
+    Loads the classifier once, in the background, and answers requests
+
+    The HTTP server starts immediately so liveness probes pass while the
+    models and spaCy load; readiness only reports ready once loading and
+    validation through ModelValidator have finished. The classifier comes
+    from a ModelRegistry, so with watch_models a retrained model is swapped
+    in without a restart; each request uses the version current when it
+    started.
+    """
+
+    def __init__(self, profile="tokenizer", backend="spacy", tfidf_path=None, model_path=None,
+                 p99_budget_ms=50.0, micro_batch_size=0, micro_batch_wait_ms=2.0, max_queue_size=10000,
+                 cache_size=0, cache_ttl=3600.0, campaign_index=False, compact_vocabulary=False,
+                 validation="deferred", watch_models=False, poll_interval=2.0):
+        """
+        Args:
+            micro_batch_size (int): When > 1, single-text requests are
+                coalesced by a MicroBatcher into batches of up to this size
+            micro_batch_wait_ms (float): Longest a request waits for a batch to fill
+            max_queue_size (int): Requests allowed to wait for a batch before 503s
+            cache_size (int): Verdict cache entries; 0 disables the cache
+            cache_ttl (float): Seconds a cached verdict stays valid
+            campaign_index (bool): Short-circuit near copies of recent spam campaigns
+            compact_vocabulary (bool): Use the array-backed vectorizer vocabulary
+            validation (str): Model validation mode; "deferred" skips it when
+                a receipt matches and otherwise validates in the background
+                once the first request has been answered
+            watch_models (bool): Reload the models when their files change
+            poll_interval (float): Seconds between model file checks
+        """
+        self.profile = profile
+        self.backend = backend
+        self.tfidf_path = tfidf_path
+        self.model_path = model_path
+        self.registry = None
+        self.load_error = None
+        self.load_time_ms = None
+        self.started_at = time.time()
+        self.latency = LatencyTracker(p99_budget_ms)
+        self.micro_batch_size = micro_batch_size
+        self.micro_batch_wait_ms = micro_batch_wait_ms
+        self.max_queue_size = max_queue_size
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.campaign_index = campaign_index
+        self.compact_vocabulary = compact_vocabulary
+        self.validation = validation
+        self.validation_task = None
+        self.watch_models = watch_models
+        self.poll_interval = poll_interval
+        self.batcher = None
+        self._rejected_version = None
+        self._loaded = threading.Event()
+
+    def start_loading(self):
+        """Load the artifacts on a background thread"""
+        thread = threading.Thread(target=self._load, name="model-loader", daemon=True)
+        thread.start()
+        return thread
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            # sklearn, scipy and spaCy are imported here, after the server is already listening
+            from utils.model_registry import ModelRegistry
+
+            registry = ModelRegistry.for_classifier(
+                profile=self.profile, backend=self.backend,
+                tfidf_path=self.tfidf_path, model_path=self.model_path,
+                poll_interval=self.poll_interval, validation=self.validation,
+                cache_size=self.cache_size, cache_ttl=self.cache_ttl,
+                campaign_index=self.campaign_index, compact_vocabulary=self.compact_vocabulary
+            )
+            version = registry.load()
+            self.validation_task = version.load_report["validation_task"]
+            if self.validation_task is not None:
+                self.validation_task.on_failure = lambda message: self._validation_failed(version, message)
+            self.registry = registry
+            self._start_threads()
+        except Exception as e:
+            self.load_error = f"{type(e).__name__}: {e}"
+        finally:
+            self.load_time_ms = (time.perf_counter() - start) * 1000
+            self._loaded.set()
+
+    def _start_threads(self):
+        if self.micro_batch_size > 1:
+            self.batcher = MicroBatcher(
+                self.classify_batch, max_batch_size=self.micro_batch_size,
+                max_wait_ms=self.micro_batch_wait_ms, max_queue_size=self.max_queue_size
+            )
+        if self.watch_models:
+            self.registry.start_watching()
+
+    def before_fork(self, warm_up_texts=()):
+        """
+        Prepare the loaded service to be shared by forked workers
+
+        Threads do not survive os.fork, so the micro-batcher and the model
+        watcher are stopped here and restarted by after_fork in each worker.
+        Pending validation runs now, once, instead of in every worker, and
+        warm_up_texts are classified so lazily built state (tokenizer
+        caches, NLTK) is created before the fork and shared.
+        """
+        if self.batcher is not None:
+            self.batcher.close()
+            self.batcher = None
+        self.registry.stop()
+        if self.validation_task is not None and self.validation_task.status == "pending":
+            self.validation_task.run()
+
+        classifier = self.classifier
+        if classifier is not None:
+            if classifier.text_processor is not None:
+                # Imports NLTK, otherwise left to the first stem-table miss in each worker
+                classifier.text_processor.stemmer.stemmer
+            if warm_up_texts:
+                classifier.classify_many(list(warm_up_texts))
+            if classifier.cache is not None:
+                classifier.cache.clear()
+
+    def after_fork(self):
+        """Restart the service's threads inside a forked worker"""
+        self.registry.after_fork()
+        self._start_threads()
+
+    def _validation_failed(self, version, message):
+        # A model that fails deferred validation stops serving until a reload replaces it
+        self.load_error = f"ModelValidationError: {message}"
+        self._rejected_version = version
+
+    @property
+    def classifier(self):
+        """Classifier of the current model version, or None when none may serve"""
+        version = self.registry.current() if self.registry is not None else None
+        if version is None or version is self._rejected_version:
+            return None
+        return version.classifier
+
+    def on_request_served(self):
+        """Start deferred validation once the first request has been answered"""
+        if self.validation_task is not None:
+            self.validation_task.start()
+
+    def load_report(self):
+        """Startup phases and validation status of the loaded model, JSON-serializable"""
+        version = self.registry.current() if self.registry is not None else None
+        if version is None:
+            return None
+        report = {k: v for k, v in version.load_report.items() if k != "validation_task"}
+        if version.load_report["validation_task"] is not None:
+            report["validation"] = version.load_report["validation_task"].status
+        return report
+
+    def wait_until_loaded(self, timeout=None):
+        """Block until loading finished; returns True when the model is usable"""
+        self._loaded.wait(timeout)
+        return self.ready
+
+    @property
+    def ready(self):
+        return self.classifier is not None
+
+    def health(self):
+        return {"status": "ok", "uptime_s": round(time.time() - self.started_at, 3)}
+
+    def readiness(self):
+        classifier = self.classifier
+        if classifier is not None:
+            status = "ready"
+        elif self.load_error:
+            status = "failed"
+        else:
+            status = "loading"
+        readiness = {
+            "status": status,
+            "error": self.load_error,
+            "load_time_ms": self.load_time_ms,
+            "model_load": self.load_report(),
+            "process": {"pid": os.getpid(), "memory": process_memory()},
+            "latency": self.latency.snapshot()
+        }
+        if self.registry is not None:
+            readiness["model_registry"] = self.registry.info()
+        if self.batcher is not None:
+            readiness["micro_batching"] = self.batcher.metrics()
+        if classifier is not None and classifier.cache is not None:
+            readiness["verdict_cache"] = classifier.cache.stats()
+        if classifier is not None and classifier.campaign_index is not None:
+            readiness["campaign_index"] = classifier.campaign_index.stats()
+        return readiness
+
+    def classify(self, text):
+        """Classify one raw message into a JSON-serializable result"""
+        if self.batcher is not None:
+            return self.batcher.classify(text)
+
+        return _response(self._serving_classifier().classify(text))
+
+    def classify_batch(self, texts):
+        """Classify many raw messages as one sparse batch, with the same keys as classify"""
+        return [_response(result) for result in self._serving_classifier().classify_many_results(texts)]
+
+    def _serving_classifier(self):
+        # One snapshot per request: a swap mid-request cannot mix two models
+        classifier = self.classifier
+        if classifier is None:
+            raise RuntimeError(self.load_error or "Model not loaded")
+        return classifier
+
+
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON endpoints:
+
+        GET  /healthz         liveness
+        GET  /readyz          readiness, load status and latency percentiles
+        POST /classify        {"text": "..."} or {"texts": ["...", ...]}
+    """
+
+    # Keep-alive connections avoid a TCP handshake per prediction
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # second one waits on the client's delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+    server_version = "SpamDetector/1.0"
+
+    def do_GET(self):
+        service = self.server.service
+        if self.path == "/healthz":
+            self._send_json(200, service.health())
+        elif self.path == "/readyz":
+            self._send_json(200 if service.ready else 503, service.readiness())
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path != "/classify":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        service = self.server.service
+        start = time.perf_counter()
+        status, body = self._handle_classify(service)
+        service.latency.record((time.perf_counter() - start) * 1000, error=status >= 500)
+        self._send_json(status, body)
+        if status == 200:
+            service.on_request_served()
+
+    def _handle_classify(self, service):
+        # Always consume the body so the keep-alive connection stays in sync
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+        if not service.ready:
+            return 503, {"error": "Model not loaded", "status": service.readiness()["status"]}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except (ValueError, UnicodeDecodeError):
+            return 400, {"error": "Request body must be JSON"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "Request body must be a JSON object"}
+
+        try:
+            if "texts" in payload:
+                texts = payload["texts"]
+                if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                    return 400, {"error": "'texts' must be a list of strings"}
+                if len(texts) > MAX_BATCH_SIZE:
+                    return 413, {"error": f"At most {MAX_BATCH_SIZE} texts per request"}
+                return 200, {"results": service.classify_batch(texts)}
+
+            text = payload.get("text")
+            if not isinstance(text, str):
+                return 400, {"error": "Provide 'text' (string) or 'texts' (list of strings)"}
+            return 200, service.classify(text)
+        except QueueFullError as e:
+            return 503, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Per-request access logging costs more than a prediction
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+
+class InferenceServer(ThreadingHTTPServer):
+    """Threaded HTTP server bound to one InferenceService"""
+
+    daemon_threads = True
+    # socketserver's default listen backlog of 5 drops bursts of new clients
+    request_queue_size = 128
+
+    def __init__(self, address, service, access_log=False):
+        super().__init__(address, InferenceRequestHandler)
+        self.service = service
+        self.access_log = access_log
+
+
+def _label_name(label):
+    return "spam" if label == 1 else "ham"
+
+def _response(result):
+    """JSON-serializable response for one classify result"""
+    return {
+        "label": _label_name(result["label"]),
+        "spam_probability": float(result["probabilities"][-1]),
+        "confidence": result["confidence"],
+        "cached": result["cached"],
+        "campaign_similarity": result.get("campaign_similarity"),
+        "timings_ms": result["timings_ms"]
+    }
\ No newline at end of file
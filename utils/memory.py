@@ -0,0 +1,94 @@
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows has no resource module
+    resource = None
+
+
+def current_rss_bytes():
+    """Return the resident set size of the current process in bytes"""
+    try:
+        # Linux exposes the current RSS in pages through /proc
+        with open("/proc/self/statm") as f:
+            rss_pages = int(f.read().split()[1])
+        return rss_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Fall back to the peak RSS on platforms without /proc
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes():
+    """Return the peak resident set size of the current process in bytes"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_peak_rss():
+    """
+    Reset the peak RSS of the current process to its current RSS
+
+    Lets peak_rss_bytes measure one phase (a model fit) instead of the
+    whole process lifetime. Linux 4.0+ only.
+
+    Returns:
+        bool: Whether the peak was reset
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def process_memory(pid=None):
+    """
+    Return RSS, PSS, USS and shared memory of a process in bytes
+
+    USS (Private_Clean + Private_Dirty) is what the process alone holds and
+    would free on exit; PSS divides each shared page between the processes
+    mapping it, so summing PSS over a group of processes gives their real
+    combined footprint. Linux only; None elsewhere.
+
+    Args:
+        pid (int): Process id, the current process when omitted
+    """
+    base = f"/proc/{pid or 'self'}"
+    fields = {}
+    try:
+        with open(f"{base}/smaps_rollup") as f:
+            lines = f.readlines()
+    except OSError:
+        # Kernels before 4.14 only have the per-mapping smaps
+        try:
+            with open(f"{base}/smaps") as f:
+                lines = f.readlines()
+        except OSError:
+            return None
+
+    for line in lines:
+        name, _, value = line.partition(":")
+        parts = value.split()
+        if len(parts) == 2 and parts[1] == "kB":
+            fields[name] = fields.get(name, 0) + int(parts[0]) * 1024
+
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+    }
+
+
+def format_bytes(num_bytes):
+    """Format a byte count as a human readable string"""
+    value = float(num_bytes)
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:.1f} {unit}"
+        value /= 1024
\ No newline at end of file
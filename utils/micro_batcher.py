@@ -0,0 +1,169 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+
+_STOP = object()
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a request arrives while the batcher queue is at capacity"""
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-message requests into sparse batches
+
+    Callers submit one message and get a Future back. A single worker thread
+    takes the first waiting message, keeps collecting until max_batch_size
+    messages are in hand or max_wait_ms has passed since that first message,
+    runs batch_fn once on the whole batch and resolves every caller's Future
+    with its own result. Under light load a request waits at most max_wait_ms
+    extra; under heavy load batches fill up and per-message overhead
+    (sparse-matrix setup, Python dispatch) is paid once per batch.
+
+    Works from threads (submit / classify) and asyncio (classify_async).
+    """
+
+    def __init__(self, batch_fn, max_batch_size=64, max_wait_ms=5.0, max_queue_size=10000, name="micro-batcher"):
+        """
+        Args:
+            batch_fn (callable): Maps a list of messages to a list of results
+                in the same order
+            max_batch_size (int): Largest batch passed to batch_fn
+            max_wait_ms (float): Longest time the first message of a batch
+                waits for company
+            max_queue_size (int): Messages allowed to wait; submit raises
+                QueueFullError beyond this
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_queue_size = max_queue_size
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._metrics_lock = threading.Lock()
+        self._batch_sizes = deque(maxlen=10000)
+        self._queue_waits_ms = deque(maxlen=10000)
+        self._batch_times_ms = deque(maxlen=10000)
+        self._counts = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "batches": 0}
+
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, item):
+        """
+        Queue one message for the next batch
+
+        Returns:
+            concurrent.futures.Future: Resolves to batch_fn's result for item
+
+        Raises:
+            QueueFullError: When max_queue_size messages are already waiting
+        """
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future, time.perf_counter()))
+        except queue.Full:
+            with self._metrics_lock:
+                self._counts["rejected"] += 1
+            raise QueueFullError(f"Micro-batch queue is full ({self.max_queue_size} waiting)") from None
+
+        with self._metrics_lock:
+            self._counts["submitted"] += 1
+        return future
+
+    def classify(self, item, timeout=None):
+        """Submit one message and block until its result is ready"""
+        return self.submit(item).result(timeout)
+
+    async def classify_async(self, item):
+        """Submit one message and await its result without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(item))
+
+    def close(self, timeout=None):
+        """Finish queued work and stop the worker thread"""
+        self._queue.put(_STOP)
+        self._worker.join(timeout)
+
+    def metrics(self):
+        """Return request counts, batch-size and latency statistics"""
+        with self._metrics_lock:
+            counts = dict(self._counts)
+            batch_sizes = np.array(self._batch_sizes)
+            queue_waits = np.array(self._queue_waits_ms)
+            batch_times = np.array(self._batch_times_ms)
+
+        stats = {
+            **counts,
+            "queue_depth": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "max_queue_size": self.max_queue_size
+        }
+        if len(batch_sizes):
+            stats["mean_batch_size"] = float(batch_sizes.mean())
+            stats["full_batch_ratio"] = float((batch_sizes >= self.max_batch_size).mean())
+            stats["queue_wait_p50_ms"] = float(np.percentile(queue_waits, 50))
+            stats["queue_wait_p99_ms"] = float(np.percentile(queue_waits, 99))
+            stats["batch_time_p50_ms"] = float(np.percentile(batch_times, 50))
+            stats["batch_time_p99_ms"] = float(np.percentile(batch_times, 99))
+        return stats
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = [first]
+            deadline = first[2] + self.max_wait_ms / 1000
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch):
+        started = time.perf_counter()
+        # Callers that already gave up (cancelled futures) are dropped
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            results = self.batch_fn([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"batch_fn returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            failed = len(batch)
+        else:
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+            failed = 0
+
+        finished = time.perf_counter()
+        with self._metrics_lock:
+            self._counts["batches"] += 1
+            self._counts["completed"] += len(batch) - failed
+            self._counts["failed"] += failed
+            self._batch_sizes.append(len(batch))
+            self._batch_times_ms.append((finished - started) * 1000)
+            self._queue_waits_ms.extend((started - enqueued) * 1000 for _, _, enqueued in batch)
\ No newline at end of file
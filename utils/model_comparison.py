@@ -0,0 +1,39 @@
+import json
+import os
+
+MODEL_COMPARISON_PATH = os.path.join("models", "model_comparison.json")
+RESULTS_VERSION = 1
+
+
+def save_model_comparison(results, path=MODEL_COMPARISON_PATH):
+    """
+    Write benchmarks/bench_model_comparison.py results for the Analytics page
+
+    The file is replaced atomically, so the page never reads a partial one.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        json.dump({"version": RESULTS_VERSION, **results}, f, indent=2)
+    os.replace(temporary_path, path)
+
+
+def load_model_comparison(path=MODEL_COMPARISON_PATH):
+    """
+    Read measured model comparison results
+
+    Returns:
+        dict: created_at, dataset, features, environment and one entry per
+            model under "models", or None when the benchmark has not been run
+            (or wrote an older format)
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            results = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if results.get("version") != RESULTS_VERSION or not results.get("models"):
+        return None
+    return results
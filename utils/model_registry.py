@@ -0,0 +1,211 @@
+import threading
+import time
+from collections import deque
+from utils.classifier import SpamClassifier
+from utils.model_validator import ModelValidator
+from utils.verdict_cache import artifact_fingerprint
+
+
+class ModelVersion:
+    """One loaded model pair; immutable once published by the registry"""
+
+    def __init__(self, number, tfidf, model, classifier, load_report, load_ms):
+        self.number = number
+        self.version = load_report["content_hash"][:12]
+        self.tfidf = tfidf
+        self.model = model
+        self.classifier = classifier
+        self.load_report = load_report
+        self.load_ms = load_ms
+        self.loaded_at = time.time()
+
+    def info(self):
+        """JSON-serializable summary of this version"""
+        return {
+            "number": self.number,
+            "version": self.version,
+            "format": self.load_report["format"],
+            "paths": self.load_report["paths"],
+            "validation": self.load_report["validation"],
+            "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.loaded_at)),
+            "load_ms": self.load_ms,
+            "phases_ms": self.load_report["phases_ms"]
+        }
+
+
+class ModelRegistry:
+    """
+    Holds the current model version and hot-swaps it when the files change
+
+    A watcher thread fingerprints every location ModelValidator loads from
+    (path, size and mtime) every poll_interval seconds. On a change the new
+    files are loaded and validated on that thread while requests keep using
+    the current version; only a fully loaded version is published, by a
+    single reference assignment. Callers take current() once per request
+    and use that snapshot throughout, so in-flight requests finish on the
+    version they started with and nothing is dropped. A failed load keeps
+    the old version and is reported in info().
+    """
+
+    def __init__(self, build_classifier=None, tfidf_path=None, model_path=None, artifact_dir=None,
+                 poll_interval=2.0, validation="receipt"):
+        """
+        Args:
+            build_classifier (callable): (tfidf, model) -> classifier object
+                stored on each ModelVersion; None stores no classifier
+            tfidf_path, model_path, artifact_dir: Pin the model files as in
+                ModelValidator.load_models; discovered and watched when omitted
+            poll_interval (float): Seconds between file checks
+            validation (str): Validation mode for the first load; reloads are
+                always validated (or receipt-checked) before they are published
+        """
+        self.build_classifier = build_classifier
+        self.tfidf_path = tfidf_path
+        self.model_path = model_path
+        self.artifact_dir = artifact_dir
+        self.poll_interval = poll_interval
+        self.validation = validation
+
+        self._current = None
+        self._fingerprint = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+        # Summaries only: keeping old versions would keep their models and caches alive
+        self._history = deque(maxlen=10)
+        self._counts = {"reloads": 0, "unchanged": 0, "failures": 0}
+        self.last_error = None
+
+    @classmethod
+    def for_classifier(cls, profile="tokenizer", backend="spacy", tfidf_path=None, model_path=None,
+                       artifact_dir=None, poll_interval=2.0, validation="receipt", **options):
+        """
+        Registry whose versions carry a SpamClassifier around one shared TextProcessor
+
+        Args:
+            options: cache_size, cache_ttl, campaign_index, compact_vocabulary
+                for SpamClassifier.build; caches and indexes are per version
+        """
+        text_processor = SpamClassifier.load_text_processor(profile, backend)
+
+        def build_classifier(tfidf, model):
+            return SpamClassifier.build(tfidf, model, text_processor, **options)
+
+        return cls(build_classifier, tfidf_path, model_path, artifact_dir, poll_interval, validation)
+
+    def current(self):
+        """Return the published ModelVersion (None before the first load)"""
+        return self._current
+
+    def load(self):
+        """
+        Load and publish the first version synchronously
+
+        Raises:
+            FileNotFoundError, ModelValidationError: As ModelValidator.load_models
+        """
+        with self._reload_lock:
+            self._fingerprint = self._watch_fingerprint()
+            version = self._load_version(self.validation)
+            self._publish(version)
+            return version
+
+    def reload(self):
+        """
+        Load the files now and publish them if their content changed
+
+        Returns:
+            bool: True when a new version was published
+        """
+        with self._reload_lock:
+            self._fingerprint = self._watch_fingerprint()
+            try:
+                version = self._load_version("receipt")
+            except Exception as e:
+                # Half-written files land here too; the next write changes the fingerprint again
+                self._counts["failures"] += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+
+            current = self._current
+            if current is not None and current.load_report["content_hash"] == version.load_report["content_hash"]:
+                self._counts["unchanged"] += 1
+                return False
+
+            self._publish(version)
+            self._counts["reloads"] += 1
+            self.last_error = None
+            return True
+
+    def check(self):
+        """Reload if the watched files changed since the last load; returns True on a swap"""
+        if self._watch_fingerprint() == self._fingerprint:
+            return False
+        return self.reload()
+
+    def start_watching(self):
+        """Poll the model files on a daemon thread"""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        """Stop the watcher thread"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def after_fork(self):
+        """Reset thread state in a forked child; call start_watching again to resume"""
+        # The parent's watcher thread does not exist here and may have held the lock
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def info(self):
+        """Current version, load timings, reload counts and recent history"""
+        current = self._current
+        return {
+            "current": current.info() if current else None,
+            "watching": self._watcher is not None,
+            "poll_interval": self.poll_interval,
+            **self._counts,
+            "last_error": self.last_error,
+            "history": list(self._history)
+        }
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    def _watch_fingerprint(self):
+        if self.tfidf_path and self.model_path:
+            paths = [self.tfidf_path, self.model_path]
+        elif self.artifact_dir:
+            paths = ModelValidator.resolve_model_source(artifact_dir=self.artifact_dir)["paths"]
+        else:
+            paths = ModelValidator.watched_paths()
+        return artifact_fingerprint(paths)
+
+    def _load_version(self, validation):
+        start = time.perf_counter()
+        tfidf, model, report = ModelValidator.load_models_with_report(
+            self.tfidf_path, self.model_path, self.artifact_dir, validation
+        )
+        classifier = self.build_classifier(tfidf, model) if self.build_classifier else None
+        if classifier is not None and hasattr(classifier, "load_report"):
+            classifier.load_report = report
+        load_ms = (time.perf_counter() - start) * 1000
+        number = self._current.number + 1 if self._current else 1
+        return ModelVersion(number, tfidf, model, classifier, report, load_ms)
+
+    def _publish(self, version):
+        # A single reference assignment: readers see the old or the new version, never a mix
+        self._current = version
+        self._history.append(version.info())
\ No newline at end of file
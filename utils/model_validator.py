@@ -1,30 +1,122 @@
+import hashlib
 import pickle
-import streamlit as st
 import os
+import time
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
+from utils.artifacts import MANIFEST_FILENAME, artifact_paths, file_sha256, load_artifacts, read_manifest
+from utils.stemming import STEM_TABLE_FILENAME
+from utils.validation_receipts import RECEIPTS_FILENAME, ValidationReceipts, ValidationTask, content_hash
+
+class ModelValidationError(ValueError):
+    """Raised when loaded model objects are of the wrong type or not fitted"""
 
 class ModelValidator:
     """Utility class to validate and load models safely"""
     
+    MODEL_FILE_LOCATIONS = [
+        # Root directory (your original location)
+        ('vectorizer.pkl', 'mnb_model.pkl'),
+        # Models directory
+        ('models/vectorizer.pkl', 'models/mnb_model.pkl'),
+        # Other common locations
+        ('model/vectorizer.pkl', 'model/mnb_model.pkl'),
+    ]
+    
+    # feedback/artifacts holds models updated from user corrections (see utils/feedback.py) on top of the others
+    ARTIFACT_DIR_LOCATIONS = ['feedback/artifacts', 'models/artifacts', 'artifacts', 'model/artifacts']
+    
     @staticmethod
     def find_model_files():
         """Find model files in various possible locations"""
-        possible_locations = [
-            # Root directory (your original location)
-            ('vectorizer.pkl', 'mnb_model.pkl'),
-            # Models directory
-            ('models/vectorizer.pkl', 'models/mnb_model.pkl'),
-            # Other common locations
-            ('model/vectorizer.pkl', 'model/mnb_model.pkl'),
-        ]
-        
-        for tfidf_path, model_path in possible_locations:
+        for tfidf_path, model_path in ModelValidator.MODEL_FILE_LOCATIONS:
             if os.path.exists(tfidf_path) and os.path.exists(model_path):
                 return tfidf_path, model_path
         
         return None, None
     
+    @staticmethod
+    def find_artifact_dir():
+        """
+        Find a memory-mappable artifact directory (see utils/artifacts.py)
+        
+        Artifacts exported from pickles that have since been retrained are
+        skipped: the manifest records the SHA-256 of its source pickles, and
+        feedback updates that of the model files they were built on.
+        """
+        for directory in ModelValidator.ARTIFACT_DIR_LOCATIONS:
+            if not os.path.exists(os.path.join(directory, MANIFEST_FILENAME)):
+                continue
+            try:
+                manifest = read_manifest(directory)
+            except (ValueError, OSError):
+                continue
+            source = manifest.get("source", {})
+            stale = any(
+                os.path.exists(path) and file_sha256(path) != sha256
+                for path, sha256 in source.get("pickles", {}).items()
+            ) or any(
+                # A feedback update is only valid on top of exactly the model it was built on
+                not os.path.exists(path) or file_sha256(path) != sha256
+                for path, sha256 in source.get("base", {}).items()
+            )
+            if not stale:
+                return directory
+        
+        return None
+    
+    @staticmethod
+    def watched_paths():
+        """Every file whose creation or change can change what load_models reads"""
+        paths = [path for pair in ModelValidator.MODEL_FILE_LOCATIONS for path in pair]
+        paths += [os.path.join(directory, MANIFEST_FILENAME) for directory in ModelValidator.ARTIFACT_DIR_LOCATIONS]
+        return paths
+    
+    @staticmethod
+    def resolve_model_source(tfidf_path=None, model_path=None, artifact_dir=None):
+        """
+        Decide which model files load_models will read
+        
+        Explicit pickle paths win, then an explicit or discovered artifact
+        directory, then discovered pickles.
+        
+        Returns:
+            dict: format ("artifacts" or "pickle"), the paths to read and,
+                for artifacts, the directory; paths is empty if nothing was found
+        """
+        if tfidf_path and model_path:
+            return {"format": "pickle", "paths": [tfidf_path, model_path]}
+        
+        artifact_dir = artifact_dir or ModelValidator.find_artifact_dir()
+        if artifact_dir:
+            return {
+                "format": "artifacts",
+                "artifact_dir": artifact_dir,
+                "paths": [os.path.join(artifact_dir, MANIFEST_FILENAME)]
+            }
+        
+        tfidf_path, model_path = ModelValidator.find_model_files()
+        if tfidf_path and model_path:
+            return {"format": "pickle", "paths": [tfidf_path, model_path]}
+        return {"format": None, "paths": []}
+    
+    @staticmethod
+    def find_stem_table():
+        """Find the precomputed stem table shipped next to the vectorizer or artifacts"""
+        candidates = []
+        tfidf_path, _ = ModelValidator.find_model_files()
+        if tfidf_path:
+            candidates.append(os.path.dirname(tfidf_path))
+        artifact_dir = ModelValidator.find_artifact_dir()
+        if artifact_dir:
+            candidates += [artifact_dir, os.path.dirname(artifact_dir)]
+        
+        for directory in candidates:
+            stem_table_path = os.path.join(directory, STEM_TABLE_FILENAME)
+            if os.path.exists(stem_table_path):
+                return stem_table_path
+        return None
+    
     @staticmethod
     def validate_models(tfidf, model):
         """Validate that loaded models are correct type and fitted"""
@@ -50,42 +142,160 @@ class ModelValidator:
         except Exception as e:
             return False, f"Error validating models: {str(e)}"
     
+    @staticmethod
+    def load_models(tfidf_path=None, model_path=None, artifact_dir=None, validation="receipt"):
+        """
+        Load and validate models without any Streamlit UI
+        
+        Used by the command line tools and servers; load_and_validate_models
+        wraps it with user-facing error messages for the app. Memory-mapped
+        artifacts are preferred over pickles when no pickle paths are given.
+        
+        Args:
+            tfidf_path (str): Vectorizer pickle, discovered when omitted
+            model_path (str): Classifier pickle, discovered when omitted
+            artifact_dir (str): Artifact directory, discovered when omitted
+            validation (str): See load_models_with_report
+            
+        Returns:
+            tuple: (tfidf, model)
+            
+        Raises:
+            FileNotFoundError: If no model files can be found
+            ModelValidationError: If the loaded objects fail validation
+        """
+        tfidf, model, _ = ModelValidator.load_models_with_report(tfidf_path, model_path, artifact_dir, validation)
+        return tfidf, model
+    
+    @staticmethod
+    def load_models_with_report(tfidf_path=None, model_path=None, artifact_dir=None, validation="receipt"):
+        """
+        Load models, skipping validation for content that already passed it
+        
+        The model files are hashed while they are read. A validation receipt
+        recorded for the same hash and library versions (see
+        utils/validation_receipts.py) means the objects were already checked.
+        
+        Args:
+            tfidf_path (str): Vectorizer pickle, discovered when omitted
+            model_path (str): Classifier pickle, discovered when omitted
+            artifact_dir (str): Artifact directory, discovered when omitted
+            validation (str): "always" validates every time; "receipt" skips
+                validation when a receipt matches; "deferred" also returns an
+                unstarted ValidationTask instead of validating inline when no
+                receipt matches; "background" starts that task immediately
+            
+        Returns:
+            tuple: (tfidf, model, report) where report holds the format,
+                paths, content hash, validation status, the pending
+                ValidationTask (if any) and phases_ms for discovery, read,
+                deserialize and validate
+            
+        Raises:
+            FileNotFoundError: If no model files can be found
+            ModelValidationError: If inline validation fails
+        """
+        if validation not in ("always", "receipt", "deferred", "background"):
+            raise ValueError(f"Unknown validation mode '{validation}'")
+        
+        phases = {}
+        start = time.perf_counter()
+        source = ModelValidator.resolve_model_source(tfidf_path, model_path, artifact_dir)
+        phases["discovery"] = _elapsed_ms(start)
+        
+        if source["format"] is None:
+            raise FileNotFoundError("Model files not found in any expected location")
+        
+        if source["format"] == "artifacts":
+            # Hashing pulls every file through the page cache, so this is the read phase
+            start = time.perf_counter()
+            files = artifact_paths(source["artifact_dir"])
+            model_hash, size = content_hash(files)
+            phases["read"] = _elapsed_ms(start)
+            
+            start = time.perf_counter()
+            tfidf, model = load_artifacts(source["artifact_dir"])
+            phases["deserialize"] = _elapsed_ms(start)
+        else:
+            start = time.perf_counter()
+            contents = []
+            for path in source["paths"]:
+                with open(path, 'rb') as f:
+                    contents.append(f.read())
+            model_hash = _bytes_hash(source["paths"], contents)
+            size = sum(len(c) for c in contents)
+            phases["read"] = _elapsed_ms(start)
+            
+            start = time.perf_counter()
+            tfidf = pickle.loads(contents[0])
+            model = pickle.loads(contents[1])
+            phases["deserialize"] = _elapsed_ms(start)
+        
+        receipts = ValidationReceipts(os.path.join(os.path.dirname(source["paths"][0]), RECEIPTS_FILENAME))
+        report = {
+            "format": source["format"],
+            "paths": source["paths"],
+            "content_hash": model_hash,
+            "bytes": size,
+            "validation": None,
+            "validation_task": None,
+            "phases_ms": phases
+        }
+        
+        start = time.perf_counter()
+        receipt = receipts.lookup(model_hash) if validation != "always" else None
+        if receipt is not None:
+            report["validation"] = "receipt"
+        else:
+            task = ValidationTask(ModelValidator.validate_models, tfidf, model, model_hash, receipts)
+            if validation in ("deferred", "background"):
+                report["validation"] = "pending"
+                report["validation_task"] = task
+                if validation == "background":
+                    task.start()
+            else:
+                is_valid, message = task.run()
+                if not is_valid:
+                    raise ModelValidationError(message)
+                report["validation"] = "passed"
+        phases["validate"] = _elapsed_ms(start)
+        report["total_ms"] = sum(phases.values())
+        
+        return tfidf, model, report
+    
     @staticmethod
     def load_and_validate_models():
         """Load and validate models with comprehensive error handling"""
+        # Only the Streamlit app reports errors this way; the CLIs never import it
+        import streamlit as st
+        
         # Find model files
-        tfidf_path, model_path = ModelValidator.find_model_files()
+        source = ModelValidator.resolve_model_source()
         
-        if not tfidf_path or not model_path:
+        if source["format"] is None:
             st.error("❌ Model files not found in any expected location!")
             st.markdown("""
             **Expected locations:**
             - `vectorizer.pkl` and `mnb_model.pkl` in root directory
             - `models/vectorizer.pkl` and `models/mnb_model.pkl` in models folder
+            - `models/artifacts/manifest.json` exported with `python convert_models.py`
             
             **Please ensure your model files are available.**
             """)
             st.stop()
         
         try:
-            # Load models
-            with open(tfidf_path, 'rb') as f:
-                tfidf = pickle.load(f)
-            
-            with open(model_path, 'rb') as f:
-                model = pickle.load(f)
+            # Load and validate models
+            tfidf, model = ModelValidator.load_models(artifact_dir=source.get("artifact_dir"))
             
-            # Validate models
-            is_valid, message = ModelValidator.validate_models(tfidf, model)
-            
-            if not is_valid:
-                st.error(f"❌ Model validation failed: {message}")
-                st.info("💡 Please retrain your models or check if the model files are corrupted.")
-                st.stop()
-            
-            # st.success(f"✅ Models loaded successfully from: {tfidf_path}, {model_path}")
+            # st.success(f"✅ Models loaded successfully from: {', '.join(source['paths'])}")
             return tfidf, model
             
+        except ModelValidationError as e:
+            st.error(f"❌ Model validation failed: {str(e)}")
+            st.info("💡 Please retrain your models or check if the model files are corrupted.")
+            st.stop()
+            
         except Exception as e:
             st.error(f"❌ Error loading models: {str(e)}")
             st.markdown("""
@@ -95,4 +305,17 @@ class ModelValidator:
             3. Ensure models were saved with the same sklearn version
             4. Check file permissions
             """)
-            st.stop()
\ No newline at end of file
+            st.stop()
+
+
+def _elapsed_ms(start):
+    return (time.perf_counter() - start) * 1000
+
+
+def _bytes_hash(paths, contents):
+    """Same digest as content_hash, for files already read into memory"""
+    digest = hashlib.sha256()
+    for path, data in zip(paths, contents):
+        digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+        digest.update(data)
+    return digest.hexdigest()
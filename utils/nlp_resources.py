@@ -0,0 +1,116 @@
+import threading
+import time
+import spacy
+from spacy.lang.en.stop_words import STOP_WORDS
+from utils.memory import current_rss_bytes
+from utils.stemming import CachedStemmer
+
+# Components shipped with en_core_web_sm; excluding them leaves only the tokenizer
+PIPELINE_COMPONENTS = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"]
+
+# Pipeline profiles, from most to least expensive
+PIPELINE_PROFILES = {
+    "full": "Complete en_core_web_sm pipeline (needed for sentence boundaries)",
+    "tokenizer": "en_core_web_sm tokenizer only, every trained component excluded",
+    "blank": "Blank English tokenizer, no model package required"
+}
+
+class NLPResources:
+    """Process-wide spaCy pipelines, stemmer and stop-word set shared by every session"""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, model_name="en_core_web_sm", stem_cache_size=50000):
+        self.model_name = model_name
+        self._pipelines = {}
+        self._pipeline_lock = threading.Lock()
+
+        # Memoized Porter stemmer; main.py loads the training stem table into it
+        self.stemmer = CachedStemmer(maxsize=stem_cache_size)
+        # English stop words are language data, identical for every profile and backend
+        self.stopwords_set = frozenset(STOP_WORDS)
+
+        self.load_stats = {
+            "model_name": model_name,
+            "load_time_ms": 0.0,
+            "memory_bytes": 0,
+            "pipelines": {}
+        }
+
+    @classmethod
+    def get(cls):
+        """
+        Return the shared resources, creating them on first use
+
+        Streamlit runs every session in its own thread, so creation is
+        guarded by a lock and all later callers reuse the same instance.
+
+        Returns:
+            NLPResources: The process-wide instance
+        """
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def is_loaded(cls):
+        """Check whether the shared resources have already been created"""
+        return cls._instance is not None
+
+    @property
+    def nlp(self):
+        """Full spaCy pipeline, kept for callers that predate pipeline profiles"""
+        return self.pipeline("full")
+
+    def pipeline(self, profile="tokenizer"):
+        """
+        Return the spaCy pipeline for a profile, loading it on first use
+
+        Args:
+            profile (str): One of PIPELINE_PROFILES
+
+        Returns:
+            spacy.language.Language: The shared pipeline
+        """
+        if profile not in PIPELINE_PROFILES:
+            raise ValueError(f"Unknown pipeline profile '{profile}', expected one of {list(PIPELINE_PROFILES)}")
+
+        nlp = self._pipelines.get(profile)
+        if nlp is not None:
+            return nlp
+
+        with self._pipeline_lock:
+            if profile not in self._pipelines:
+                self._pipelines[profile] = self._load_pipeline(profile)
+            return self._pipelines[profile]
+
+    def loaded_profiles(self):
+        """List the pipeline profiles loaded so far"""
+        return list(self._pipelines)
+
+    def _load_pipeline(self, profile):
+        """Load one pipeline profile and record its load time and memory"""
+        rss_before = current_rss_bytes()
+        start = time.perf_counter()
+
+        # spacy.load raises OSError when the model package is not installed
+        if profile == "full":
+            nlp = spacy.load(self.model_name)
+        elif profile == "tokenizer":
+            nlp = spacy.load(self.model_name, exclude=PIPELINE_COMPONENTS)
+        else:
+            nlp = spacy.blank("en")
+
+        stats = {
+            "load_time_ms": (time.perf_counter() - start) * 1000,
+            "memory_bytes": max(current_rss_bytes() - rss_before, 0),
+            "components": list(nlp.pipe_names),
+            "loaded_at": time.time()
+        }
+        self.load_stats["pipelines"][profile] = stats
+        self.load_stats["load_time_ms"] += stats["load_time_ms"]
+        self.load_stats["memory_bytes"] += stats["memory_bytes"]
+        return nlp
\ No newline at end of file
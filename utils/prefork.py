@@ -0,0 +1,159 @@
+import gc
+import os
+import signal
+import sys
+import time
+import traceback
+from utils.memory import format_bytes, process_memory
+
+# Classified in the parent before forking so lazily built state is shared
+WARM_UP_TEXTS = [
+    "Hi there! Hope you're having a great day. Let's meet for coffee tomorrow at 3 PM.",
+    "URGENT! You've won $1000000! Click here NOW to claim your prize! Limited time offer!!!",
+]
+
+# A worker that dies sooner than this after starting is restarted after a pause
+MIN_WORKER_LIFETIME_S = 1.0
+
+
+class PreforkServer:
+    """
+    Serve one listening socket from several forked worker processes
+
+    The parent loads the models and spaCy once, warms them up, runs
+    gc.collect() and gc.freeze(), and only then forks. Frozen objects move
+    to the permanent generation, so the workers' garbage collector never
+    writes to their headers and the pages stay shared copy-on-write instead
+    of being copied into every worker. Memory-mapped artifacts are shared
+    through the page cache regardless. The kernel spreads accepted
+    connections over the workers, and the parent only supervises: it
+    restarts workers that exit and reports per-process memory.
+    """
+
+    def __init__(self, server, service, workers=2, warm_up_texts=WARM_UP_TEXTS, stream=sys.stderr):
+        """
+        Args:
+            server (InferenceServer): Bound server; never served from the parent
+            service (InferenceService): Service of that server, already loaded
+            workers (int): Worker processes to fork
+            warm_up_texts (list): Messages classified before forking
+            stream: Where startup, restart and memory lines are written
+        """
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Pre-fork serving needs os.fork (not available on this platform)")
+        self.server = server
+        self.service = service
+        self.workers = workers
+        self.warm_up_texts = warm_up_texts
+        self.stream = stream
+        self._pids = {}
+        self._started_at = {}
+        self._stopping = False
+
+    def start(self):
+        """Prepare the shared state and fork every worker"""
+        self.service.before_fork(self.warm_up_texts)
+        gc.collect()
+        gc.freeze()
+        for slot in range(self.workers):
+            self._spawn(slot)
+
+    def supervise(self):
+        """Wait on the workers in the parent and restart any that exit"""
+        while self._pids and not self._stopping:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            slot = next((s for s, p in self._pids.items() if p == pid), None)
+            if slot is None or self._stopping:
+                continue
+
+            lifetime = time.monotonic() - self._started_at[slot]
+            print(f"⚠️ Worker {slot} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}; restarting",
+                  file=self.stream)
+            if lifetime < MIN_WORKER_LIFETIME_S:
+                time.sleep(MIN_WORKER_LIFETIME_S)
+            self._spawn(slot)
+
+    def stop(self, timeout=5.0):
+        """Terminate the workers and reap them"""
+        self._stopping = True
+        for pid in self._pids.values():
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.monotonic() + timeout
+        for pid in list(self._pids.values()):
+            while time.monotonic() < deadline:
+                try:
+                    if os.waitpid(pid, os.WNOHANG)[0]:
+                        break
+                except ChildProcessError:
+                    break
+                time.sleep(0.05)
+            else:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                    os.waitpid(pid, 0)
+                except (ProcessLookupError, ChildProcessError):
+                    pass
+        self._pids.clear()
+
+    def memory_report(self):
+        """
+        Memory of the parent and every worker
+
+        Returns:
+            list: One dict per process with role, pid and rss / pss / uss /
+                shared bytes, plus a "total" row summing PSS and USS
+        """
+        rows = []
+        for role, pid in [("parent", os.getpid())] + [(f"worker {slot}", pid) for slot, pid in sorted(self._pids.items())]:
+            memory = process_memory(pid)
+            if memory is not None:
+                rows.append({"process": role, "pid": pid, **memory})
+        if rows:
+            rows.append({
+                "process": "total",
+                "pid": None,
+                **{key: sum(row[key] for row in rows) for key in ("rss", "pss", "uss", "shared")}
+            })
+        return rows
+
+    def print_memory_report(self):
+        """Write memory_report as a table; RSS double-counts shared pages, PSS does not"""
+        rows = self.memory_report()
+        if not rows:
+            print("⚠️ Per-process memory is only available on Linux", file=self.stream)
+            return
+        print(f"{'process':<10} {'pid':>7} {'rss':>10} {'pss':>10} {'uss':>10} {'shared':>10}", file=self.stream)
+        for row in rows:
+            print(f"{row['process']:<10} {row['pid'] or '':>7} " + " ".join(
+                f"{format_bytes(row[key]):>10}" for key in ("rss", "pss", "uss", "shared")
+            ), file=self.stream)
+
+    def _spawn(self, slot):
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self._pids[slot] = pid
+        self._started_at[slot] = time.monotonic()
+
+    def _run_worker(self):
+        exit_code = 0
+        try:
+            # The parent owns Ctrl+C and stops the workers with SIGTERM
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+            self.service.after_fork()
+            self.server.serve_forever()
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            # Skip the parent's atexit handlers and buffered output
+            os._exit(exit_code)
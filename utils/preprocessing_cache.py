@@ -0,0 +1,224 @@
+import hashlib
+import inspect
+import json
+import os
+import re
+import time
+import numpy as np
+from utils.verdict_cache import content_key
+
+PREPROCESSING_CACHE_DIR = os.path.join(".cache", "preprocessing")
+CACHE_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+# Column files of one cache generation
+COLUMNS = ["keys", "order", "offsets", "text"]
+# Dataset hashes remembered per cache, newest last
+MAX_DATASETS = 20
+
+_COLUMN_FILE_PATTERN = re.compile(r"^(keys|order|offsets|text)\.(\d+)\.npy$")
+
+
+def preprocessing_fingerprint(*parts):
+    """
+    Identify a preprocessing configuration
+
+    Functions, classes and modules contribute their source code, so editing
+    the preprocessing changes the fingerprint; anything else contributes its
+    repr (backend names, library versions, stop word lists).
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if inspect.ismodule(part) or inspect.isclass(part) or inspect.isroutine(part):
+            try:
+                text = inspect.getsource(part)
+            except (OSError, TypeError):
+                text = getattr(part, "__qualname__", getattr(part, "__name__", repr(part)))
+        else:
+            text = repr(part)
+        digest.update(text.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+class PreprocessingCache:
+    """
+    On-disk cache of preprocessed messages for one preprocessing fingerprint
+
+    Rows are keyed by a 16-byte hash of the raw message, so a dataset that
+    gained, lost or edited rows only recomputes the rows whose content is
+    new, and every dataset, split and experiment preprocessed the same way
+    shares one cache. Each fingerprint has its own directory of .npy
+    columns:
+
+        keys.<n>.npy      S16 message hashes, in insertion order
+        order.<n>.npy     argsort of keys, for np.searchsorted lookups
+        offsets.<n>.npy   int64 start of each row's text (rows + 1 entries)
+        text.<n>.npy      uint8 UTF-8 bytes of every preprocessed text
+        manifest.json     generation, row count, fingerprint parts and the
+                          hashes of datasets seen
+
+    New rows are appended as generation n + 1 and the manifest is swapped in
+    last with os.replace, so readers never see a partial write; the
+    previous generation's files are kept for readers still using them.
+    """
+
+    def __init__(self, fingerprint, directory=PREPROCESSING_CACHE_DIR, description=None):
+        """
+        Args:
+            fingerprint (str): preprocessing_fingerprint of the preprocessing
+            directory (str): Root of all preprocessing caches
+            description (str): Human-readable note stored in the manifest
+        """
+        self.fingerprint = fingerprint
+        self.directory = os.path.join(directory, fingerprint[:16])
+        self.description = description
+
+    def preprocess(self, messages, preprocess_many):
+        """
+        Preprocess messages, computing only the ones not cached yet
+
+        Args:
+            messages (list): Raw message strings
+            preprocess_many (callable): Maps a list of raw messages to an
+                iterable of preprocessed strings, in order
+
+        Returns:
+            tuple: (list of preprocessed strings in input order, report dict
+                with dataset_hash, rows, hits, computed, cached_rows and seconds)
+        """
+        start = time.perf_counter()
+        keys = np.array([content_key(message) for message in messages], dtype="S16")
+        dataset_hash = hashlib.blake2b(keys.tobytes(), digest_size=16).hexdigest()
+        manifest, columns = self._load()
+
+        positions = self._lookup(columns, keys)
+        missing = {}
+        for row in np.flatnonzero(positions < 0):
+            missing.setdefault(keys[row], messages[row])
+        computed = dict(zip(missing, preprocess_many(list(missing.values()))))
+
+        texts = _decode_rows(columns, positions)
+        for row in np.flatnonzero(positions < 0):
+            texts[row] = computed[keys[row]]
+
+        datasets = dict(manifest.get("datasets", {})) if manifest else {}
+        report = {
+            "fingerprint": self.fingerprint[:12],
+            "dataset_hash": dataset_hash,
+            "dataset_seen": dataset_hash in datasets,
+            "rows": len(messages),
+            "hits": int((positions >= 0).sum()),
+            "computed": len(computed)
+        }
+        datasets.pop(dataset_hash, None)
+        datasets[dataset_hash] = {"rows": len(messages), "seen_at": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+        datasets = dict(list(datasets.items())[-MAX_DATASETS:])
+        report["cached_rows"] = self._save(manifest, columns, computed, datasets)
+        report["seconds"] = time.perf_counter() - start
+        return texts, report
+
+    def info(self):
+        """The manifest of this cache, or None when nothing is cached yet"""
+        return self._load()[0]
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.directory, MANIFEST_FILENAME), encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != CACHE_VERSION or manifest.get("fingerprint") != self.fingerprint:
+                return None, None
+            columns = {
+                name: np.load(os.path.join(self.directory, manifest["files"][name]), mmap_mode="r", allow_pickle=False)
+                for name in COLUMNS
+            }
+        except (OSError, ValueError, KeyError):
+            return None, None
+        return manifest, columns
+
+    def _lookup(self, columns, keys):
+        """Row of every key in the cache columns, -1 when absent"""
+        positions = np.full(len(keys), -1, dtype=np.int64)
+        if columns is None or not len(columns["keys"]) or not len(keys):
+            return positions
+        sorted_keys = np.asarray(columns["keys"])[columns["order"]]
+        found = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+        hit = sorted_keys[found] == keys
+        positions[hit] = columns["order"][found[hit]]
+        return positions
+
+    def _save(self, manifest, columns, computed, datasets):
+        """Append computed rows as a new generation; returns the rows now cached"""
+        rows = len(columns["keys"]) if columns is not None else 0
+        if not computed and manifest is not None:
+            # Nothing new: only record the dataset
+            manifest["datasets"] = datasets
+            self._write_manifest(manifest)
+            return rows
+
+        new_keys = np.array(list(computed), dtype="S16")
+        encoded = [text.encode("utf-8") for text in computed.values()]
+        new_offsets = np.cumsum([len(data) for data in encoded], dtype=np.int64)
+        if columns is not None:
+            keys = np.concatenate([columns["keys"], new_keys])
+            offsets = np.concatenate([columns["offsets"], columns["offsets"][-1] + new_offsets])
+            text = np.concatenate([columns["text"], np.frombuffer(b"".join(encoded), dtype=np.uint8)])
+        else:
+            keys = new_keys
+            offsets = np.concatenate([[0], new_offsets]).astype(np.int64)
+            text = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        arrays = {"keys": keys, "order": np.argsort(keys, kind="stable"), "offsets": offsets, "text": text}
+
+        os.makedirs(self.directory, exist_ok=True)
+        generation = (manifest["generation"] + 1) if manifest else 1
+        files = {}
+        for name, array in arrays.items():
+            files[name] = f"{name}.{generation}.npy"
+            temporary_path = os.path.join(self.directory, f".{name}.{os.getpid()}.tmp")
+            with open(temporary_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(array), allow_pickle=False)
+            os.replace(temporary_path, os.path.join(self.directory, files[name]))
+
+        self._write_manifest({
+            "version": CACHE_VERSION,
+            "fingerprint": self.fingerprint,
+            "description": self.description,
+            "generation": generation,
+            "rows": len(keys),
+            "text_bytes": int(len(text)),
+            "files": files,
+            "datasets": datasets
+        })
+        self._remove_old_generations(generation - 1)
+        return len(keys)
+
+    def _write_manifest(self, manifest):
+        path = os.path.join(self.directory, MANIFEST_FILENAME)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temporary_path, path)
+
+    def _remove_old_generations(self, keep_from):
+        for filename in os.listdir(self.directory):
+            match = _COLUMN_FILE_PATTERN.match(filename)
+            if match and int(match.group(2)) < keep_from:
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    pass
+
+
+def _decode_rows(columns, positions):
+    """Cached texts for rows with a position, None elsewhere"""
+    texts = [None] * len(positions)
+    if columns is None:
+        return texts
+    # One read of the text column; slicing bytes is much cheaper than slicing the memory map per row
+    text = columns["text"].tobytes()
+    offsets = columns["offsets"]
+    for row in np.flatnonzero(positions >= 0):
+        position = positions[row]
+        texts[row] = text[offsets[position]:offsets[position + 1]].decode("utf-8")
+    return texts
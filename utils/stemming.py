@@ -0,0 +1,111 @@
+import functools
+import json
+
+# Shipped next to vectorizer.pkl by train_model.py
+STEM_TABLE_FILENAME = "stem_table.json"
+STEM_TABLE_VERSION = 1
+# PorterStemmer's default mode
+PORTER_MODE = "NLTK_EXTENSIONS"
+
+class CachedStemmer:
+    """
+    Porter stemmer with a precomputed stem table and a bounded LRU cache
+
+    Tokens found in the stem table (the training vocabulary) never reach
+    NLTK; everything else goes through an lru_cache of configurable size.
+    Exposes the same stem() method as PorterStemmer. NLTK itself is only
+    imported on the first table miss, since importing it takes over a
+    second (it pulls in scipy.stats and sklearn).
+    """
+
+    def __init__(self, maxsize=50000, stem_table=None, mode=PORTER_MODE):
+        self.mode = mode
+        self.maxsize = maxsize
+        self.stem_table = dict(stem_table or {})
+        self.table_hits = 0
+        self._stemmer = None
+        self._cached_stem = functools.lru_cache(maxsize=maxsize)(self._stem_uncached)
+
+    @property
+    def stemmer(self):
+        """The NLTK PorterStemmer, created on first use"""
+        if self._stemmer is None:
+            self._stemmer = _porter_stemmer(self.mode)
+        return self._stemmer
+
+    def stem(self, token):
+        """Return the Porter stem of a token"""
+        stem = self.stem_table.get(token)
+        if stem is not None:
+            self.table_hits += 1
+            return stem
+        return self._cached_stem(token)
+
+    def _stem_uncached(self, token):
+        return self.stemmer.stem(token)
+
+    def load_table(self, path):
+        """
+        Load a stem table written by save_stem_table
+
+        Args:
+            path (str): Path to the JSON stem table
+
+        Returns:
+            int: Number of entries loaded (0 if the table was built by a different stemmer)
+        """
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+
+        if payload.get("version") != STEM_TABLE_VERSION or payload.get("stemmer") != _stemmer_id(self.mode):
+            return 0
+
+        self.stem_table.update(payload["stems"])
+        return len(payload["stems"])
+
+    def stats(self):
+        """Return table and LRU hit/miss counters"""
+        info = self._cached_stem.cache_info()
+        lookups = self.table_hits + info.hits + info.misses
+        return {
+            "table_size": len(self.stem_table),
+            "table_hits": self.table_hits,
+            "cache_hits": info.hits,
+            "cache_misses": info.misses,
+            "cache_size": info.currsize,
+            "cache_maxsize": info.maxsize,
+            "hit_ratio": (self.table_hits + info.hits) / lookups if lookups else 0.0
+        }
+
+    def clear_cache(self):
+        """Drop LRU entries and reset counters, keeping the stem table"""
+        self._cached_stem.cache_clear()
+        self.table_hits = 0
+
+
+def build_stem_table(tokens):
+    """Stem every distinct alphabetic token"""
+    stemmer = _porter_stemmer(PORTER_MODE)
+    return {token: stemmer.stem(token) for token in sorted(set(tokens)) if token.isalpha()}
+
+
+def save_stem_table(stem_table, path):
+    """Write a stem table as JSON tagged with the stemmer that produced it"""
+    payload = {
+        "version": STEM_TABLE_VERSION,
+        "stemmer": _stemmer_id(PORTER_MODE),
+        "stems": stem_table
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+
+
+def _porter_stemmer(mode):
+    from nltk.stem.porter import PorterStemmer
+
+    return PorterStemmer(mode=mode)
+
+
+def _stemmer_id(mode):
+    """Identify the stemmer configuration so tables from another mode are rejected"""
+    return f"porter:{mode}"
\ No newline at end of file
@@ -0,0 +1,188 @@
+import json
+import os
+import pickle
+import tempfile
+import time
+import zlib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import confusion_matrix
+from sklearn.naive_bayes import MultinomialNB
+from utils.batch_classifier import detect_format
+from utils.feedback import CONFIRMATION
+from utils.hashing_tfidf import HashingTfidfVectorizer
+from utils.memory import peak_rss_bytes
+
+# Label spellings accepted in the data; anything else is skipped
+LABEL_VALUES = {"ham": 0, "spam": 1, "0": 0, "1": 1}
+CLASSES = np.array([0, 1])
+
+
+def read_labeled_chunks(path, fmt=None, chunk_size=50000, text_field="v2", label_field="v1", encoding="utf-8"):
+    """
+    Stream (messages, labels) chunks from a labeled CSV or JSONL file
+
+    Only one chunk is held in memory at a time. Rows whose label is not one
+    of LABEL_VALUES are skipped, and so are feedback log confirmations,
+    whose label is only the model's own verdict.
+
+    Yields:
+        tuple: (list of messages, int array of 0 = ham / 1 = spam)
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == "csv":
+        reader = pd.read_csv(path, chunksize=chunk_size, encoding=encoding, encoding_errors="replace",
+                             usecols=[label_field, text_field], dtype=str)
+        for frame in reader:
+            yield _labeled(frame[text_field].fillna("").tolist(), frame[label_field].tolist())
+        return
+
+    messages, labels = [], []
+    with open(path, encoding=encoding, errors="replace") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("kind") == CONFIRMATION:
+                continue
+            messages.append(record.get(text_field) or "")
+            labels.append(record.get(label_field))
+            if len(messages) >= chunk_size:
+                yield _labeled(messages, labels)
+                messages, labels = [], []
+    if messages:
+        yield _labeled(messages, labels)
+
+
+def holdout_mask(messages, test_percent):
+    """
+    Deterministic test split by message hash
+
+    The same message always lands on the same side, in every pass and
+    every run, and exact duplicates cannot leak from training into the
+    test set.
+    """
+    if test_percent <= 0:
+        return np.zeros(len(messages), dtype=bool)
+    buckets = np.fromiter((zlib.crc32(m.encode("utf-8")) % 100 for m in messages), dtype=np.int64, count=len(messages))
+    return buckets < test_percent
+
+
+def train_streaming(path, preprocess_many, fmt=None, chunk_size=50000, text_field="v2", label_field="v1",
+                    encoding="utf-8", n_features=2 ** 16, ngram_range=(1, 2), stop_words="english", alpha=0.1,
+                    test_percent=20, stem_tokens=None, max_stem_tokens=200000, progress=None, spill_dir=None):
+    """
+    Train a HashingTfidfVectorizer and MultinomialNB in bounded memory
+
+    The data is processed in three passes, one chunk at a time:
+        1. document frequencies for the IDF (HashingTfidfVectorizer.partial_fit)
+        2. MultinomialNB.partial_fit on the TF-IDF rows
+        3. evaluation on the held-out rows (skipped when test_percent is 0)
+    Every message is preprocessed once: pass 1 spills the preprocessed
+    training chunks to a temporary file that pass 2 reads back, so only
+    passes 1 and 3 read the source. Memory is bounded by chunk_size plus
+    O(n_features) model arrays, whatever the size of the corpus; the
+    spill file holds the preprocessed training text until training ends.
+
+    Args:
+        path (str): Labeled CSV or JSONL file
+        preprocess_many (callable): Maps a list of raw messages to a list
+            of vectorizer inputs
+        text_field, label_field (str): Message and label columns or fields
+        n_features (int): Hashed feature columns
+        alpha (float): MultinomialNB smoothing; every column gets alpha
+            pseudo-counts, so hashed spaces need less than the default 1.0
+            (on spam.csv, 2**16 columns with 0.1 beat alpha 1.0 by 5 points)
+        test_percent (int): Share of messages held out for evaluation
+        stem_tokens (callable): Optional raw message -> tokens; their
+            distinct values (up to max_stem_tokens) are returned for the
+            stem table
+        progress (callable): Called as progress(pass_name, rows_so_far)
+        spill_dir (str): Directory of the spill file, the system temporary
+            directory by default
+
+    Returns:
+        tuple: (tfidf, model, stem token set, report dict)
+    """
+    tfidf = HashingTfidfVectorizer(n_features=n_features, ngram_range=ngram_range, stop_words=stop_words)
+    model = MultinomialNB(alpha=alpha)
+    tokens = set()
+    report = {"rows": 0, "train_rows": 0, "test_rows": 0, "spam_rows": 0, "seconds": {}}
+
+    def chunks():
+        for messages, labels in read_labeled_chunks(path, fmt, chunk_size, text_field, label_field, encoding):
+            yield messages, labels, holdout_mask(messages, test_percent)
+
+    with tempfile.TemporaryDirectory(prefix="spam-streaming-", dir=spill_dir) as directory:
+        spill_path = os.path.join(directory, "train.pickles")
+
+        # Pass 1: document frequencies over the training rows
+        start = time.perf_counter()
+        with open(spill_path, "wb") as spill:
+            for messages, labels, test in chunks():
+                train_messages = [m for m, t in zip(messages, test) if not t]
+                if train_messages:
+                    processed = preprocess_many(train_messages)
+                    tfidf.partial_fit(processed)
+                    pickle.dump((processed, labels[~test]), spill, protocol=pickle.HIGHEST_PROTOCOL)
+                if stem_tokens is not None and len(tokens) < max_stem_tokens:
+                    for message in train_messages:
+                        tokens.update(stem_tokens(message))
+                report["rows"] += len(messages)
+                report["test_rows"] += int(test.sum())
+                report["spam_rows"] += int(labels.sum())
+                if progress:
+                    progress("idf", report["rows"])
+        report["train_rows"] = report["rows"] - report["test_rows"]
+        report["seconds"]["idf"] = time.perf_counter() - start
+        report["spill_bytes"] = os.path.getsize(spill_path)
+        if not report["train_rows"]:
+            raise ValueError(f"No labeled training rows in {path}")
+
+        # Pass 2: naive Bayes counts on the spilled training rows
+        start = time.perf_counter()
+        rows = 0
+        for processed, train_labels in _read_spill(spill_path):
+            model.partial_fit(tfidf.transform(processed), train_labels, classes=CLASSES)
+            rows += len(processed)
+            if progress:
+                progress("fit", rows)
+        report["seconds"]["fit"] = time.perf_counter() - start
+
+    # Pass 3: held-out evaluation
+    if test_percent > 0:
+        start = time.perf_counter()
+        confusion = np.zeros((2, 2), dtype=np.int64)
+        rows = 0
+        for messages, labels, test in chunks():
+            test_messages = [m for m, t in zip(messages, test) if t]
+            if test_messages:
+                predicted = model.predict(tfidf.transform(preprocess_many(test_messages)))
+                confusion += confusion_matrix(labels[test], predicted, labels=CLASSES)
+            rows += len(messages)
+            if progress:
+                progress("evaluate", rows)
+        report["seconds"]["evaluate"] = time.perf_counter() - start
+        report["confusion"] = confusion.tolist()
+        report["accuracy"] = float(np.trace(confusion) / confusion.sum()) if confusion.sum() else None
+
+    report["peak_rss_bytes"] = peak_rss_bytes()
+    return tfidf, model, set(list(tokens)[:max_stem_tokens]), report
+
+
+def _read_spill(path):
+    """Yield the (preprocessed messages, labels) chunks pickled into a spill file"""
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def _labeled(messages, raw_labels):
+    labels = np.array([LABEL_VALUES.get(str(label).strip().lower(), -1) for label in raw_labels], dtype=np.int64)
+    keep = labels >= 0
+    if keep.all():
+        return messages, labels
+    return [m for m, k in zip(messages, keep) if k], labels[keep]
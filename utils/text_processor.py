@@ -1,22 +1,56 @@
 import string
 import re
-import spacy
-from nltk.stem import PorterStemmer
-import streamlit as st
+import sys
+from importlib.metadata import version
+from utils import stemming, tokenizers
+from utils.nlp_resources import NLPResources
+from utils.preprocessing_cache import preprocessing_fingerprint
+from utils.tokenizers import SpacyTokenizer, RegexTokenizer, TOKENIZER_BACKENDS
+
+PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+PUNCTUATION_SET = frozenset(string.punctuation)
+NUMBER_PATTERN = re.compile(r'\d+')
 
 class TextProcessor:
     """Text preprocessing class for spam classification"""
     
-    def __init__(self):
-        self.stemmer = PorterStemmer()
-        self.nlp = self._load_spacy_model()
-        self.stopwords_set = self.nlp.Defaults.stop_words
+    def __init__(self, profile="tokenizer", backend="spacy"):
+        """
+        Args:
+            profile (str): spaCy pipeline profile used for tokenization; see
+                utils.nlp_resources.PIPELINE_PROFILES. Classification only needs
+                the tokenizer, the full pipeline is loaded lazily for sentence stats.
+            backend (str): Tokenizer backend, "spacy" or "regex"; see
+                utils.tokenizers.TOKENIZER_BACKENDS. The regex backend never
+                loads a spaCy pipeline for classification.
+        """
+        if backend not in TOKENIZER_BACKENDS:
+            raise ValueError(f"Unknown tokenizer backend '{backend}', expected one of {list(TOKENIZER_BACKENDS)}")
+        
+        self.profile = profile
+        self.backend = backend
+        self.resources = self._load_resources()
+        self.stemmer = self.resources.stemmer
+        self.stopwords_set = self.resources.stopwords_set
+        
+        if backend == "regex":
+            self.nlp = None
+            self.tokenizer = RegexTokenizer()
+        else:
+            self.nlp = self._load_pipeline(profile)
+            self.tokenizer = SpacyTokenizer(self.nlp)
+    
+    def _load_resources(self):
+        """Load the shared stemmer and stop words"""
+        return NLPResources.get()
     
-    def _load_spacy_model(self):
-        """Load spaCy model with error handling"""
+    def _load_pipeline(self, profile):
+        """Load a shared spaCy pipeline with error handling"""
         try:
-            return spacy.load("en_core_web_sm")
+            return self.resources.pipeline(profile)
         except OSError:
+            import streamlit as st
+            
             st.error("spaCy model 'en_core_web_sm' not found. Please install it using: python -m spacy download en_core_web_sm")
             st.stop()
     
@@ -33,18 +67,64 @@ class TextProcessor:
         if not text or not isinstance(text, str):
             return ""
         
+        # Tokenize using the configured backend
+        tokens = self.tokenizer(self._clean_text(text))
+        
+        return self._finalize_tokens(tokens)
+    
+    def transform_many(self, texts, batch_size=1000, n_process=1):
+        """
+        Transform many texts by streaming them through the tokenizer's pipe
+        
+        Results are yielded lazily and in input order, so arbitrarily large
+        iterables can be processed without holding them in memory.
+        
+        Args:
+            texts (iterable): Input texts; non-string or empty items yield ""
+            batch_size (int): Number of texts spaCy buffers per batch
+            n_process (int): Worker processes used for tokenization (-1 for all cores)
+            
+        Yields:
+            str: Processed text for each input, identical to transform_text
+        """
+        cleaned = (self._clean_text(text) if text and isinstance(text, str) else "" for text in texts)
+        
+        for tokens in self.tokenizer.pipe(cleaned, batch_size=batch_size, n_process=n_process):
+            yield self._finalize_tokens(tokens)
+    
+    def fingerprint(self):
+        """
+        Identify what transform_text computes, for utils/preprocessing_cache.py
+        
+        Covers the preprocessing source code (this module, the tokenizers
+        and the stemmer), the backend, the stop words, the stemmer mode and
+        the spaCy and NLTK versions, plus the spaCy model for that backend.
+        The stem table is left out: it holds the stems NLTK would return.
+        
+        Returns:
+            str: SHA-256 hex digest
+        """
+        parts = [
+            sys.modules[__name__], tokenizers, stemming, self.backend, sorted(self.stopwords_set),
+            self.stemmer.mode, version("spacy"), version("nltk")
+        ]
+        if self.nlp is not None:
+            parts += [self.profile, self.nlp.meta.get("name"), self.nlp.meta.get("version")]
+        return preprocessing_fingerprint(*parts)
+    
+    def _clean_text(self, text):
+        """Lowercase the text and strip punctuation and numbers before tokenization"""
         # Convert to lowercase
         text = text.lower()
         
         # Remove punctuation
-        text = text.translate(str.maketrans("", "", string.punctuation))
+        text = text.translate(PUNCTUATION_TABLE)
         
         # Remove numbers
-        text = re.sub(r'\d+', '', text)
-        
-        # Tokenize using spaCy
-        tokens = [token.text for token in self.nlp(text)]
-        
+        return NUMBER_PATTERN.sub('', text)
+    
+    def _finalize_tokens(self, tokens):
+        """Filter, stem and join tokens produced by the tokenizer"""
         # Keep only alphabetic tokens
         tokens = [token for token in tokens if token.isalpha()]
         
@@ -66,20 +146,81 @@ class TextProcessor:
         Returns:
             dict: Text statistics
         """
-        if not text:
-            return {}
+        return self.analyze_text(text)[1]
+    
+    def analyze_text(self, text):
+        """
+        Transform text and compute its statistics
+        
+        Costs one tokenization plus one parse: the cleaned text is tokenized
+        once for the processed output, and the original text is parsed once
+        by the full pipeline for sentence boundaries. The parse cannot also
+        supply the tokens, since cleaning removes the punctuation the
+        sentence boundaries depend on. Every character count comes from a
+        single scan.
+        
+        Args:
+            text (str): Input text
+            
+        Returns:
+            tuple: (processed_text, stats) where processed_text equals
+                transform_text(text) and stats equals get_text_stats(text)
+        """
+        if not text or not isinstance(text, str):
+            return "", {}
         
         processed_text = self.transform_text(text)
-        doc = self.nlp(text)
+        # Sentence boundaries need the parser, so only this call pays for the full pipeline
+        doc = self._load_pipeline("full")(text)
         
-        return {
+        stats = {
             "original_length": len(text),
-            "word_count": len(text.split()),
             "processed_length": len(processed_text),
             "processed_word_count": len(processed_text.split()),
-            "sentence_count": len(list(doc.sents)),
-            "char_count_no_spaces": len(text.replace(" ", "")),
-            "uppercase_count": sum(1 for c in text if c.isupper()),
-            "punctuation_count": sum(1 for c in text if c in string.punctuation),
-            "number_count": len(re.findall(r'\d+', text))
+            "sentence_count": sum(1 for _ in doc.sents)
+        }
+        stats.update(self._count_characters(text))
+        
+        return processed_text, stats
+    
+    def _count_characters(self, text):
+        """Count words, non-space, uppercase, punctuation and digit-run statistics in one scan"""
+        word_count = 0
+        non_space = 0
+        uppercase = 0
+        punctuation = 0
+        numbers = 0
+        in_word = False
+        in_number = False
+        
+        for c in text:
+            if c != " ":
+                non_space += 1
+            
+            # Words are whitespace-separated runs, as with str.split()
+            if c.isspace():
+                in_word = False
+            elif not in_word:
+                in_word = True
+                word_count += 1
+            
+            # Numbers are runs of decimal digits, as with the regex \d+
+            if c.isdecimal():
+                if not in_number:
+                    in_number = True
+                    numbers += 1
+                continue
+            in_number = False
+            
+            if c.isupper():
+                uppercase += 1
+            elif c in PUNCTUATION_SET:
+                punctuation += 1
+        
+        return {
+            "word_count": word_count,
+            "char_count_no_spaces": non_space,
+            "uppercase_count": uppercase,
+            "punctuation_count": punctuation,
+            "number_count": numbers
         }
\ No newline at end of file
@@ -0,0 +1,159 @@
+import re
+from spacy.lang.en import English
+from spacy.symbols import ORTH
+from spacy.util import compile_prefix_regex, compile_suffix_regex, compile_infix_regex
+
+# Tokenizer backends selectable on TextProcessor
+TOKENIZER_BACKENDS = {
+    "spacy": "spaCy tokenizer from the selected pipeline profile",
+    "regex": "Precompiled regex tokenizer replicating spaCy's English rules, no model load"
+}
+
+class SpacyTokenizer:
+    """Tokenizer backend delegating to a spaCy pipeline"""
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+
+    def __call__(self, text):
+        """Return the token strings for one cleaned text"""
+        return [token.text for token in self.nlp(text)]
+
+    def pipe(self, texts, batch_size=1000, n_process=1):
+        """Yield token strings for many cleaned texts through nlp.pipe"""
+        for doc in self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+            yield [token.text for token in doc]
+
+
+class RegexTokenizer:
+    """
+    Pure-Python tokenizer that replicates spaCy's English tokenizer
+
+    It compiles the same prefix, suffix and infix rules and special cases that
+    spacy.blank("en") uses (language data only, no model package is loaded)
+    and applies spaCy's affix-splitting algorithm to each whitespace-separated
+    chunk. Purely alphabetic chunks, the overwhelming majority once
+    TextProcessor has stripped punctuation and digits, can never match an
+    affix rule and skip straight to a special-case lookup.
+    """
+
+    WHITESPACE_PATTERN = re.compile(r"\S+")
+
+    def __init__(self):
+        defaults = English.Defaults
+        self.special_cases = {
+            text: [piece[ORTH] for piece in pieces]
+            for text, pieces in defaults.tokenizer_exceptions.items()
+        }
+        self.prefix_search = compile_prefix_regex(defaults.prefixes).search
+        self.suffix_search = compile_suffix_regex(defaults.suffixes).search
+        self.infix_finditer = compile_infix_regex(defaults.infixes).finditer
+        self.token_match = defaults.token_match
+        self.url_match = defaults.url_match
+
+    def __call__(self, text):
+        """Return the token strings for one cleaned text"""
+        tokens = []
+        for chunk in self.WHITESPACE_PATTERN.findall(text):
+            special = self.special_cases.get(chunk)
+            if special is not None:
+                tokens.extend(special)
+            elif chunk.isalpha():
+                tokens.append(chunk)
+            else:
+                tokens.extend(self._tokenize_chunk(chunk))
+        return tokens
+
+    def pipe(self, texts, batch_size=1000, n_process=1):
+        """
+        Yield token strings for many cleaned texts
+
+        The regex backend is cheap enough that batching and worker processes
+        do not pay off; the arguments are accepted for API compatibility.
+        """
+        for text in texts:
+            yield self(text)
+
+    def _tokenize_chunk(self, chunk):
+        """Split one whitespace-free chunk the way spaCy's Tokenizer does"""
+        prefixes, chunk, suffixes = self._split_affixes(chunk)
+        tokens = prefixes
+
+        if chunk:
+            special = self.special_cases.get(chunk)
+            if special is not None:
+                tokens.extend(special)
+            elif (self.token_match and self.token_match(chunk)) or (self.url_match and self.url_match(chunk)):
+                tokens.append(chunk)
+            else:
+                tokens.extend(self._split_infixes(chunk))
+
+        tokens.extend(reversed(suffixes))
+        return tokens
+
+    def _split_affixes(self, chunk):
+        """Peel prefixes and suffixes off a chunk, mirroring Tokenizer._split_affixes"""
+        prefixes = []
+        suffixes = []
+        last_size = 0
+
+        while chunk and len(chunk) != last_size:
+            if self.token_match and self.token_match(chunk):
+                break
+            if chunk in self.special_cases:
+                break
+            last_size = len(chunk)
+
+            pre_len = self._match_length(self.prefix_search(chunk))
+            if pre_len:
+                prefix = chunk[:pre_len]
+                minus_pre = chunk[pre_len:]
+                if minus_pre and minus_pre in self.special_cases:
+                    prefixes.append(prefix)
+                    chunk = minus_pre
+                    break
+
+            suf_len = self._match_length(self.suffix_search(chunk[pre_len:]))
+            if suf_len:
+                suffix = chunk[-suf_len:]
+                minus_suf = chunk[:-suf_len]
+                if minus_suf and minus_suf in self.special_cases:
+                    suffixes.append(suffix)
+                    chunk = minus_suf
+                    break
+
+            if pre_len and suf_len and (pre_len + suf_len) <= len(chunk):
+                prefixes.append(prefix)
+                suffixes.append(suffix)
+                chunk = chunk[pre_len:-suf_len]
+            elif pre_len:
+                prefixes.append(prefix)
+                chunk = minus_pre
+            elif suf_len:
+                suffixes.append(suffix)
+                chunk = minus_suf
+
+        return prefixes, chunk, suffixes
+
+    def _split_infixes(self, chunk):
+        """Split a chunk on infix matches, mirroring Tokenizer._attach_tokens"""
+        tokens = []
+        start = 0
+        for match in self.infix_finditer(chunk):
+            infix_start, infix_end = match.start(), match.end()
+            # A match at the very start of the chunk is not an infix
+            if infix_start == 0:
+                continue
+            if infix_start != start:
+                tokens.append(chunk[start:infix_start])
+            if infix_start != infix_end:
+                tokens.append(chunk[infix_start:infix_end])
+            start = infix_end
+        if start < len(chunk):
+            tokens.append(chunk[start:])
+        return tokens
+
+    @staticmethod
+    def _match_length(match):
+        """Length of a regex match, 0 when there is none"""
+        return match.end() - match.start() if match else 0
\ No newline at end of file
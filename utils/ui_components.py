@@ -1,6 +1,4 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 
 class UIComponents:
@@ -222,6 +220,9 @@ class UIComponents:
     
     def create_confidence_chart(self, confidence):
         """Create confidence visualization"""
+        # plotly is only imported once a result is shown
+        import plotly.graph_objects as go
+        
         fig = go.Figure(go.Indicator(
             mode="gauge+number+delta",
             value=confidence * 100,
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import platform
+import threading
+import time
+import numpy as np
+import scipy
+import sklearn
+
+RECEIPTS_FILENAME = ".validation_receipts.json"
+# Receipts kept per file; older artifact versions are dropped first
+MAX_RECEIPTS = 20
+
+
+def content_hash(paths):
+    """
+    Hash the contents of model files in order
+
+    Returns:
+        tuple: (SHA-256 hex digest, bytes read)
+    """
+    digest = hashlib.sha256()
+    total = 0
+    for path in paths:
+        digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+                total += len(block)
+    return digest.hexdigest(), total
+
+
+def environment_versions():
+    """Library versions a validation result depends on"""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "sklearn": sklearn.__version__
+    }
+
+
+class ValidationReceipts:
+    """
+    JSON file of past validation results keyed by model content hash
+
+    A receipt only counts when it was recorded with the same library
+    versions as the running process, since an sklearn or NumPy upgrade can
+    break a model that validated before.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def lookup(self, model_hash):
+        """Return the passing receipt for model_hash under the current versions, or None"""
+        receipt = self._read().get(model_hash)
+        if receipt and receipt.get("valid") and receipt.get("versions") == environment_versions():
+            return receipt
+        return None
+
+    def record(self, model_hash, valid, message, validate_ms):
+        """Store a validation result; failures to write are ignored"""
+        with self._lock:
+            receipts = self._read()
+            receipts[model_hash] = {
+                "valid": bool(valid),
+                "message": message,
+                "versions": environment_versions(),
+                "validate_ms": validate_ms,
+                "validated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z")
+            }
+            while len(receipts) > MAX_RECEIPTS:
+                oldest = min(receipts, key=lambda key: receipts[key].get("validated_at", ""))
+                del receipts[oldest]
+
+            temporary_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(temporary_path, "w", encoding="utf-8") as f:
+                    json.dump(receipts, f, indent=2)
+                os.replace(temporary_path, self.path)
+            except OSError:
+                # Read-only deployments just validate on every start
+                pass
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                receipts = json.load(f)
+            return receipts if isinstance(receipts, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+
+class ValidationTask:
+    """
+    Deferred model validation that records its receipt when it finishes
+
+    Created by ModelValidator.load_models_with_report when validation is
+    deferred; the caller decides when to start it (for example after the
+    first request has been served).
+    """
+
+    def __init__(self, validate, tfidf, model, model_hash, receipts, on_failure=None):
+        self._validate = validate
+        self.tfidf = tfidf
+        self.model = model
+        self.model_hash = model_hash
+        self.receipts = receipts
+        self.on_failure = on_failure
+        self.valid = None
+        self.message = None
+        self.validate_ms = None
+        self.done = threading.Event()
+        self._started = False
+        self._start_lock = threading.Lock()
+
+    def run(self):
+        """Validate now in the calling thread; returns (valid, message)"""
+        with self._start_lock:
+            self._started = True
+        start = time.perf_counter()
+        self.valid, self.message = self._validate(self.tfidf, self.model)
+        self.validate_ms = (time.perf_counter() - start) * 1000
+        self.receipts.record(self.model_hash, self.valid, self.message, self.validate_ms)
+        self.done.set()
+        if not self.valid and self.on_failure is not None:
+            self.on_failure(self.message)
+        return self.valid, self.message
+
+    def start(self):
+        """Validate on a daemon thread; no-op once started or run"""
+        with self._start_lock:
+            if self._started:
+                return False
+            self._started = True
+        threading.Thread(target=self.run, name="model-validation", daemon=True).start()
+        return True
+
+    @property
+    def status(self):
+        if not self.done.is_set():
+            return "running" if self._started else "pending"
+        return "passed" if self.valid else "failed"
\ No newline at end of file
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Approximate bytes held per cached verdict (dict with label, probabilities,
+# confidence and margin) on top of the key itself
+_VERDICT_OVERHEAD_BYTES = 600
+
+
+def content_key(text):
+    """Return a compact 16-byte digest identifying a message's content"""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+def artifact_fingerprint(paths):
+    """
+    Fingerprint model artifacts by path, size and modification time
+
+    Cheap enough to re-check every few seconds; any retrain or copy over the
+    pickles changes it.
+    """
+    parts = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            parts.append(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append(f"{os.path.abspath(path)}:missing")
+    return hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class VerdictCache:
+    """
+    Bounded LRU/TTL cache of classification verdicts
+
+    Verdicts are keyed by a hash of the preprocessed text, so every message
+    that normalizes to the same tokens (case, punctuation, numbers, stop
+    words, inflections) shares one entry. An optional pre-key on the raw text
+    maps exact repeats straight to their verdict and skips preprocessing too.
+
+    When artifact paths are watched, their fingerprint is re-checked at most
+    every check_interval seconds and the cache is cleared as soon as it
+    changes, so a retrained model never serves stale verdicts.
+    """
+
+    def __init__(self, maxsize=100000, ttl_seconds=3600.0, raw_prekey=True, artifact_paths=None, check_interval=5.0):
+        """
+        Args:
+            maxsize (int): Verdicts kept; least recently used are evicted first
+            ttl_seconds (float): Verdict lifetime; None keeps entries until evicted
+            raw_prekey (bool): Also key on the raw text (bounded by maxsize)
+            artifact_paths (list): Model files whose change invalidates the cache
+            check_interval (float): Seconds between artifact fingerprint checks
+        """
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.raw_prekey = raw_prekey
+        self.check_interval = check_interval
+        self.artifact_paths = list(artifact_paths or [])
+        self.fingerprint = artifact_fingerprint(self.artifact_paths) if self.artifact_paths else None
+
+        self._verdicts = OrderedDict()
+        self._raw_keys = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self._counts = {"raw_hits": 0, "hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get_raw(self, text):
+        """Return the cached verdict for an exact raw-text repeat, or None"""
+        if not self.raw_prekey:
+            return None
+        self._check_artifacts()
+        raw_key = content_key(text)
+        with self._lock:
+            key = self._raw_keys.get(raw_key)
+            verdict = self._lookup(key) if key is not None else None
+            if verdict is None:
+                self._raw_keys.pop(raw_key, None)
+                return None
+            self._raw_keys.move_to_end(raw_key)
+            self._counts["raw_hits"] += 1
+            return verdict
+
+    def get(self, processed_text):
+        """Return the cached verdict for a preprocessed text, or None"""
+        self._check_artifacts()
+        key = content_key(processed_text)
+        with self._lock:
+            verdict = self._lookup(key)
+            self._counts["hits" if verdict is not None else "misses"] += 1
+            return verdict
+
+    def put(self, processed_text, verdict, raw_text=None):
+        """Store a verdict under its preprocessed text (and raw text when pre-keying)"""
+        key = content_key(processed_text)
+        expires = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._verdicts[key] = (verdict, expires)
+            self._verdicts.move_to_end(key)
+            if self.raw_prekey and raw_text is not None:
+                raw_key = content_key(raw_text)
+                self._raw_keys[raw_key] = key
+                self._raw_keys.move_to_end(raw_key)
+                if len(self._raw_keys) > self.maxsize:
+                    self._raw_keys.popitem(last=False)
+            while len(self._verdicts) > self.maxsize:
+                self._verdicts.popitem(last=False)
+                self._counts["evictions"] += 1
+
+    def clear(self):
+        """Drop every cached verdict"""
+        with self._lock:
+            self._verdicts.clear()
+            self._raw_keys.clear()
+
+    def stats(self):
+        """Return hit ratios, eviction counts, size and approximate memory use"""
+        with self._lock:
+            counts = dict(self._counts)
+            entries = len(self._verdicts)
+            raw_entries = len(self._raw_keys)
+
+        lookups = counts["raw_hits"] + counts["hits"] + counts["misses"]
+        # Keys are 16-byte digests; dict slots and tuples are counted per entry
+        key_bytes = sys.getsizeof(b"\0" * 16)
+        memory = entries * (key_bytes + _VERDICT_OVERHEAD_BYTES) + raw_entries * 2 * key_bytes
+        memory += sys.getsizeof(self._verdicts) + sys.getsizeof(self._raw_keys)
+        return {
+            **counts,
+            "lookups": lookups,
+            "hit_ratio": (counts["raw_hits"] + counts["hits"]) / lookups if lookups else 0.0,
+            "raw_hit_ratio": counts["raw_hits"] / lookups if lookups else 0.0,
+            "entries": entries,
+            "raw_entries": raw_entries,
+            "maxsize": self.maxsize,
+            "memory_bytes": memory
+        }
+
+    def _lookup(self, key):
+        """Return a live verdict for key and refresh its LRU position; caller holds the lock"""
+        entry = self._verdicts.get(key)
+        if entry is None:
+            return None
+        verdict, expires = entry
+        if expires is not None and expires < time.monotonic():
+            del self._verdicts[key]
+            self._counts["expirations"] += 1
+            return None
+        self._verdicts.move_to_end(key)
+        return verdict
+
+    def _check_artifacts(self):
+        """Clear the cache if the watched model artifacts changed"""
+        if not self.artifact_paths:
+            return
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        fingerprint = artifact_fingerprint(self.artifact_paths)
+        if fingerprint != self.fingerprint:
+            self.clear()
+            with self._lock:
+                self.fingerprint = fingerprint
+                self._counts["invalidations"] += 1
\ No newline at end of file